@@ -1,3 +1,6 @@
+import queue
+import threading
+from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 from ttkthemes import ThemedTk
@@ -8,18 +11,17 @@ from ui.teachers_ui import ProfesoresFrame # Ya lo tienes
 from ui.subjects_ui import MateriasFrame
 from ui.classrooms_ui import ClassroomsFrame
 from ui.classes_ui import ClasesFrame
-from repositories.teacher_repository import TeacherRepository
-from repositories.scheduled_class_repository import ScheduledClassRepository
+from repositories.registry import RepositoryRegistry
+from repositories.storage import StorageError
+from ui.carga_segundo_plano import CargaEnSegundoPlano, IndicadorCarga
 
-try:
-    from repositories.subject_repository import SubjectRepository
-    from repositories.classroom_repository import ClassroomRepository
-except ImportError:
-    SubjectRepository = None
-    ClassroomRepository = None
-    print("Advertencia: SubjectRepository o ClassroomRepository no encontrados. El horario exportado usará IDs.")
+from utils.excel_exporter import export_teacher_schedule_to_excel, ScheduleNameResolver
+from utils.bulk_schedule_export import export_all_teacher_schedules
+from scheduling.timetable_generator import build_timetable, save_timetable
+from scheduling.conflict_audit import audit_scheduled_classes
 
-from utils.excel_exporter import export_teacher_schedule_to_excel # Nueva importación
+# Crear y llenar en segundo plano, cuando la aplicación está ociosa, los frames que aún no se han abierto
+PRECALENTAR_FRAMES = True
 
 class Aplicacion(ThemedTk):
     def __init__(self):
@@ -30,11 +32,9 @@ class Aplicacion(ThemedTk):
 
         configurar_estilos_ttk()
 
-        # Inicializar repositorios que se usarán en la aplicación principal o se pasarán
-        self.teacher_repo = TeacherRepository()
-        self.schedule_repo = ScheduledClassRepository()
-        self.subject_repo = SubjectRepository() if SubjectRepository else None
-        self.classroom_repo = ClassroomRepository() if ClassroomRepository else None
+        # Registro único de repositorios: los frames y la exportación comparten
+        # las mismas instancias (cada archivo se carga una sola vez)
+        self.repositories = RepositoryRegistry()
 
 
         self.contenedor_principal = ttk.Frame(self, padding="5")
@@ -42,34 +42,85 @@ class Aplicacion(ThemedTk):
         self.contenedor_principal.grid_rowconfigure(0, weight=1)
         self.contenedor_principal.grid_columnconfigure(0, weight=1)
 
+        # Barra de estado que se muestra mientras se cargan datos en segundo plano
+        self.indicador_carga = IndicadorCarga(self)
+        self.indicador_carga.colocar(side="bottom", fill="x", before=self.contenedor_principal)
+
+        # Los frames se crean la primera vez que se muestran (ver mostrar_frame);
+        # InicioFrame no usa datos y se muestra de inmediato
+        self.clases_frames = {F.__name__: F for F in (
+            InicioFrame, ProfesoresFrame, MateriasFrame, ClassroomsFrame, ClasesFrame)}
         self.frames = {}
-        # Pasa las instancias de los repositorios a los frames que los necesiten
-        # Ejemplo: si ProfesoresFrame necesita teacher_repo, ya lo está creando internamente,
-        # pero si ClasesFrame necesita schedule_repo, teacher_repo, etc., deberías pasarlos.
-        # Por ahora, la estructura original de inicialización de frames se mantiene,
-        # ajusta según cómo tus frames acceden a los repositorios.
-
-        for F in (
-                InicioFrame, ProfesoresFrame, MateriasFrame, ClassroomsFrame, ClasesFrame
-        ):
-            nombre_clase = F.__name__
-            # Modifica la instanciación si tus frames necesitan los repositorios
-            # Ejemplo para ClasesFrame que podría necesitar varios repositorios:
-            # if F == ClasesFrame:
-            #     frame = F(parent=self.contenedor_principal, controller=self,
-            #               schedule_repo=self.schedule_repo,
-            #               teacher_repo=self.teacher_repo,
-            #               subject_repo=self.subject_repo,
-            #               classroom_repo=self.classroom_repo)
-            # else:
-            #     frame = F(parent=self.contenedor_principal, controller=self)
-            frame = F(parent=self.contenedor_principal, controller=self) # Usando tu forma original por ahora
-            self.frames[nombre_clase] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self._datos_listos = False
+        self._frame_pendiente = None
 
         self._crear_menu()
         self.mostrar_frame("InicioFrame")
 
+        self.carga_inicial = CargaEnSegundoPlano(self)
+        self.indicador_carga.mostrar("inicio", "Cargando datos...")
+        self.carga_inicial.iniciar(
+            self.repositories.load_all(), self._al_cargar_repositorio,
+            al_terminar=self._al_terminar_carga_inicial, al_fallar=self._al_fallar_carga_inicial)
+
+    # Accesos directos a los repositorios compartidos
+    @property
+    def teacher_repo(self):
+        return self.repositories.teacher_repo
+
+    @property
+    def schedule_repo(self):
+        return self.repositories.scheduled_class_repo
+
+    @property
+    def subject_repo(self):
+        return self.repositories.subject_repo
+
+    @property
+    def classroom_repo(self):
+        return self.repositories.classroom_repo
+
+    def _crear_frame(self, F):
+        """Crea un frame (toma sus repositorios de controller.repositories) y lo registra."""
+        frame = F(parent=self.contenedor_principal, controller=self)
+        self.frames[F.__name__] = frame
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.lower()  # No tapar el frame visible; mostrar_frame lo eleva con tkraise()
+        return frame
+
+    def _al_cargar_repositorio(self, progreso):
+        cargados, total, _nombre = progreso
+        self.indicador_carga.mostrar(
+            "inicio", f"Cargando datos ({cargados} de {total})...", cargados, total)
+
+    def _al_terminar_carga_inicial(self):
+        """Con los repositorios en memoria, muestra el frame pedido durante la carga y precalienta el resto."""
+        self.indicador_carga.ocultar("inicio")
+        self._datos_listos = True
+        if self._frame_pendiente:
+            nombre, self._frame_pendiente = self._frame_pendiente, None
+            self.mostrar_frame(nombre)
+        if PRECALENTAR_FRAMES:
+            self.after_idle(self._precalentar_siguiente_frame)
+
+    def _precalentar_siguiente_frame(self):
+        """Crea y llena en segundo plano el siguiente frame que aún no se ha creado (uno por vez)."""
+        for nombre, F in self.clases_frames.items():
+            if nombre not in self.frames:
+                frame = self._crear_frame(F)
+                if hasattr(frame, 'actualizar_contenido_en_segundo_plano'):
+                    frame.actualizar_contenido_en_segundo_plano(
+                        al_terminar=lambda: self.after_idle(self._precalentar_siguiente_frame))
+                else:
+                    self.after_idle(self._precalentar_siguiente_frame)
+                return
+
+    def _al_fallar_carga_inicial(self, error):
+        print(f"Error al cargar los datos: {error}")
+        messagebox.showerror("Error", f"No se pudieron cargar todos los datos.\nDetalle: {error}", parent=self)
+        # Los repositorios que falten se cargarán al primer acceso
+        self._al_terminar_carga_inicial()
+
     def _crear_menu(self):
         menubar = tk.Menu(self, font=FUENTE_MENU)
         self.config(menu=menubar)
@@ -84,6 +135,10 @@ class Aplicacion(ThemedTk):
             label="Descargar Horario", 
             command=self._descargar_horario_profesor_excel
         )
+        archivo_menu.add_command(
+            label="Descargar Horarios de Todos los Profesores",
+            command=self._descargar_horarios_todos_excel
+        )
         archivo_menu.add_command(label="Salir", command=self.salir_aplicacion)
 
         gestion_menu = tk.Menu(menubar, **menu_options)
@@ -97,16 +152,14 @@ class Aplicacion(ThemedTk):
             label="Salones", command=lambda: self.mostrar_frame("ClassroomsFrame"))
         gestion_menu.add_command(
             label="Clases", command=lambda: self.mostrar_frame("ClasesFrame"))
+        gestion_menu.add_separator()
+        gestion_menu.add_command(
+            label="Generar Horario Automático...", command=self._generar_horario_automatico)
+        gestion_menu.add_command(
+            label="Auditar Conflictos...", command=self._auditar_conflictos)
 
     def _descargar_horario_profesor_excel(self):
-        # 1. Obtener lista de profesores para seleccionar
-        # ProfesoresFrame ya usa teacher_repo, podemos instanciarlo aquí también o accederlo si está en controller
-        # Para simplificar, lo instanciamos o usamos el que ya tenemos en self.
-        
-        # Asegurarse de que el repositorio de profesores esté inicializado
-        if not hasattr(self, 'teacher_repo') or not self.teacher_repo:
-            self.teacher_repo = TeacherRepository()
-
+        # 1. Obtener lista de profesores para seleccionar (repositorio compartido)
         profesores_data = self.teacher_repo.get_all_teachers() # Retorna lista de listas/tuplas [cedula, nombre, apellido, disponibilidad]
         
         if not profesores_data:
@@ -174,11 +227,7 @@ class Aplicacion(ThemedTk):
         
         teacher_full_name = f"{profesor_seleccionado_data[1]} {profesor_seleccionado_data[2]}"
 
-        # 4. Obtener las clases del profesor
-        # Asegurarse de que schedule_repo esté inicializado
-        if not hasattr(self, 'schedule_repo') or not self.schedule_repo:
-            self.schedule_repo = ScheduledClassRepository()
-            
+        # 4. Obtener las clases del profesor (de los meses cargados: el periodo activo)
         clases_profesor = self.schedule_repo.get_scheduled_classes_by_teacher_id(selected_teacher_id)
 
         if not clases_profesor:
@@ -198,13 +247,6 @@ class Aplicacion(ThemedTk):
             return # Usuario canceló el diálogo de guardar
 
         # 6. Exportar a Excel
-        # Asegurarse de que subject_repo y classroom_repo estén inicializados si existen
-        if SubjectRepository and (not hasattr(self, 'subject_repo') or not self.subject_repo) :
-             self.subject_repo = SubjectRepository()
-        if ClassroomRepository and (not hasattr(self, 'classroom_repo') or not self.classroom_repo) :
-             self.classroom_repo = ClassroomRepository()
-
-
         success = export_teacher_schedule_to_excel(
             clases_profesor, 
             teacher_full_name,
@@ -217,12 +259,265 @@ class Aplicacion(ThemedTk):
             messagebox.showinfo("Éxito", f"Horario de {teacher_full_name} exportado correctamente a:\n{file_path}", parent=self)
 
 
+    def _descargar_horarios_todos_excel(self):
+        """
+        Exporta el horario de todos los profesores (un Excel por profesor) a una carpeta o a un zip.
+        Incluye las clases de los meses cargados (el periodo activo).
+        """
+        # Copias de las clases y de las ocurrencias de las series: el hilo de exportación
+        # no debe ver ediciones a medio hacer
+        clases = list(self.schedule_repo.iter_scheduled_classes())
+        if not clases:
+            messagebox.showinfo("Información", "No hay clases programadas para exportar.", parent=self)
+            return
+
+        como_zip = messagebox.askyesnocancel(
+            "Formato de exportación",
+            "¿Desea empaquetar los horarios en un único archivo ZIP?\n(No = guardarlos en una carpeta)",
+            parent=self)
+        if como_zip is None:
+            return
+        if como_zip:
+            destino = filedialog.asksaveasfilename(
+                defaultextension=".zip",
+                filetypes=[("Archivos ZIP", "*.zip"), ("Todos los archivos", "*.*")],
+                title="Guardar Horarios como...",
+                initialfile="Horarios_Profesores.zip",
+                parent=self)
+        else:
+            destino = filedialog.askdirectory(title="Seleccione la carpeta de destino", parent=self)
+        if not destino:
+            return
+
+        # Tablas de nombres resueltas una sola vez (se envían a cada proceso de trabajo)
+        nombres_profesores = {
+            str(t.get("id_card")): f"{t.get('first_name', '')} {t.get('last_name', '')}".strip()
+            for t in self.teacher_repo.teachers_data}
+        nombres_materias, nombres_salones = ScheduleNameResolver(
+            self.subject_repo, self.classroom_repo).resolve_schedule(clases)
+
+        # Ventana de progreso
+        dialogo = tk.Toplevel(self)
+        dialogo.title("Exportando Horarios")
+        dialogo.geometry("420x120")
+        dialogo.transient(self)
+        dialogo.grab_set()
+        dialogo.protocol("WM_DELETE_WINDOW", lambda: None)  # No se puede cerrar a mitad de la exportación
+        etiqueta = ttk.Label(dialogo, text="Preparando exportación...")
+        etiqueta.pack(pady=(15, 5))
+        barra = ttk.Progressbar(dialogo, mode="determinate", length=360)
+        barra.pack(pady=5, padx=20)
+
+        cola = queue.Queue()
+
+        def trabajo():
+            try:
+                resultado = export_all_teacher_schedules(
+                    clases, nombres_profesores, nombres_materias, nombres_salones, destino, as_zip=como_zip,
+                    progress_callback=lambda hechos, total, _id: cola.put(("progreso", hechos, total)))
+                cola.put(("fin", resultado))
+            except Exception as e:
+                cola.put(("error", e))
+
+        def revisar_cola():
+            try:
+                while True:
+                    mensaje = cola.get_nowait()
+                    if mensaje[0] == "progreso":
+                        _, hechos, total = mensaje
+                        barra.configure(maximum=total, value=hechos)
+                        etiqueta.configure(text=f"Exportados {hechos} de {total} profesores...")
+                    else:
+                        dialogo.grab_release()
+                        dialogo.destroy()
+                        if mensaje[0] == "error":
+                            messagebox.showerror("Error al Exportar", f"La exportación falló.\nDetalle: {mensaje[1]}", parent=self)
+                        else:
+                            self._mostrar_resumen_exportacion(mensaje[1], nombres_profesores, destino)
+                        return
+            except queue.Empty:
+                pass
+            self.after(100, revisar_cola)
+
+        threading.Thread(target=trabajo, daemon=True).start()
+        self.after(100, revisar_cola)
+
+    def _mostrar_resumen_exportacion(self, resultado, nombres_profesores, destino):
+        """Muestra el resumen de la exportación masiva, con el detalle de los errores por profesor."""
+        resumen = f"Se exportaron {len(resultado['exported'])} de {resultado['total']} horarios a:\n{destino}"
+        if not resultado["errors"]:
+            messagebox.showinfo("Exportación Completada", resumen, parent=self)
+            return
+        detalle = "\n".join(
+            f"- {nombres_profesores.get(id_profesor, id_profesor)} ({id_profesor}): {error}"
+            for id_profesor, error in sorted(resultado["errors"].items()))
+        messagebox.showwarning(
+            "Exportación con Errores",
+            f"{resumen}\n\nNo se pudieron exportar {len(resultado['errors'])} horarios:\n{detalle}",
+            parent=self)
+
+    def _generar_horario_automatico(self):
+        """Calcula en un hilo de trabajo un horario para las materias sin clases en un rango de fechas y, si se confirma, lo guarda."""
+        if not self._datos_listos:
+            messagebox.showinfo("Información", "Espere a que terminen de cargarse los datos.", parent=self)
+            return
+        fechas = []
+        for titulo in ("Fecha inicial", "Fecha final"):
+            texto = simpledialog.askstring(
+                "Generar Horario Automático", f"{titulo} (YYYY-MM-DD):", parent=self)
+            if not texto:
+                return
+            try:
+                fechas.append(datetime.strptime(texto.strip(), "%Y-%m-%d").date())
+            except ValueError:
+                messagebox.showwarning("Formato Inválido", "La fecha debe tener el formato YYYY-MM-DD.", parent=self)
+                return
+        if fechas[1] < fechas[0]:
+            messagebox.showwarning("Rango Inválido", "La fecha final es anterior a la fecha inicial.", parent=self)
+            return
+
+        # Copias de los datos: el hilo de trabajo no debe ver ediciones a medio hacer.
+        # Los meses del rango se cargan aquí, en el hilo de Tk.
+        rango = (fechas[0].strftime("%Y-%m-%d"), fechas[1].strftime("%Y-%m-%d"))
+        self.schedule_repo.load_date_range(*rango)
+        datos = ([dict(t) for t in self.teacher_repo.teachers_data],
+                 [dict(m) for m in self.subject_repo.subjects_data],
+                 [dict(s) for s in self.classroom_repo.classrooms_data],
+                 list(self.schedule_repo.iter_scheduled_classes(*rango)))
+
+        def calcular():
+            yield build_timetable(*datos, fechas[0], fechas[1])
+
+        def al_fallar(error):
+            self.indicador_carga.ocultar("horario")
+            messagebox.showerror("Error", f"No se pudo generar el horario.\nDetalle: {error}", parent=self)
+
+        self.generacion_horario = CargaEnSegundoPlano(self)
+        self.indicador_carga.mostrar("horario", "Generando horario...")
+        self.generacion_horario.iniciar(calcular(), self._confirmar_horario_generado, al_fallar=al_fallar)
+
+    def _confirmar_horario_generado(self, horario):
+        self.indicador_carga.ocultar("horario")
+        nombres_materias = {str(m.get("id")): m.get("name", "") for m in self.subject_repo.subjects_data}
+        resumen = (f"Materias ubicadas: {len(horario['placements'])}\n"
+                   f"Clases a crear: {horario['session_count']}\n"
+                   f"Materias que ya tenían clases en el rango: {len(horario['already_scheduled'])}")
+        if horario["unscheduled"]:
+            detalle = "\n".join(
+                f"- {nombres_materias.get(id_materia, id_materia)}: {motivo}"
+                for id_materia, motivo in list(horario["unscheduled"].items())[:15])
+            if len(horario["unscheduled"]) > 15:
+                detalle += f"\n... y {len(horario['unscheduled']) - 15} más"
+            resumen += f"\n\nMaterias sin ubicar ({len(horario['unscheduled'])}):\n{detalle}"
+        if not horario["series"]:
+            messagebox.showinfo("Generar Horario Automático", resumen, parent=self)
+            return
+        if not messagebox.askyesno("Generar Horario Automático", f"{resumen}\n\n¿Desea guardar las clases generadas?", parent=self):
+            return
+        try:
+            guardadas, omitidas = save_timetable(self.schedule_repo, horario["series"])
+        except StorageError as e:
+            messagebox.showerror("Error", f"No se pudo guardar el horario; no se creó ninguna clase.\nDetalle: {e}", parent=self)
+            return
+        mensaje = f"Se guardaron {guardadas} clases."
+        if omitidas:
+            mensaje += f"\n{omitidas} clases se omitieron porque los datos cambiaron mientras se generaba el horario."
+        messagebox.showinfo("Horario Generado", mensaje, parent=self)
+        self.mostrar_frame("ClasesFrame")
+
+    def _auditar_conflictos(self):
+        """
+        Revisa las clases programadas de los meses cargados (el periodo activo) en un hilo de
+        trabajo (con un pool de procesos) y muestra el informe.
+        """
+        if not self._datos_listos:
+            messagebox.showinfo("Información", "Espere a que terminen de cargarse los datos.", parent=self)
+            return
+        datos = (list(self.schedule_repo.iter_scheduled_classes()),
+                 [dict(t) for t in self.teacher_repo.teachers_data],
+                 [dict(m) for m in self.subject_repo.subjects_data],
+                 [dict(s) for s in self.classroom_repo.classrooms_data])
+
+        def auditar():
+            yield audit_scheduled_classes(*datos)
+
+        def al_fallar(error):
+            self.indicador_carga.ocultar("auditoria")
+            messagebox.showerror("Error", f"No se pudo completar la auditoría.\nDetalle: {error}", parent=self)
+
+        self.auditoria = CargaEnSegundoPlano(self)
+        self.indicador_carga.mostrar("auditoria", "Auditando conflictos...")
+        self.auditoria.iniciar(auditar(), self._mostrar_informe_auditoria, al_fallar=al_fallar)
+
+    def _mostrar_informe_auditoria(self, informe):
+        self.indicador_carga.ocultar("auditoria")
+        clases = {str(c.get("id")): c for c in self.schedule_repo.iter_scheduled_classes()}
+        nombres_profesores = {
+            str(t.get("id_card")): f"{t.get('first_name', '')} {t.get('last_name', '')}".strip()
+            for t in self.teacher_repo.teachers_data}
+        nombres_materias = {str(m.get("id")): m.get("name", "") for m in self.subject_repo.subjects_data}
+
+        def describir(id_clase):
+            c = clases.get(id_clase)
+            if c is None:
+                return id_clase  # Borrada después de auditar
+            materia = nombres_materias.get(str(c.get("subject_id")), c.get("subject_id"))
+            profesor = nombres_profesores.get(str(c.get("teacher_id")), c.get("teacher_id"))
+            return f"{c.get('date')} {c.get('start_time')}-{c.get('end_time')} {materia} / {profesor} / Salón {c.get('classroom_id')}"
+
+        secciones = [
+            ("Cruces de profesor", [f"{describir(a)}  <->  {describir(b)}" for a, b in informe["teacher_overlaps"]]),
+            ("Cruces de salón", [f"{describir(a)}  <->  {describir(b)}" for a, b in informe["classroom_overlaps"]]),
+            ("Materias de laboratorio en salones que no lo son", [describir(c) for c in informe["lab_mismatches"]]),
+            ("Clases fuera de la disponibilidad del profesor", [describir(c) for c in informe["outside_availability"]]),
+            ("Referencias inexistentes", [f"{describir(c)} ({campo})" for c, campo in informe["unknown_references"]]),
+            ("Clases con fecha u horas inválidas", [describir(c) for c in informe["invalid"]]),
+        ]
+        total_infracciones = sum(len(lineas) for _, lineas in secciones)
+        if not total_infracciones:
+            messagebox.showinfo("Auditoría de Conflictos",
+                                f"Se revisaron {informe['total']} clases y no se encontraron conflictos.", parent=self)
+            return
+
+        ventana = tk.Toplevel(self)
+        ventana.title("Auditoría de Conflictos")
+        ventana.geometry("900x600")
+        ventana.transient(self)
+        ttk.Label(ventana, text=f"Se revisaron {informe['total']} clases: {total_infracciones} infracciones.").pack(
+            side="top", anchor="w", padx=10, pady=(10, 5))
+        marco = ttk.Frame(ventana)
+        marco.pack(side="top", fill="both", expand=True, padx=10, pady=(0, 10))
+        texto = tk.Text(marco, wrap="none")
+        barra = ttk.Scrollbar(marco, orient="vertical", command=texto.yview)
+        texto.configure(yscrollcommand=barra.set)
+        barra.pack(side="right", fill="y")
+        texto.pack(side="left", fill="both", expand=True)
+        for titulo, lineas in secciones:
+            if lineas:
+                texto.insert("end", f"{titulo} ({len(lineas)})\n")
+                texto.insert("end", "".join(f"  - {linea}\n" for linea in lineas))
+                texto.insert("end", "\n")
+        texto.configure(state="disabled")
+        ttk.Button(ventana, text="Cerrar", command=ventana.destroy).pack(side="bottom", pady=(0, 10))
+
     def mostrar_frame(self, nombre_clase_frame):
-        frame = self.frames[nombre_clase_frame]
-        if hasattr(frame, 'actualizar_contenido'):
-            # self.after(10, frame.actualizar_contenido) # Comentado para ver si es necesario
-            frame.actualizar_contenido() # Llamar directamente puede ser mejor para consistencia
+        frame = self.frames.get(nombre_clase_frame)
+        if frame is None:
+            if not self._datos_listos and nombre_clase_frame != "InicioFrame":
+                # Todavía se están cargando los datos: se mostrará al terminar
+                self._frame_pendiente = nombre_clase_frame
+                return
+            frame = self._crear_frame(self.clases_frames[nombre_clase_frame])
         frame.tkraise()
+        if hasattr(frame, 'contenido_vigente') and frame.contenido_vigente():
+            return  # Nada ha cambiado desde la última vez que se mostró: no hay que recargar
+        if hasattr(frame, 'actualizar_contenido_en_segundo_plano'):
+            # Los datos se preparan en un hilo de trabajo y llegan por partes: la ventana sigue respondiendo
+            frame.actualizar_contenido_en_segundo_plano(
+                al_terminar=lambda: self.indicador_carga.ocultar(nombre_clase_frame))
+            self.indicador_carga.mostrar(nombre_clase_frame, "Cargando...")
+        elif hasattr(frame, 'actualizar_contenido'):
+            frame.actualizar_contenido()
 
     def salir_aplicacion(self):
         if messagebox.askokcancel("Salir", "¿Estás seguro de que quieres salir?", parent=self):
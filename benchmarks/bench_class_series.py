@@ -0,0 +1,95 @@
+"""
+Benchmark: un semestre de cursos semanales guardado como clases sueltas (una fila por
+sesión) y como series de clases de ScheduledClassRepository (una fila por curso).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_class_series [num_cursos]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from repositories.scheduled_class_repository import ScheduledClassRepository, class_occurrence_id
+
+TERM_WEEKS = 16
+
+
+def _generate_courses(num_courses, seed=42):
+    """Genera cursos semanales sintéticos como filas de serie [id, primera fecha, última fecha, ...]."""
+    rng = random.Random(seed)
+    term_start = date(2026, 2, 2)
+    courses = []
+    for i in range(num_courses):
+        first_date = term_start + timedelta(days=rng.randrange(6))
+        start_hour = rng.randrange(7, 20)
+        courses.append([
+            f"S{i:06d}",
+            first_date.strftime("%Y-%m-%d"),
+            (first_date + timedelta(weeks=TERM_WEEKS - 1)).strftime("%Y-%m-%d"),
+            f"{start_hour:02d}:00",
+            f"{start_hour + 2:02d}:00",
+            f"M{rng.randrange(300)}",
+            f"T{rng.randrange(400)}",
+            f"{rng.randrange(100, 160)}-{rng.choice('AB')}",
+        ])
+    return courses
+
+
+def _load_everything(filepath):
+    """Crea el repositorio y lee también los meses fuera del periodo activo."""
+    repo = ScheduledClassRepository(filepath)
+    repo.load_date_range()
+    return repo
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(num_courses=5_000, num_checks=2_000):
+    courses = _generate_courses(num_courses)
+    rng = random.Random(7)
+    probes = [(f"T{rng.randrange(400)}", f"{rng.randrange(100, 160)}-{rng.choice('AB')}",
+               (date(2026, 2, 2) + timedelta(days=rng.randrange(7 * TERM_WEEKS))).strftime("%Y-%m-%d"),
+               f"{rng.randrange(7, 20):02d}:30") for _ in range(num_checks)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {}
+        for layout in ("clases", "series"):
+            directory = os.path.join(tmp_dir, layout)
+            repo = ScheduledClassRepository(os.path.join(directory, "scheduled_classes.json"))
+            with repo.batch():
+                for course in courses:
+                    if layout == "series":
+                        repo.add_class_series(course)
+                        continue
+                    first = date.fromisoformat(course[1])
+                    for week in range(TERM_WEEKS):
+                        class_date = (first + timedelta(weeks=week)).strftime("%Y-%m-%d")
+                        repo.add_scheduled_class([class_occurrence_id(course[0], class_date), class_date,
+                                                  *course[3:]])
+            size = sum(os.path.getsize(os.path.join(folder, name)) for folder, _, names in os.walk(directory)
+                       for name in names if name.endswith(".json"))
+            repo, load_time = _timed(_load_everything, os.path.join(directory, "scheduled_classes.json"))
+            start = time.perf_counter()
+            conflicts = [repo.check_teacher_availability_conflict(teacher, day, hour, "21:00") or
+                         repo.check_classroom_availability_conflict(room, day, hour, "21:00")
+                         for teacher, room, day, hour in probes]
+            check_time = time.perf_counter() - start
+            results[layout] = (size, load_time, check_time, conflicts)
+    assert results["clases"][3] == results["series"][3]
+
+    print(f"Cursos: {num_courses:,}  Semanas: {TERM_WEEKS}  Sesiones: {num_courses * TERM_WEEKS:,}")
+    for layout, (size, load_time, check_time, _) in results.items():
+        print(f"{layout:>7}: {size / 1024:9.1f} KiB  carga {load_time * 1000:8.1f} ms  "
+              f"{num_checks:,} verificaciones {check_time * 1000:7.1f} ms")
+    print(f"Reducción del almacenamiento: {results['clases'][0] / results['series'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
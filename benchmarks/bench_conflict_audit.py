@@ -0,0 +1,65 @@
+"""
+Benchmark: auditoría de conflictos de scheduling.conflict_audit, en un solo proceso
+y repartida por fechas en un pool de procesos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_conflict_audit [num_clases]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from scheduling.conflict_audit import audit_scheduled_classes
+from utils.availability import AVAILABILITY_DAYS, AVAILABILITY_SLOT_HOURS
+
+AVAILABILITY_SLOTS = list(AVAILABILITY_SLOT_HOURS)
+
+
+def _generate_data(num_classes, seed=42):
+    """Genera clases sintéticas (con cruces) repartidas en un semestre, y sus profesores, materias y salones."""
+    rng = random.Random(seed)
+    teachers = [{"id_card": f"T{i}", "availability": {day: rng.sample(AVAILABILITY_SLOTS, 2) for day in AVAILABILITY_DAYS}}
+                for i in range(400)]
+    subjects = [{"id": f"S{i}", "requires_lab": i % 5 == 0} for i in range(300)]
+    classrooms = [{"number": str(100 + i), "block": block, "is_lab": i % 10 == 0}
+                  for i in range(60) for block in "AB"]
+    term_start = date(2026, 2, 2)
+    classes = []
+    for i in range(num_classes):
+        start_hour = rng.randrange(7, 20)
+        classes.append({
+            "id": f"C{i:06d}",
+            "date": (term_start + timedelta(days=rng.randrange(120))).strftime("%Y-%m-%d"),
+            "start_time": f"{start_hour:02d}:00",
+            "end_time": f"{start_hour + 2:02d}:00",
+            "subject_id": f"S{rng.randrange(300)}",
+            "teacher_id": f"T{rng.randrange(400)}",
+            "classroom_id": f"{rng.randrange(100, 160)}-{rng.choice('AB')}",
+        })
+    return classes, teachers, subjects, classrooms
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(num_classes=100_000):
+    classes, teachers, subjects, classrooms = _generate_data(num_classes)
+    serial, serial_time = _timed(audit_scheduled_classes, classes, teachers, subjects, classrooms, max_workers=1)
+    parallel, parallel_time = _timed(audit_scheduled_classes, classes, teachers, subjects, classrooms)
+    assert serial == parallel
+
+    print(f"Clases: {num_classes:,}")
+    print(f"Auditoría en un proceso:     {serial_time * 1000:9.1f} ms")
+    print(f"Auditoría con pool:          {parallel_time * 1000:9.1f} ms")
+    print(f"Cruces de profesor:          {len(serial['teacher_overlaps']):,}")
+    print(f"Cruces de salón:             {len(serial['classroom_overlaps']):,}")
+    print(f"Laboratorio no disponible:   {len(serial['lab_mismatches']):,}")
+    print(f"Fuera de disponibilidad:     {len(serial['outside_availability']):,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
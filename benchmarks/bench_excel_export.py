@@ -0,0 +1,144 @@
+"""
+Benchmark: in-memory openpyxl workbook (every cell styled one by one, the export before
+the write-only rewrite) vs. the streaming write-only export of utils.excel_exporter.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_excel_export [num_filas] [--sin-memoria]
+"""
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import openpyxl
+
+from utils.excel_exporter import (
+    CENTER_ALIGNMENT, HEADER_FILL, HEADER_FONT, LEFT_ALIGNMENT, SCHEDULE_COLUMN_WIDTHS, SCHEDULE_HEADERS,
+    TABLE_BORDER, TITLE_FONT, _schedule_sort_key, format_time_for_display, get_day_of_week,
+    write_teacher_schedule_to_excel
+)
+
+
+def _generate_rows(num_rows, seed=42):
+    """Genera clases sintéticas (diccionarios) para un horario institucional completo."""
+    rng = random.Random(seed)
+    term_start = date(2026, 2, 2)
+    rows = []
+    for i in range(num_rows):
+        start_hour = rng.randrange(7, 20)
+        rows.append({
+            "id": f"C{i:06d}",
+            "date": (term_start + timedelta(days=rng.randrange(120))).strftime("%Y-%m-%d"),
+            "start_time": f"{start_hour:02d}:00",
+            "end_time": f"{start_hour + 2:02d}:00",
+            "subject_id": f"S{rng.randrange(300)}",
+            "teacher_id": f"T{rng.randrange(400)}",
+            "classroom_id": f"{rng.randrange(100, 160)}-{rng.choice('AB')}",
+        })
+    return rows
+
+
+def _timed(func, *args):
+    """Ejecuta func y devuelve los segundos transcurridos."""
+    gc.collect()
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _peak_memory(func, *args):
+    """Ejecuta func bajo tracemalloc y devuelve el pico de memoria en MiB (corrida aparte: tracemalloc la ralentiza)."""
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def _legacy_build_workbook(schedule_data, teacher_name, subject_names, classroom_names):
+    """Exportación anterior: libro completo en memoria, con el estilo asignado celda por celda."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = f"Horario {teacher_name}"
+
+    sheet.merge_cells('A1:F1')
+    title_cell = sheet['A1']
+    title_cell.value = f"Horario de Clases - Profesor: {teacher_name}"
+    title_cell.font = TITLE_FONT
+    title_cell.alignment = CENTER_ALIGNMENT
+    sheet.row_dimensions[1].height = 20
+
+    for col_num, header_title in enumerate(SCHEDULE_HEADERS, 1):
+        cell = sheet.cell(row=3, column=col_num, value=header_title)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = CENTER_ALIGNMENT
+        cell.border = TABLE_BORDER
+    for column_letter, width in SCHEDULE_COLUMN_WIDTHS.items():
+        sheet.column_dimensions[column_letter].width = width
+
+    schedule_data.sort(key=_schedule_sort_key)
+    for current_row, entry in enumerate(schedule_data, 4):
+        date_str = entry.get("date", "N/A")
+        subject_id = entry.get("subject_id")
+        classroom_id = entry.get("classroom_id")
+        row_data = [
+            get_day_of_week(date_str),
+            date_str,
+            format_time_for_display(entry.get("start_time", "N/A")),
+            format_time_for_display(entry.get("end_time", "N/A")),
+            subject_names.get(subject_id, subject_id),
+            classroom_names.get(classroom_id, classroom_id)
+        ]
+        for col_num, cell_value in enumerate(row_data, 1):
+            cell = sheet.cell(row=current_row, column=col_num, value=cell_value)
+            cell.alignment = LEFT_ALIGNMENT if col_num in [1, 5, 6] else CENTER_ALIGNMENT
+            cell.border = TABLE_BORDER
+        sheet.row_dimensions[current_row].height = 18
+
+    sheet.freeze_panes = 'A4'
+    return workbook
+
+
+def _in_memory_export(rows, subject_names, file_path):
+    workbook = _legacy_build_workbook(list(rows), "Institución", subject_names, {})
+    workbook.save(file_path)
+
+
+def _streaming_export(rows, subject_names, file_path):
+    # Generador ya ordenado: ninguna estructura del exportador crece con el número de filas
+    write_teacher_schedule_to_excel(iter(rows), "Institución", subject_names, {}, file_path,
+                                    presorted=True)
+
+
+def main(num_rows=100_000, measure_memory=True):
+    # Ordenadas de antemano (como al exportar desde get_scheduled_classes_sorted)
+    rows = sorted(_generate_rows(num_rows), key=_schedule_sort_key)
+    subject_names = {f"S{i}": f"Materia {i}" for i in range(300)}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        in_memory_path = os.path.join(tmp_dir, "in_memory.xlsx")
+        streaming_path = os.path.join(tmp_dir, "streaming.xlsx")
+        in_memory_time = _timed(_in_memory_export, rows, subject_names, in_memory_path)
+        streaming_time = _timed(_streaming_export, rows, subject_names, streaming_path)
+        if measure_memory:
+            in_memory_peak = _peak_memory(_in_memory_export, rows, subject_names, in_memory_path)
+            streaming_peak = _peak_memory(_streaming_export, rows, subject_names, streaming_path)
+        in_memory_size = os.path.getsize(in_memory_path)
+        streaming_size = os.path.getsize(streaming_path)
+
+    print(f"Filas: {num_rows:,}")
+    print(f"Libro en memoria:  {in_memory_time:7.2f} s  ({in_memory_size / 1024:,.0f} KiB)")
+    print(f"Solo escritura:    {streaming_time:7.2f} s  ({streaming_size / 1024:,.0f} KiB)")
+    if measure_memory:
+        print(f"Pico de memoria en memoria:     {in_memory_peak:8.1f} MiB")
+        print(f"Pico de memoria solo escritura: {streaming_peak:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    main(int(args[0]) if args else 100_000, measure_memory="--sin-memoria" not in sys.argv)
@@ -0,0 +1,82 @@
+"""
+Benchmark: arranque de ScheduledClassRepository con el almacenamiento por meses
+(solo el periodo activo) frente a leer todo el historial.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_partitioned_storage [num_clases]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from repositories.scheduled_class_repository import ScheduledClassRepository
+
+HISTORY_YEARS = 5
+
+
+def _write_history(filepath, num_classes, seed=42):
+    """Escribe un scheduled_classes.json con clases repartidas en los últimos HISTORY_YEARS años."""
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=365 * HISTORY_YEARS)
+    classes = []
+    for i in range(num_classes):
+        start_hour = rng.randrange(7, 20)
+        classes.append({
+            "id": f"C{i:07d}",
+            "date": (first_day + timedelta(days=rng.randrange(365 * HISTORY_YEARS + 120))).strftime("%Y-%m-%d"),
+            "start_time": f"{start_hour:02d}:00",
+            "end_time": f"{start_hour + 2:02d}:00",
+            "subject_id": f"S{rng.randrange(300)}",
+            "teacher_id": f"T{rng.randrange(400)}",
+            "classroom_id": f"{rng.randrange(100, 160)}-{rng.choice('AB')}",
+        })
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(classes, f)
+
+
+def _measure(func):
+    """Tiempo y pico de memoria de func()."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(num_classes=200_000):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "scheduled_classes.json")
+        _write_history(filepath, num_classes)
+        ScheduledClassRepository(filepath)  # Migra el archivo único a un archivo por mes
+
+        active, active_time, active_peak = _measure(lambda: ScheduledClassRepository(filepath))
+
+        def load_everything():
+            repo = ScheduledClassRepository(filepath)
+            repo.load_date_range()
+            return repo
+        full, full_time, full_peak = _measure(load_everything)
+
+        old_date = (date.today() - timedelta(days=3 * 365)).strftime("%Y-%m-%d")
+        start = time.perf_counter()
+        active.load_date_range(old_date, old_date)
+        active.get_scheduled_classes_sorted(old_date)
+        page_in_time = time.perf_counter() - start
+
+    print(f"Clases: {num_classes:,} en {HISTORY_YEARS} años ({len(full.storage.partitions)} meses)")
+    print(f"Arranque con el periodo activo: {active_time * 1000:9.1f} ms  "
+          f"{active_peak / 2**20:7.1f} MiB  {len(active.scheduled_classes_data):,} clases")
+    print(f"Arranque con todo el historial: {full_time * 1000:9.1f} ms  "
+          f"{full_peak / 2**20:7.1f} MiB  {len(full.scheduled_classes_data):,} clases")
+    print(f"Filtrar una fecha de hace 3 años (lee su mes): {page_in_time * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
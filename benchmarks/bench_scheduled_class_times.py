@@ -0,0 +1,100 @@
+"""
+Benchmark: strptime re-parsing vs. the pre-parsed numeric time form kept by
+ScheduledClassRepository (ordinal day + start/end minutes).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_scheduled_class_times [num_clases]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from repositories.scheduled_class_repository import ScheduledClassRepository
+
+
+def _generate_classes(num_classes, seed=42):
+    """Genera clases sintéticas repartidas en un semestre, como listas [id, fecha, ...]."""
+    rng = random.Random(seed)
+    term_start = date(2026, 2, 2)
+    classes = []
+    for i in range(num_classes):
+        class_date = term_start + timedelta(days=rng.randrange(120))
+        start_hour = rng.randrange(7, 20)
+        classes.append([
+            f"C{i:06d}",
+            class_date.strftime("%Y-%m-%d"),
+            f"{start_hour:02d}:00",
+            f"{start_hour + 2:02d}:00",
+            f"S{rng.randrange(300)}",
+            f"T{rng.randrange(400)}",
+            f"{rng.randrange(100, 160)}-{rng.choice('AB')}",
+        ])
+    return classes
+
+
+def _legacy_sort(rows):
+    """Orden previo de ClasesFrame: dos strptime por fila."""
+    return sorted(rows, key=lambda x: (datetime.strptime(x[1], "%Y-%m-%d"),
+                                       datetime.strptime(x[2], "%H:%M")))
+
+
+def _legacy_teacher_conflict(data, teacher_id, date_str, start_str, end_str):
+    """Verificación previa: recorre todas las clases y parsea tres valores por fila."""
+    new_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    new_start = datetime.strptime(start_str, "%H:%M").time()
+    new_end = datetime.strptime(end_str, "%H:%M").time()
+    for sc in data:
+        if str(sc.get("teacher_id")) == str(teacher_id):
+            existing_date = datetime.strptime(sc.get("date"), "%Y-%m-%d").date()
+            existing_start = datetime.strptime(sc.get("start_time"), "%H:%M").time()
+            existing_end = datetime.strptime(sc.get("end_time"), "%H:%M").time()
+            if new_date == existing_date and \
+               max(new_start, existing_start) < min(new_end, existing_end):
+                return True
+    return False
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(num_classes=50_000, num_checks=200):
+    rows = _generate_classes(num_classes)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo = ScheduledClassRepository(os.path.join(tmp_dir, "scheduled_classes.json"))
+        # Carga directa en memoria para no medir la escritura del JSON
+        repo.scheduled_classes_data = [
+            {"id": r[0], "date": r[1], "start_time": r[2], "end_time": r[3],
+             "subject_id": r[4], "teacher_id": r[5], "classroom_id": r[6]} for r in rows]
+        _, index_time = _timed(repo._rebuild_indexes)
+
+        legacy_sorted, legacy_sort_time = _timed(_legacy_sort, rows)
+        new_sorted, new_sort_time = _timed(repo.get_scheduled_classes_sorted)
+        assert [r[0] for r in legacy_sorted] == [r[0] for r in new_sorted]
+
+        probes = random.Random(7).sample(rows, num_checks)
+        start = time.perf_counter()
+        legacy_results = [_legacy_teacher_conflict(repo.scheduled_classes_data, r[5], r[1], r[2], r[3])
+                          for r in probes]
+        legacy_check_time = time.perf_counter() - start
+        start = time.perf_counter()
+        new_results = [repo.check_teacher_availability_conflict(r[5], r[1], r[2], r[3])
+                       for r in probes]
+        new_check_time = time.perf_counter() - start
+        assert legacy_results == new_results
+
+    print(f"Clases: {num_classes:,}")
+    print(f"Parseo único al cargar (forma numérica + índices): {index_time * 1000:9.1f} ms")
+    print(f"Ordenar con strptime:          {legacy_sort_time * 1000:9.1f} ms  ({2 * num_classes:,} llamadas a strptime)")
+    print(f"Ordenar con forma numérica:    {new_sort_time * 1000:9.1f} ms")
+    print(f"{num_checks} verificaciones con strptime: {legacy_check_time * 1000:9.1f} ms")
+    print(f"{num_checks} verificaciones indexadas:    {new_check_time * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
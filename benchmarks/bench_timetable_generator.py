@@ -0,0 +1,51 @@
+"""
+Benchmark: generación automática de un horario con scheduling.timetable_generator.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_timetable_generator [num_materias]
+"""
+import random
+import sys
+import time
+from datetime import date
+
+from scheduling.timetable_generator import build_timetable
+from utils.availability import AVAILABILITY_DAYS
+
+AVAILABILITY_SLOTS = ["Mañana", "Tarde", "Noche"]
+
+
+def _generate_data(num_subjects, seed=42):
+    """Genera profesores, salones y materias sintéticos (un profesor cada ~3 materias, un salón cada ~5)."""
+    rng = random.Random(seed)
+    teachers = [
+        {"id_card": f"T{i}", "first_name": "Profesor", "last_name": str(i),
+         "availability": {day: rng.sample(AVAILABILITY_SLOTS, rng.randint(1, 3))
+                          for day in AVAILABILITY_DAYS if rng.random() < 0.7}}
+        for i in range(max(1, num_subjects // 3))]
+    classrooms = [
+        {"number": str(100 + i), "block": "AB"[i % 2], "capacity": rng.randint(20, 60), "is_lab": i % 8 == 0}
+        for i in range(max(1, num_subjects // 5))]
+    subjects = [
+        {"id": f"S{i}", "name": f"Materia {i}", "intensity_hours": rng.choice([2, 3, 4]),
+         "requires_lab": rng.random() < 0.2, "assigned_teacher_id": rng.choice(teachers)["id_card"],
+         "time_slot": rng.choice(["Diurna", "Diurna", "Nocturna"])}
+        for i in range(num_subjects)]
+    return teachers, subjects, classrooms
+
+
+def main(num_subjects=1000):
+    teachers, subjects, classrooms = _generate_data(num_subjects)
+    start = time.perf_counter()
+    result = build_timetable(teachers, subjects, classrooms, [], date(2026, 2, 2), date(2026, 5, 30))
+    elapsed = time.perf_counter() - start
+
+    print(f"Materias: {num_subjects:,}  Profesores: {len(teachers):,}  Salones: {len(classrooms):,}")
+    print(f"Tiempo de generación:   {elapsed * 1000:9.1f} ms  ({result['nodes']:,} nodos de búsqueda)")
+    print(f"Materias ubicadas:      {len(result['placements']):,}")
+    print(f"Materias sin ubicar:    {len(result['unscheduled']):,}")
+    print(f"Clases generadas:       {result['session_count']:,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -1,57 +1,84 @@
-import json
-import os
+from repositories.storage import StorageError, create_storage, remember_for_rollback, repository_batch
 
 
 class ClassroomRepository:
     """
-    Manages classroom data persistence in a JSON file.
+    Manages classroom data persistence (a JSON file by default, see repositories.storage).
     Handles loading, saving, adding, updating, and deleting classrooms.
     Classroom uniqueness is determined by the combination of its number and block.
     """
 
-    def __init__(self, filepath='./storage/classrooms.json'):
+    STORAGE_NAME = "classrooms"
+
+    def __init__(self, filepath='./storage/classrooms.json', storage=None):
         """
         Initializes the repository.
 
         Args:
             filepath (str): The path to the JSON file where classroom data is stored.
+            storage (optional): Storage backend (JsonFileStorage, JournaledJsonStorage,
+                SqliteStorage). Defaults to the backend configured in
+                repositories.storage.STORAGE_BACKEND.
         """
         self.filepath = filepath
-        # Ensure the storage directory exists
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        self.storage = storage if storage is not None else create_storage(
+            filepath, self.STORAGE_NAME, self._storage_key)
         self.classrooms_data = self._load_data()
+        # Contador de cambios en memoria: las vistas lo comparan para saber si deben refrescarse
+        self.revision = 0
+        # Índice por clave primaria compuesta: {(number, block): classroom_dict}
+        self._classrooms_by_key = {}
+        self._rebuild_indexes()
 
     def _load_data(self):
         """
-        Loads classroom data from the JSON file.
-        If the file doesn't exist or is empty, it returns an empty list.
+        Loads classroom data from the storage backend.
+        If there is no stored data, it returns an empty list.
         (Consider re-adding default data here if needed for a first run)
 
         Returns:
             list: A list of classroom dictionaries.
         """
-        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
-            return []
-        try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading data from {self.filepath}: {e}")
-            return []
+        return self.storage.load()
 
     def _save_data(self, data=None):
         """
-        Saves the classroom data to the JSON file.
+        Saves the classroom data to the storage backend (full rewrite).
 
         Args:
             data (list, optional): The data to save. If None, saves self.classrooms_data.
         """
-        try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(data if data is not None else self.classrooms_data,
-                          f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error saving data to {self.filepath}: {e}")
+        self.storage.save_all(data if data is not None else self.classrooms_data)
+
+    @staticmethod
+    def _storage_key(classroom):
+        """Returns the storage primary key of a classroom dictionary ("number-block")."""
+        return f"{classroom.get('number')}-{classroom.get('block')}"
+
+    def batch(self):
+        """
+        Returns a context manager that defers persistence of the classrooms changed
+        inside it to a single write on exit. If the block raises, the in-memory
+        data is restored and nothing is written.
+
+        Example:
+            with classroom_repo.batch():
+                for row in rows:
+                    classroom_repo.add_classroom(row)
+
+        Returns:
+            contextlib.AbstractContextManager: Yields this repository.
+        """
+        return repository_batch(self, "classrooms_data")
+
+    def _rebuild_indexes(self):
+        """Rebuilds the (number, block) -> classroom dictionary index from self.classrooms_data."""
+        self._classrooms_by_key = {
+            (str(c.get("number")), str(c.get("block"))): c for c in self.classrooms_data}
+
+    def _mark_changed(self):
+        """Advances the revision counter after any change to the in-memory data."""
+        self.revision += 1
 
     def get_all_classrooms(self):
         """
@@ -75,11 +102,9 @@ class ClassroomRepository:
         Returns:
             list: A list of the classroom's attributes if found, otherwise None.
         """
-        for classroom in self.classrooms_data:
-            if str(classroom.get("number")) == str(classroom_number) and \
-               str(classroom.get("block")) == str(classroom_block):
-                return list(classroom.values())
-        return None
+        classroom = self._classrooms_by_key.get(
+            (str(classroom_number), str(classroom_block)))
+        return list(classroom.values()) if classroom is not None else None
 
     def classroom_exists(self, classroom_number, classroom_block):
         """
@@ -92,11 +117,7 @@ class ClassroomRepository:
         Returns:
             bool: True if the classroom (number and block combination) exists, False otherwise.
         """
-        return any(
-            str(c.get("number")) == str(classroom_number) and
-            str(c.get("block")) == str(classroom_block)
-            for c in self.classrooms_data
-        )
+        return (str(classroom_number), str(classroom_block)) in self._classrooms_by_key
 
     def add_classroom(self, classroom_details):
         """
@@ -121,8 +142,15 @@ class ClassroomRepository:
             "capacity": int(classroom_details[2]),
             "is_lab": bool(classroom_details[3])
         }
-        self.classrooms_data.append(new_classroom)
-        self._save_data()
+        try:
+            with self.batch():
+                self.classrooms_data.append(new_classroom)
+                self._classrooms_by_key[(number, block)] = new_classroom
+                self.storage.upsert(new_classroom, self.classrooms_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save classroom '{number}-{block}': {e}")
+            return False
         return True
 
     def update_classroom(self, original_number, original_block, updated_details):
@@ -148,18 +176,33 @@ class ClassroomRepository:
            self.classroom_exists(new_number, new_block):
             return False  # New number/block combination conflicts with another existing classroom
 
-        for i, classroom in enumerate(self.classrooms_data):
-            if str(classroom.get("number")) == str(original_number) and \
-               str(classroom.get("block")) == str(original_block):
-                self.classrooms_data[i] = {
-                    "number": new_number,
-                    "block": new_block,
-                    "capacity": int(updated_details[2]),
-                    "is_lab": bool(updated_details[3])
-                }
-                self._save_data()
-                return True
-        return False  # Classroom with original_number and original_block not found
+        original_key = (str(original_number), str(original_block))
+        classroom = self._classrooms_by_key.get(original_key)
+        if classroom is None:
+            return False  # Classroom with original_number and original_block not found
+        previous_storage_key = self._storage_key(classroom)
+
+        updated_classroom = {
+            "number": new_number,
+            "block": new_block,
+            "capacity": int(updated_details[2]),
+            "is_lab": bool(updated_details[3])
+        }
+        try:
+            with self.batch():
+                # Se actualiza el diccionario en su lugar: conserva su posición en la lista
+                remember_for_rollback(self, classroom)
+                classroom.clear()
+                classroom.update(updated_classroom)
+                del self._classrooms_by_key[original_key]
+                self._classrooms_by_key[(new_number, new_block)] = classroom
+                self.storage.upsert(classroom, self.classrooms_data,
+                                    previous_key=previous_storage_key)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save classroom '{new_number}-{new_block}': {e}")
+            return False
+        return True
 
     def delete_classroom(self, classroom_number, classroom_block):
         """
@@ -172,18 +215,19 @@ class ClassroomRepository:
         Returns:
             bool: True if deleted successfully, False otherwise.
         """
-        classroom_number_str = str(classroom_number)
-        # Ensure block is string for comparison
-        classroom_block_str = str(classroom_block)
-        original_len = len(self.classrooms_data)
-
-        self.classrooms_data = [
-            c for c in self.classrooms_data
-            if not (str(c.get("number")) == classroom_number_str and
-                    str(c.get("block")) == classroom_block_str)
-        ]
-
-        if len(self.classrooms_data) < original_len:
-            self._save_data()
-            return True
-        return False
+        # Ensure number and block are strings for the key lookup
+        classroom = self._classrooms_by_key.pop(
+            (str(classroom_number), str(classroom_block)), None)
+        if classroom is None:
+            return False
+
+        try:
+            with self.batch():
+                self.classrooms_data = [
+                    c for c in self.classrooms_data if c is not classroom]
+                self.storage.delete(classroom, self.classrooms_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not delete classroom '{classroom_number}-{classroom_block}': {e}")
+            return False
+        return True
@@ -0,0 +1,78 @@
+import threading
+
+from repositories.classroom_repository import ClassroomRepository
+from repositories.scheduled_class_repository import ScheduledClassRepository
+from repositories.subject_repository import SubjectRepository
+from repositories.teacher_repository import TeacherRepository
+
+
+class RepositoryRegistry:
+    """
+    Holds a single instance of each repository so that every frame, dialog and
+    export shares the same in-memory data. Each repository is created (and its
+    store parsed) the first time it is requested, from any thread.
+    """
+
+    REPOSITORY_NAMES = ("teacher_repo", "subject_repo", "classroom_repo", "scheduled_class_repo")
+
+    def __init__(self, storage_dir='./storage'):
+        """
+        Initializes the registry.
+
+        Args:
+            storage_dir (str): Directory that holds the repositories' storage files.
+        """
+        self.storage_dir = storage_dir
+        self._instances = {}
+        self._lock = threading.Lock()
+        self._creation_locks = {}
+
+    def _get(self, repo_cls, filename):
+        """
+        Returns the shared instance of repo_cls, creating it on first use. If another
+        thread is already loading it, waits for that load instead of parsing the store twice.
+        """
+        repo = self._instances.get(repo_cls)
+        if repo is None:
+            with self._lock:
+                creation_lock = self._creation_locks.setdefault(repo_cls, threading.Lock())
+            with creation_lock:
+                repo = self._instances.get(repo_cls)
+                if repo is None:
+                    repo = repo_cls(f"{self.storage_dir}/{filename}")
+                    self._instances[repo_cls] = repo
+        return repo
+
+    def load_all(self):
+        """
+        Loads every repository that has not been loaded yet, one at a time.
+        Meant to be consumed from a worker thread at startup.
+
+        Yields:
+            tuple: (loaded, total, name) after each repository, where name is the
+                   registry attribute (e.g. "teacher_repo").
+        """
+        total = len(self.REPOSITORY_NAMES)
+        for loaded, name in enumerate(self.REPOSITORY_NAMES, start=1):
+            getattr(self, name)
+            yield loaded, total, name
+
+    @property
+    def teacher_repo(self):
+        """TeacherRepository: The shared teacher repository."""
+        return self._get(TeacherRepository, "teachers.json")
+
+    @property
+    def subject_repo(self):
+        """SubjectRepository: The shared subject repository."""
+        return self._get(SubjectRepository, "subjects.json")
+
+    @property
+    def classroom_repo(self):
+        """ClassroomRepository: The shared classroom repository."""
+        return self._get(ClassroomRepository, "classrooms.json")
+
+    @property
+    def scheduled_class_repo(self):
+        """ScheduledClassRepository: The shared scheduled class repository."""
+        return self._get(ScheduledClassRepository, "scheduled_classes.json")
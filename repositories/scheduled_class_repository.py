@@ -1,71 +1,608 @@
-
-import json
 import os
 import uuid
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+
+from repositories.storage import (StorageError, collections_batch, create_partitioned_storage,
+                                  create_storage, remember_for_rollback)
+
+# Resolución de las máscaras de ocupación: 96 bits por día
+OCCUPANCY_SLOT_MINUTES = 15
+# Las ocurrencias de una serie se identifican como "<id de la serie>@<YYYY-MM-DD>"
+OCCURRENCE_ID_SEPARATOR = "@"
+# Con almacenamiento por meses, al iniciar se cargan el mes actual, los posteriores y estos
+# meses anteriores; los más antiguos se leen cuando se consulta una fecha suya
+ACTIVE_HISTORY_MONTHS = 6
+# Partición de las clases sin una fecha válida (siempre se carga)
+UNDATED_PARTITION = "undated"
+
+
+class _ChangeRejected(Exception):
+    """Raised inside batch() to roll back a multi-step change when one of its steps is rejected."""
+
+
+@lru_cache(maxsize=4096)
+def parse_date_ordinal(date_str):
+    """
+    Converts a 'YYYY-MM-DD' string to its proleptic Gregorian ordinal.
+    Results are cached: a term only has a few hundred distinct dates.
+
+    Raises:
+        ValueError, TypeError: If the string is missing or malformed.
+    """
+    return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+
+
+@lru_cache(maxsize=1440)
+def parse_time_minutes(time_str):
+    """
+    Converts an 'HH:MM' string to minutes since midnight (cached).
+
+    Raises:
+        ValueError, TypeError: If the string is missing or malformed.
+    """
+    parsed = datetime.strptime(time_str, "%H:%M")
+    return parsed.hour * 60 + parsed.minute
+
+
+def parse_class_times(date_str, start_time_str, end_time_str):
+    """
+    Builds the compact numeric form of a class schedule.
+
+    Returns:
+        tuple: (date_ordinal, start_minutes, end_minutes).
+
+    Raises:
+        ValueError, TypeError: If any of the values is missing or malformed.
+    """
+    return (parse_date_ordinal(date_str),
+            parse_time_minutes(start_time_str),
+            parse_time_minutes(end_time_str))
+
+
+def occupancy_mask(start_minutes, end_minutes):
+    """
+    Builds the occupancy bitmask of an interval within a day: bit i stands for the
+    OCCUPANCY_SLOT_MINUTES-long slot starting at minute i * OCCUPANCY_SLOT_MINUTES.
+    Partially covered slots count as occupied.
+
+    Returns:
+        int: The bitmask (0 for an empty or inverted interval).
+    """
+    first = start_minutes // OCCUPANCY_SLOT_MINUTES
+    last = -(-end_minutes // OCCUPANCY_SLOT_MINUTES)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def class_partition(scheduled_class):
+    """Returns the storage partition of a scheduled class: its month ('YYYY-MM') or UNDATED_PARTITION."""
+    date_str = scheduled_class.get("date")
+    try:
+        parse_date_ordinal(date_str)
+    except (ValueError, TypeError):
+        return UNDATED_PARTITION
+    return date_str[:7]
+
+
+def class_occurrence_id(series_id, date_str):
+    """Returns the ID of a class series occurrence ("<series_id>@<YYYY-MM-DD>")."""
+    return f"{series_id}{OCCURRENCE_ID_SEPARATOR}{date_str}"
 
 
 class ScheduledClassRepository:
     """
-    Manages scheduled class data persistence in a JSON file.
+    Manages scheduled class data persistence (a JSON file by default, see repositories.storage).
     Handles loading, saving, adding, updating, and deleting scheduled classes.
+
+    With the JSON backend, classes are stored in one file per month
+    (storage/scheduled_classes/YYYY-MM.json) and only the active months are loaded
+    (see ACTIVE_HISTORY_MONTHS). Queries only see the loaded months and never read from
+    disk: call load_date_range() first (on the Tk thread) to query an older window. Adding
+    or updating a class pages in its own month, which is rewritten whole on save.
+
+    Weekly courses can also be stored as class series: one record with the recurrence
+    rule (first and last date, weekday of the first date, every N weeks) plus the
+    cancelled dates. Series are expanded into occurrences only for the date window
+    that is requested, and conflict checks test against the rule directly.
     """
 
-    def __init__(self, filepath='./storage/scheduled_classes.json'):
+    STORAGE_NAME = "scheduled_classes"
+    SERIES_STORAGE_NAME = "class_series"
+    SERIES_FILENAME = "class_series.json"
+
+    def __init__(self, filepath='./storage/scheduled_classes.json', storage=None, series_storage=None):
         """
         Initializes the repository.
 
         Args:
             filepath (str): The path to the JSON file where scheduled class data is stored.
+                With the JSON backend the monthly files go to the directory of the same name
+                without the extension, and an existing file is migrated to it.
+                Class series are stored in SERIES_FILENAME in the same directory.
+            storage (optional): Storage backend (PartitionedJsonStorage, JsonFileStorage,
+                JournaledJsonStorage, SqliteStorage). Defaults to the backend configured in
+                repositories.storage.STORAGE_BACKEND.
+            series_storage (optional): Storage backend for the class series; same default.
         """
         self.filepath = filepath
-        # Ensure the storage directory exists
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        self.storage = storage if storage is not None else create_partitioned_storage(
+            filepath, self.STORAGE_NAME, self._storage_key, class_partition)
+        # Solo un almacenamiento por particiones carga una parte de las clases
+        self.partitioned = hasattr(self.storage, "list_partitions")
+        self.series_storage = series_storage if series_storage is not None else create_storage(
+            os.path.join(os.path.dirname(filepath) or ".", self.SERIES_FILENAME),
+            self.SERIES_STORAGE_NAME, self._storage_key)
         self.scheduled_classes_data = self._load_data()
+        self.class_series_data = self.series_storage.load()
+        # Contador de cambios en memoria: las vistas lo comparan para saber si deben refrescarse
+        self.revision = 0
+        # Índice por clave primaria: {id: scheduled_class_dict}
+        self._classes_by_id = {}
+        # Forma numérica precalculada de cada clase: {class_id: (ordinal, min_inicio, min_fin)}
+        self._class_times = {}
+        # Índices de intervalos por (recurso, ordinal): {(id, ordinal): {class_id: (min_inicio, min_fin)}}
+        # Permiten verificar conflictos revisando solo las clases de ese día.
+        self._teacher_day_index = {}
+        self._classroom_day_index = {}
+        # Ocupación por (recurso, ordinal) como máscara de bits (ver occupancy_mask):
+        # {(id, ordinal): int}. Un AND basta para descartar un cruce.
+        self._teacher_day_occupancy = {}
+        self._classroom_day_occupancy = {}
+        # Series: {series_id: series_dict} y su regla compilada (ver _compile_series_rule)
+        self._series_by_id = {}
+        self._series_rules = {}
+        # Series por (recurso, weekday): {(id, weekday): {series_id: regla}}
+        self._teacher_series_index = {}
+        self._classroom_series_index = {}
+        self._rebuild_indexes()
 
     def _load_data(self):
         """
-        Loads scheduled class data from the JSON file.
-        If the file doesn't exist or is empty, it initializes with an empty list
-        or optional default data.
+        Loads scheduled class data from the storage backend (with a partitioned storage,
+        only the active partitions, see _active_partitions).
+        If there is no stored data, it initializes with an empty list
+        (no default data for scheduled classes, as they are highly dynamic).
 
         Returns:
             list: A list of scheduled class dictionaries.
         """
-        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
-            # No default data for scheduled classes by default, as they are highly dynamic.
-            # If you need default/example data for a first run, you can add it here:
-            # default_data = [
-            #     {
-            #         "id": str(uuid.uuid4()).upper(), "date": "2025-08-01", "start_time": "07:00",
-            #         "end_time": "09:00", "subject_id": "ID_MATERIA_ALGEBRA",
-            #         "teacher_id": "12345", "classroom_id": "101-A"
-            #     }
-            # ]
-            # self._save_data(default_data)
-            # return default_data
-            return []
+        if self.partitioned:
+            return self.storage.load(self._active_partitions())
+        return self.storage.load()
+
+    def _active_partitions(self):
+        """Partitions loaded at startup: from ACTIVE_HISTORY_MONTHS months ago onwards, plus the undated one."""
+        today = date.today()
+        months = today.year * 12 + today.month - 1 - ACTIVE_HISTORY_MONTHS
+        cutoff = f"{months // 12:04d}-{months % 12 + 1:02d}"
+        return [p for p in self.storage.list_partitions() if p >= cutoff or p == UNDATED_PARTITION]
+
+    def load_date_range(self, start_date_str=None, end_date_str=None):
+        """
+        Pages in the stored partitions (months) that overlap a date window and are not
+        loaded yet. Does nothing with a non-partitioned storage, where everything is loaded.
+        Paging in does not change the stored data, so the revision is not advanced.
+
+        Args:
+            start_date_str (str, optional): First date (YYYY-MM-DD) of the window; open if None.
+            end_date_str (str, optional): Last date (YYYY-MM-DD, included); open if None.
+
+        Returns:
+            int: Number of scheduled classes loaded.
+
+        Raises:
+            ValueError: If a window date is given but is not a valid date.
+        """
+        first, last = self._window_ordinals(start_date_str, end_date_str)
+        if not self.partitioned:
+            return 0
+        first_month = date.fromordinal(first).strftime("%Y-%m")
+        last_month = date.fromordinal(last).strftime("%Y-%m")
+        missing = [p for p in self.storage.list_partitions()
+                   if p not in self.storage.loaded_partitions and first_month <= p <= last_month]
+        return self._add_loaded_records(self.storage.load(missing)) if missing else 0
+
+    def _ensure_date_loaded(self, ordinal):
+        """Pages in the partition of a date ordinal if it is stored and not loaded yet."""
+        if self.partitioned:
+            partition = date.fromordinal(ordinal).strftime("%Y-%m")
+            if partition in self.storage.partitions and partition not in self.storage.loaded_partitions:
+                self._add_loaded_records(self.storage.load([partition]))
+
+    def _ensure_date_str_loaded(self, date_str):
+        """Like _ensure_date_loaded, for a 'YYYY-MM-DD' string; malformed dates are ignored."""
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading scheduled class data from {
-                  self.filepath}: {e}")
-            return []
+            self._ensure_date_loaded(parse_date_ordinal(date_str))
+        except (ValueError, TypeError):
+            pass
+
+    def _add_loaded_records(self, records):
+        """Appends paged-in records to the in-memory data and indexes them."""
+        added = 0
+        for sc in records:
+            class_id = str(sc.get("id"))
+            if class_id in self._classes_by_id:
+                continue  # Repetida en otra partición: se conserva la ya cargada
+            self.scheduled_classes_data.append(sc)
+            self._classes_by_id[class_id] = sc
+            self._index_scheduled_class(sc)
+            added += 1
+        return added
 
     def _save_data(self, data=None):
         """
-        Saves the scheduled class data to the JSON file.
+        Saves the scheduled class data to the storage backend (full rewrite).
 
         Args:
             data (list, optional): The data to save. If None, saves self.scheduled_classes_data.
         """
+        self.storage.save_all(data if data is not None else self.scheduled_classes_data)
+
+    @staticmethod
+    def _storage_key(scheduled_class):
+        """Returns the storage primary key of a scheduled class dictionary."""
+        return str(scheduled_class.get("id"))
+
+    def batch(self):
+        """
+        Returns a context manager that defers persistence of the scheduled classes and class
+        series changed inside it to a single write on exit. If the block raises, the in-memory
+        data is restored and nothing is written.
+
+        Example:
+            with scheduled_class_repo.batch():
+                for row in rows:
+                    scheduled_class_repo.add_scheduled_class(row)
+
+        Returns:
+            contextlib.AbstractContextManager: Yields this repository.
+        """
+        return self._batch()
+
+    def _batch(self):
+        # Las clases se escriben antes que las series: si falla la escritura de las series, en
+        # disco quedan la ocurrencia sin cancelar y su clase suelta, en lugar de una ocurrencia
+        # cancelada sin reemplazo
+        return collections_batch(self, [("scheduled_classes_data", self.storage),
+                                        ("class_series_data", self.series_storage)])
+
+    def _rebuild_indexes(self):
+        """
+        Rebuilds the id index, the numeric time form and the per-(teacher, date)
+        and per-(classroom, date) interval indexes and occupancy masks from
+        self.scheduled_classes_data, and the series indexes from self.class_series_data.
+        """
+        self._series_by_id = {}
+        self._series_rules = {}
+        self._teacher_series_index = {}
+        self._classroom_series_index = {}
+        for series in self.class_series_data:
+            self._series_by_id[str(series.get("id"))] = series
+            self._index_class_series(series)
+        self._classes_by_id = {}
+        self._class_times = {}
+        self._teacher_day_index = {}
+        self._classroom_day_index = {}
+        self._teacher_day_occupancy = {}
+        self._classroom_day_occupancy = {}
+        for sc in self.scheduled_classes_data:
+            self._classes_by_id[str(sc.get("id"))] = sc
+            self._index_scheduled_class(sc)
+
+    def _mark_changed(self):
+        """Advances the revision counter after any change to the in-memory data."""
+        self.revision += 1
+
+    def _index_scheduled_class(self, sc):
+        """
+        Parses a scheduled class once and adds it to the interval indexes and
+        occupancy masks. Malformed records are left out and never take part in conflicts.
+
+        Args:
+            sc (dict): The scheduled class dictionary.
+        """
+        try:
+            times = parse_class_times(
+                sc.get("date"), sc.get("start_time"), sc.get("end_time"))
+        except (ValueError, TypeError):
+            return  # Datos mal formateados en el JSON
+        class_id = str(sc.get("id"))
+        ordinal, start, end = times
+        self._class_times[class_id] = times
+        mask = occupancy_mask(start, end)
+        key = (str(sc.get("teacher_id")), ordinal)
+        self._teacher_day_index.setdefault(key, {})[class_id] = (start, end)
+        self._teacher_day_occupancy[key] = self._teacher_day_occupancy.get(key, 0) | mask
+        key = (str(sc.get("classroom_id")), ordinal)
+        self._classroom_day_index.setdefault(key, {})[class_id] = (start, end)
+        self._classroom_day_occupancy[key] = self._classroom_day_occupancy.get(key, 0) | mask
+
+    def _unindex_scheduled_class(self, sc):
+        """
+        Removes a scheduled class from the interval indexes and occupancy masks.
+
+        Args:
+            sc (dict): The scheduled class dictionary, as it was when indexed.
+        """
+        class_id = str(sc.get("id"))
+        times = self._class_times.pop(class_id, None)
+        if times is None:
+            return
+        for index, occupancy, resource_id in (
+                (self._teacher_day_index, self._teacher_day_occupancy, sc.get("teacher_id")),
+                (self._classroom_day_index, self._classroom_day_occupancy, sc.get("classroom_id"))):
+            key = (str(resource_id), times[0])
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(class_id, None)
+                if not bucket:
+                    del index[key]
+                    occupancy.pop(key, None)
+                else:
+                    # Otra clase del día puede compartir bits con la eliminada (datos con cruces):
+                    # la máscara se recalcula con las que quedan
+                    occupancy[key] = self._bucket_mask(bucket)
+
+    @staticmethod
+    def _compile_series_rule(series):
+        """
+        Parses a class series once into the numeric rule used for expansion and conflicts.
+        Malformed cancelled dates are ignored.
+
+        Args:
+            series (dict): The class series dictionary.
+
+        Returns:
+            tuple: (first_ordinal, last_ordinal, step_days, start_minutes, end_minutes,
+                    occupancy mask, frozenset of cancelled ordinals).
+
+        Raises:
+            ValueError, TypeError: If a date, a time or the interval is malformed.
+        """
+        first, start, end = parse_class_times(
+            series.get("start_date"), series.get("start_time"), series.get("end_time"))
+        last = parse_date_ordinal(series.get("end_date"))
+        step = 7 * int(series.get("interval_weeks") or 1)
+        if step <= 0:
+            raise ValueError(f"Invalid interval_weeks: {series.get('interval_weeks')!r}")
+        cancelled = set()
+        for date_str in series.get("exceptions") or ():
+            try:
+                cancelled.add(parse_date_ordinal(date_str))
+            except (ValueError, TypeError):
+                continue
+        return (first, last, step, start, end, occupancy_mask(start, end), frozenset(cancelled))
+
+    def _index_class_series(self, series):
+        """
+        Compiles a class series and adds its rule to the per-(teacher, weekday) and
+        per-(classroom, weekday) series indexes. Malformed series are left out.
+
+        Args:
+            series (dict): The class series dictionary.
+        """
+        try:
+            rule = self._compile_series_rule(series)
+        except (ValueError, TypeError):
+            return
+        series_id = str(series.get("id"))
+        self._series_rules[series_id] = rule
+        weekday = (rule[0] - 1) % 7  # Mismo criterio que date.weekday()
+        for index, resource_id in ((self._teacher_series_index, series.get("teacher_id")),
+                                   (self._classroom_series_index, series.get("classroom_id"))):
+            index.setdefault((str(resource_id), weekday), {})[series_id] = rule
+
+    def _unindex_class_series(self, series):
+        """
+        Removes a class series from the series indexes.
+
+        Args:
+            series (dict): The class series dictionary, as it was when indexed.
+        """
+        series_id = str(series.get("id"))
+        rule = self._series_rules.pop(series_id, None)
+        if rule is None:
+            return
+        weekday = (rule[0] - 1) % 7
+        for index, resource_id in ((self._teacher_series_index, series.get("teacher_id")),
+                                   (self._classroom_series_index, series.get("classroom_id"))):
+            key = (str(resource_id), weekday)
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(series_id, None)
+                if not bucket:
+                    del index[key]
+
+    @staticmethod
+    def _series_occurs(rule, ordinal):
+        """Whether a compiled series rule has a (not cancelled) occurrence on the given date ordinal."""
+        first, last, step = rule[0], rule[1], rule[2]
+        return first <= ordinal <= last and (ordinal - first) % step == 0 and ordinal not in rule[6]
+
+    @staticmethod
+    def _series_ordinals(rule, first_ordinal, last_ordinal):
+        """Yields the date ordinals of a series' occurrences within [first_ordinal, last_ordinal]."""
+        first, last, step = rule[0], rule[1], rule[2]
+        low = max(first_ordinal, first)
+        high = min(last_ordinal, last)
+        ordinal = first + -(-(low - first) // step) * step  # Primera ocurrencia >= low
+        while ordinal <= high:
+            if ordinal not in rule[6]:
+                yield ordinal
+            ordinal += step
+
+    @staticmethod
+    def _occurrence_key(class_id):
+        """Splits an occurrence ID into (series_id, date_ordinal); None if it is not one."""
+        series_id, separator, date_str = str(class_id).rpartition(OCCURRENCE_ID_SEPARATOR)
+        if not separator:
+            return None
         try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(data if data is not None else self.scheduled_classes_data,
-                          f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error saving scheduled class data to {self.filepath}: {e}")
+            return series_id, parse_date_ordinal(date_str)
+        except (ValueError, TypeError):
+            return None
+
+    def _live_occurrence(self, class_id):
+        """
+        Resolves an occurrence ID to (series_dict, rule, date_ordinal), or None if the
+        series does not exist or has no (not cancelled) occurrence on that date.
+        """
+        key = self._occurrence_key(class_id)
+        if key is None:
+            return None
+        rule = self._series_rules.get(key[0])
+        if rule is None or not self._series_occurs(rule, key[1]):
+            return None
+        return self._series_by_id[key[0]], rule, key[1]
+
+    @staticmethod
+    def _occurrence_dict(series, ordinal):
+        """Materializes one occurrence of a series as a scheduled class dictionary."""
+        date_str = date.fromordinal(ordinal).isoformat()
+        return {
+            "id": class_occurrence_id(series.get("id"), date_str),
+            "date": date_str,
+            "start_time": series.get("start_time"),
+            "end_time": series.get("end_time"),
+            "subject_id": series.get("subject_id"),
+            "teacher_id": series.get("teacher_id"),
+            "classroom_id": series.get("classroom_id"),
+            "series_id": series.get("id")
+        }
+
+    def _series_rules_on(self, series_index, resource_id, ordinal, excluding_class_id=None):
+        """Rules of the series that occupy a resource on a date, optionally leaving one occurrence out."""
+        bucket = series_index.get((str(resource_id), (ordinal - 1) % 7))
+        if not bucket:
+            return []
+        excluded = self._occurrence_key(excluding_class_id) if excluding_class_id is not None else None
+        return [rule for series_id, rule in bucket.items()
+                if self._series_occurs(rule, ordinal) and (series_id, ordinal) != excluded]
+
+    def get_scheduled_class_times(self, class_id):
+        """
+        Returns the pre-parsed numeric form of a scheduled class or of a series occurrence.
+
+        Args:
+            class_id (str): The ID of the scheduled class or occurrence.
+
+        Returns:
+            tuple: (date_ordinal, start_minutes, end_minutes), or None if the class
+                   does not exist or its date/times are malformed.
+        """
+        times = self._class_times.get(str(class_id))
+        if times is None:
+            occurrence = self._live_occurrence(class_id)
+            if occurrence is not None:
+                _, rule, ordinal = occurrence
+                times = (ordinal, rule[3], rule[4])
+        return times
+
+    @staticmethod
+    def _bucket_mask(bucket, excluding_class_id=None):
+        """ORs the occupancy masks of an interval index bucket, optionally leaving one class out."""
+        mask = 0
+        for class_id, (start, end) in bucket.items():
+            if class_id != excluding_class_id:
+                mask |= occupancy_mask(start, end)
+        return mask
+
+    def _day_occupancy(self, day_index, occupancy, series_index, resource_id, ordinal, excluding_class_id=None):
+        """
+        Occupancy mask of (resource, ordinal), series occurrences included; recomputed from
+        the bucket only when a class must be left out.
+        """
+        key = (str(resource_id), ordinal)
+        mask = occupancy.get(key, 0)
+        if excluding_class_id is not None:
+            bucket = day_index.get(key, {})
+            if str(excluding_class_id) in bucket:
+                mask = self._bucket_mask(bucket, str(excluding_class_id))
+        for rule in self._series_rules_on(series_index, resource_id, ordinal, excluding_class_id):
+            mask |= rule[5]
+        return mask
+
+    def get_teacher_day_occupancy(self, teacher_id, date_str, excluding_class_id=None):
+        """
+        Returns a teacher's occupancy on a date as a bitmask (see occupancy_mask).
+
+        Args:
+            teacher_id (str): The teacher's ID.
+            date_str (str): Date in YYYY-MM-DD format.
+            excluding_class_id (str, optional): Class ID left out (the class being edited).
+
+        Returns:
+            int: The bitmask; 0 if the teacher has no classes or the date is malformed.
+        """
+        try:
+            ordinal = parse_date_ordinal(date_str)
+        except (ValueError, TypeError):
+            return 0
+        return self._day_occupancy(self._teacher_day_index, self._teacher_day_occupancy,
+                                   self._teacher_series_index, teacher_id, ordinal, excluding_class_id)
+
+    def get_classroom_day_occupancy(self, classroom_id, date_str, excluding_class_id=None):
+        """
+        Returns a classroom's occupancy on a date as a bitmask (see occupancy_mask).
+
+        Args:
+            classroom_id (str): The composite classroom ID ("number-block").
+            date_str (str): Date in YYYY-MM-DD format.
+            excluding_class_id (str, optional): Class ID left out (the class being edited).
+
+        Returns:
+            int: The bitmask; 0 if the classroom has no classes or the date is malformed.
+        """
+        try:
+            ordinal = parse_date_ordinal(date_str)
+        except (ValueError, TypeError):
+            return 0
+        return self._day_occupancy(self._classroom_day_index, self._classroom_day_occupancy,
+                                   self._classroom_series_index, classroom_id, ordinal, excluding_class_id)
+
+    def get_teacher_week_occupancy(self, teacher_id, week_start_str):
+        """
+        Returns a teacher's occupancy for seven consecutive days, e.g. to draw a weekly grid.
+
+        Args:
+            teacher_id (str): The teacher's ID.
+            week_start_str (str): First date in YYYY-MM-DD format.
+
+        Returns:
+            list: Seven bitmasks, one per day; empty if the date is malformed.
+        """
+        return self._week_occupancy(self._teacher_day_index, self._teacher_day_occupancy,
+                                    self._teacher_series_index, teacher_id, week_start_str)
+
+    def get_classroom_week_occupancy(self, classroom_id, week_start_str):
+        """
+        Returns a classroom's occupancy for seven consecutive days, e.g. to draw a weekly grid.
+
+        Args:
+            classroom_id (str): The composite classroom ID ("number-block").
+            week_start_str (str): First date in YYYY-MM-DD format.
+
+        Returns:
+            list: Seven bitmasks, one per day; empty if the date is malformed.
+        """
+        return self._week_occupancy(self._classroom_day_index, self._classroom_day_occupancy,
+                                    self._classroom_series_index, classroom_id, week_start_str)
+
+    def _week_occupancy(self, day_index, occupancy, series_index, resource_id, week_start_str):
+        """Occupancy masks of a resource for the seven days starting at week_start_str."""
+        try:
+            first = parse_date_ordinal(week_start_str)
+        except (ValueError, TypeError):
+            return []
+        return [self._day_occupancy(day_index, occupancy, series_index, resource_id, first + offset)
+                for offset in range(7)]
+
+    def _time_sort_key(self, class_id):
+        """Sort key by (date, start time); malformed classes go last."""
+        times = self.get_scheduled_class_times(class_id)
+        return (0, times[0], times[1]) if times else (1, 0, 0)
 
     def get_all_scheduled_classes(self):
         """
@@ -89,6 +626,45 @@ class ScheduledClassRepository:
             ] for sc in self.scheduled_classes_data
         ]
 
+    def get_scheduled_classes_sorted(self, date_str=None):
+        """
+        Retrieves scheduled classes ordered by date and start time, optionally
+        limited to one date. Uses the pre-parsed numeric form, so no dates or
+        times are re-parsed. Class series are expanded into their occurrences
+        (only those of date_str when it is given). Only loaded partitions are listed
+        (see load_date_range).
+
+        Args:
+            date_str (str, optional): Date in YYYY-MM-DD format to filter by.
+
+        Returns:
+            list: Lists in the same format as get_all_scheduled_classes().
+                  Classes with malformed date/times are placed last.
+
+        Raises:
+            ValueError: If date_str is given but is not a valid date.
+        """
+        classes = self.scheduled_classes_data
+        if date_str:
+            ordinal = parse_date_ordinal(date_str)
+            classes = [
+                sc for sc in classes
+                if self._time_sort_key(sc.get("id"))[:2] == (0, ordinal)
+            ]
+        classes = classes + list(self.expand_class_series(date_str, date_str))
+        classes = sorted(classes, key=lambda sc: self._time_sort_key(sc.get("id")))
+        return [
+            [
+                sc.get("id"),
+                sc.get("date"),
+                sc.get("start_time"),
+                sc.get("end_time"),
+                sc.get("subject_id"),
+                sc.get("teacher_id"),
+                sc.get("classroom_id")
+            ] for sc in classes
+        ]
+
     def get_scheduled_class_by_id(self, class_id):
         """
         Finds a scheduled class by its ID.
@@ -98,20 +674,23 @@ class ScheduledClassRepository:
 
         Returns:
             list: A list of the class's attributes if found, otherwise None.
+                  Series occurrence IDs (see class_occurrence_id) are resolved too.
         """
-        class_id_str = str(class_id)
-        for sc in self.scheduled_classes_data:
-            if str(sc.get("id")) == class_id_str:
-                return [
-                    sc.get("id"),
-                    sc.get("date"),
-                    sc.get("start_time"),
-                    sc.get("end_time"),
-                    sc.get("subject_id"),
-                    sc.get("teacher_id"),
-                    sc.get("classroom_id")
-                ]
-        return None
+        sc = self._classes_by_id.get(str(class_id))
+        if sc is None:
+            occurrence = self._live_occurrence(class_id)
+            if occurrence is None:
+                return None
+            sc = self._occurrence_dict(occurrence[0], occurrence[2])
+        return [
+            sc.get("id"),
+            sc.get("date"),
+            sc.get("start_time"),
+            sc.get("end_time"),
+            sc.get("subject_id"),
+            sc.get("teacher_id"),
+            sc.get("classroom_id")
+        ]
 
     def scheduled_class_id_exists(self, class_id):
         """
@@ -122,10 +701,9 @@ class ScheduledClassRepository:
             class_id (str): The class ID to check.
 
         Returns:
-            bool: True if the class ID exists, False otherwise.
+            bool: True if the class ID (or series occurrence ID) exists, False otherwise.
         """
-        class_id_str = str(class_id)
-        return any(str(sc.get("id")) == class_id_str for sc in self.scheduled_classes_data)
+        return str(class_id) in self._classes_by_id or self._live_occurrence(class_id) is not None
 
     def add_scheduled_class(self, class_details):
         """
@@ -140,6 +718,8 @@ class ScheduledClassRepository:
             bool: True if added successfully, False if a class with the same ID already exists
                   (should be rare with UUIDs).
         """
+        # El mes de la clase se carga antes: su archivo se reescribe completo al guardar
+        self._ensure_date_str_loaded(str(class_details[1]))
         class_id = str(class_details[0])
         if self.scheduled_class_id_exists(class_id):
             print(f"Error: Scheduled class with ID '{
@@ -155,13 +735,23 @@ class ScheduledClassRepository:
             "teacher_id": str(class_details[5]) if class_details[5] else None,
             "classroom_id": str(class_details[6]) if class_details[6] else None
         }
-        self.scheduled_classes_data.append(new_scheduled_class)
-        self._save_data()
+        try:
+            with self.batch():
+                self.scheduled_classes_data.append(new_scheduled_class)
+                self._classes_by_id[class_id] = new_scheduled_class
+                self._index_scheduled_class(new_scheduled_class)
+                self.storage.upsert(new_scheduled_class, self.scheduled_classes_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save scheduled class '{class_id}': {e}")
+            return False
         return True
 
     def update_scheduled_class(self, original_class_id, updated_details):
         """
         Updates an existing scheduled class. The class ID cannot be changed.
+        Updating a series occurrence cancels it in its series and stores the updated
+        class as a standalone class with the same ID.
 
         Args:
             original_class_id (str): The original ID of the class to update.
@@ -179,24 +769,54 @@ class ScheduledClassRepository:
                   original_id_str}, Attempted: {new_id_str}")
             return False  # ID should not be changed
 
-        for i, sc in enumerate(self.scheduled_classes_data):
-            if str(sc.get("id")) == original_id_str:
-                self.scheduled_classes_data[i] = {
-                    "id": new_id_str,
-                    "date": str(updated_details[1]),
-                    "start_time": str(updated_details[2]),
-                    "end_time": str(updated_details[3]),
-                    "subject_id": str(updated_details[4]) if updated_details[4] else None,
-                    "teacher_id": str(updated_details[5]) if updated_details[5] else None,
-                    "classroom_id": str(updated_details[6]) if updated_details[6] else None
-                }
-                self._save_data()
-                return True
-        return False  # Scheduled class with original_class_id not found
+        sc = self._classes_by_id.get(original_id_str)
+        if sc is None:
+            occurrence = self._live_occurrence(original_id_str)
+            if occurrence is None:
+                return False  # Scheduled class with original_class_id not found
+            series, _, ordinal = occurrence
+            try:
+                with self.batch():
+                    self.cancel_class_series_occurrence(series.get("id"), date.fromordinal(ordinal).isoformat())
+                    if not self.add_scheduled_class(updated_details):
+                        # Deshace la cancelación: la ocurrencia sigue en su serie
+                        raise _ChangeRejected()
+            except _ChangeRejected:
+                return False
+            except StorageError as e:
+                print(f"Error: Could not save scheduled class '{new_id_str}': {e}")
+                return False
+            return True
+
+        self._ensure_date_str_loaded(str(updated_details[1]))
+        updated_class = {
+            "id": new_id_str,
+            "date": str(updated_details[1]),
+            "start_time": str(updated_details[2]),
+            "end_time": str(updated_details[3]),
+            "subject_id": str(updated_details[4]) if updated_details[4] else None,
+            "teacher_id": str(updated_details[5]) if updated_details[5] else None,
+            "classroom_id": str(updated_details[6]) if updated_details[6] else None
+        }
+        try:
+            with self.batch():
+                self._unindex_scheduled_class(sc)
+                # Se actualiza el diccionario en su lugar: conserva su posición en la lista
+                remember_for_rollback(self, sc)
+                sc.clear()
+                sc.update(updated_class)
+                self._index_scheduled_class(sc)
+                self.storage.upsert(sc, self.scheduled_classes_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save scheduled class '{new_id_str}': {e}")
+            return False
+        return True
 
     def delete_scheduled_class(self, class_id):
         """
-        Deletes a scheduled class by its ID.
+        Deletes a scheduled class by its ID. For a series occurrence ID, only that
+        occurrence is cancelled (see cancel_class_series_occurrence).
 
         Args:
             class_id (str): The ID of the class to delete.
@@ -204,103 +824,422 @@ class ScheduledClassRepository:
         Returns:
             bool: True if deleted successfully, False otherwise.
         """
-        class_id_str = str(class_id)
-        original_len = len(self.scheduled_classes_data)
-        self.scheduled_classes_data = [
-            sc for sc in self.scheduled_classes_data if str(sc.get("id")) != class_id_str]
+        sc = self._classes_by_id.pop(str(class_id), None)
+        if sc is None:
+            occurrence = self._live_occurrence(class_id)
+            if occurrence is None:
+                return False
+            return self.cancel_class_series_occurrence(
+                occurrence[0].get("id"), date.fromordinal(occurrence[2]).isoformat())
 
-        if len(self.scheduled_classes_data) < original_len:
-            self._save_data()
-            return True
-        return False
+        try:
+            with self.batch():
+                self._unindex_scheduled_class(sc)
+                self.scheduled_classes_data = [
+                    c for c in self.scheduled_classes_data if c is not sc]
+                self.storage.delete(sc, self.scheduled_classes_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not delete scheduled class '{class_id}': {e}")
+            return False
+        return True
+
+    # --- Series de clases (regla semanal + fechas canceladas) ---
+
+    def _expand_series(self, series, first_ordinal, last_ordinal):
+        """Yields the occurrence dictionaries of one series within [first_ordinal, last_ordinal]."""
+        rule = self._series_rules.get(str(series.get("id")))
+        if rule is None:
+            return  # Serie mal formada
+        for ordinal in self._series_ordinals(rule, first_ordinal, last_ordinal):
+            yield self._occurrence_dict(series, ordinal)
+
+    @staticmethod
+    def _window_ordinals(start_date_str, end_date_str):
+        """Converts an optional date window to (first_ordinal, last_ordinal); missing ends are open."""
+        first = parse_date_ordinal(start_date_str) if start_date_str else 1
+        last = parse_date_ordinal(end_date_str) if end_date_str else date.max.toordinal()
+        return first, last
+
+    def expand_class_series(self, start_date_str=None, end_date_str=None):
+        """
+        Lazily expands the class series into their occurrences within a date window.
+        Nothing is materialized beyond the occurrences that are consumed.
+
+        Args:
+            start_date_str (str, optional): First date (YYYY-MM-DD) of the window; open if None.
+            end_date_str (str, optional): Last date (YYYY-MM-DD, included); open if None.
+
+        Yields:
+            dict: One scheduled class dictionary per occurrence, with its occurrence "id"
+                  (see class_occurrence_id) and the "series_id" it belongs to.
+
+        Raises:
+            ValueError: If a window date is given but is not a valid date.
+        """
+        first, last = self._window_ordinals(start_date_str, end_date_str)
+        for series in self.class_series_data:
+            yield from self._expand_series(series, first, last)
+
+    def iter_scheduled_classes(self, start_date_str=None, end_date_str=None):
+        """
+        Iterates over copies of the standalone scheduled classes and the series occurrences,
+        e.g. to export or audit them. With a window, standalone classes with malformed
+        dates are left out. Only loaded partitions are read: call load_date_range() first
+        for a window outside the active period.
+
+        Args:
+            start_date_str (str, optional): First date (YYYY-MM-DD) of the window; open if None.
+            end_date_str (str, optional): Last date (YYYY-MM-DD, included); open if None.
+
+        Yields:
+            dict: Scheduled class dictionaries (standalone classes first).
+
+        Raises:
+            ValueError: If a window date is given but is not a valid date.
+        """
+        first, last = self._window_ordinals(start_date_str, end_date_str)
+        windowed = bool(start_date_str or end_date_str)
+        for sc in self.scheduled_classes_data:
+            if windowed:
+                times = self._class_times.get(str(sc.get("id")))
+                if times is None or not first <= times[0] <= last:
+                    continue
+            yield dict(sc)
+        yield from self.expand_class_series(start_date_str, end_date_str)
+
+    def get_all_class_series(self):
+        """
+        Retrieves all class series.
+
+        Returns:
+            list: A list of lists [id, start_date, end_date, start_time, end_time, subject_id,
+                  teacher_id, classroom_id, interval_weeks, exceptions].
+        """
+        return [self._series_row(series) for series in self.class_series_data]
+
+    def get_class_series_by_id(self, series_id):
+        """
+        Finds a class series by its ID.
+
+        Args:
+            series_id (str): The ID of the series.
+
+        Returns:
+            list: The series' attributes (see get_all_class_series) if found, otherwise None.
+        """
+        series = self._series_by_id.get(str(series_id))
+        return self._series_row(series) if series is not None else None
+
+    @staticmethod
+    def _series_row(series):
+        return [
+            series.get("id"),
+            series.get("start_date"),
+            series.get("end_date"),
+            series.get("start_time"),
+            series.get("end_time"),
+            series.get("subject_id"),
+            series.get("teacher_id"),
+            series.get("classroom_id"),
+            series.get("interval_weeks", 1),
+            list(series.get("exceptions") or [])
+        ]
+
+    def _build_class_series(self, series_details, interval_weeks, exceptions):
+        """
+        Builds and validates a class series dictionary.
+
+        Returns:
+            dict: The series, or None (after printing the reason) if it is not valid.
+        """
+        series = {
+            "id": str(series_details[0]),
+            "start_date": str(series_details[1]),  # YYYY-MM-DD; fija el día de la semana
+            "end_date": str(series_details[2]),  # YYYY-MM-DD (incluida)
+            "start_time": str(series_details[3]),  # HH:MM
+            "end_time": str(series_details[4]),  # HH:MM
+            "subject_id": str(series_details[5]) if series_details[5] else None,
+            "teacher_id": str(series_details[6]) if series_details[6] else None,
+            "classroom_id": str(series_details[7]) if series_details[7] else None,
+            "interval_weeks": interval_weeks,
+            "exceptions": sorted(set(exceptions or []))
+        }
+        try:
+            rule = self._compile_series_rule(series)
+        except (ValueError, TypeError) as e:
+            print(f"Error: Invalid class series '{series['id']}': {e}")
+            return None
+        if rule[1] < rule[0] or rule[4] <= rule[3]:
+            print(f"Error: Class series '{series['id']}' has an empty date or time range.")
+            return None
+        series["interval_weeks"] = rule[2] // 7
+        return series
+
+    def add_class_series(self, series_details, interval_weeks=1, exceptions=None):
+        """
+        Adds a new class series: a class on the weekday of start_date, every interval_weeks
+        weeks, until end_date. Conflicts are not checked here (see find_class_series_conflicts).
+
+        Args:
+            series_details (list): Series details in the format:
+                                   [id, start_date_str, end_date_str, start_time_str,
+                                    end_time_str, subject_id, teacher_id, classroom_id].
+            interval_weeks (int): Weeks between occurrences.
+            exceptions (list, optional): Dates (YYYY-MM-DD) without class.
+
+        Returns:
+            bool: True if added successfully, False if the ID already exists or the
+                  series is not valid.
+        """
+        series_id = str(series_details[0])
+        if series_id in self._series_by_id or OCCURRENCE_ID_SEPARATOR in series_id:
+            print(f"Error: Class series ID '{series_id}' already exists or is not valid. Cannot add.")
+            return False
+        series = self._build_class_series(series_details, interval_weeks, exceptions)
+        if series is None:
+            return False
+        try:
+            with self.batch():
+                self.class_series_data.append(series)
+                self._series_by_id[series_id] = series
+                self._index_class_series(series)
+                self.series_storage.upsert(series, self.class_series_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save class series '{series_id}': {e}")
+            return False
+        return True
+
+    def update_class_series(self, series_id, series_details, interval_weeks=None):
+        """
+        Updates an existing class series, keeping its cancelled dates. The ID cannot be changed.
+
+        Args:
+            series_id (str): The ID of the series to update.
+            series_details (list): Updated details, in the format of add_class_series().
+            interval_weeks (int, optional): Weeks between occurrences; unchanged if None.
+
+        Returns:
+            bool: True if updated successfully, False if not found or not valid.
+        """
+        series = self._series_by_id.get(str(series_id))
+        if series is None or str(series_details[0]) != str(series_id):
+            return False
+        updated_series = self._build_class_series(
+            series_details,
+            series.get("interval_weeks", 1) if interval_weeks is None else interval_weeks,
+            series.get("exceptions"))
+        if updated_series is None:
+            return False
+        try:
+            with self.batch():
+                self._unindex_class_series(series)
+                remember_for_rollback(self, series)
+                series.clear()
+                series.update(updated_series)
+                self._index_class_series(series)
+                self.series_storage.upsert(series, self.class_series_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save class series '{series_id}': {e}")
+            return False
+        return True
+
+    def delete_class_series(self, series_id):
+        """
+        Deletes a class series and all its occurrences. Occurrences that were edited
+        (now standalone classes) are kept.
+
+        Args:
+            series_id (str): The ID of the series to delete.
+
+        Returns:
+            bool: True if deleted successfully, False otherwise.
+        """
+        series = self._series_by_id.pop(str(series_id), None)
+        if series is None:
+            return False
+        try:
+            with self.batch():
+                self._unindex_class_series(series)
+                self.class_series_data = [s for s in self.class_series_data if s is not series]
+                self.series_storage.delete(series, self.class_series_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not delete class series '{series_id}': {e}")
+            return False
+        return True
+
+    def cancel_class_series_occurrence(self, series_id, date_str):
+        """
+        Cancels one occurrence of a class series by adding its date to the exceptions.
+
+        Args:
+            series_id (str): The ID of the series.
+            date_str (str): Date of the occurrence in YYYY-MM-DD format.
+
+        Returns:
+            bool: True if cancelled, False if the series has no occurrence on that date.
+        """
+        series = self._series_by_id.get(str(series_id))
+        if series is None or self._live_occurrence(class_occurrence_id(series_id, date_str)) is None:
+            return False
+        try:
+            with self.batch():
+                self._unindex_class_series(series)
+                remember_for_rollback(self, series)
+                series["exceptions"] = sorted(set(series.get("exceptions") or []) | {date_str})
+                self._index_class_series(series)
+                self.series_storage.upsert(series, self.class_series_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not cancel class series '{series_id}' on {date_str}: {e}")
+            return False
+        return True
+
+    def find_class_series_conflicts(self, teacher_id, classroom_id, start_date_str, end_date_str,
+                                    start_time_str, end_time_str, interval_weeks=1, excluding_series_id=None):
+        """
+        Checks every date a prospective series would occupy against the standalone classes
+        and the other series of its teacher and classroom.
+
+        Args:
+            teacher_id (str): The teacher's ID.
+            classroom_id (str): The composite classroom ID ("number-block").
+            start_date_str (str): First date (YYYY-MM-DD); fixes the weekday.
+            end_date_str (str): Last date (YYYY-MM-DD, included).
+            start_time_str (str): Start time in HH:MM format.
+            end_time_str (str): End time in HH:MM format.
+            interval_weeks (int): Weeks between occurrences.
+            excluding_series_id (str, optional): Series to ignore (the series being updated).
+
+        Returns:
+            list: Dates (YYYY-MM-DD) with a teacher or classroom conflict. Only loaded
+                  partitions are checked (see load_date_range).
+
+        Raises:
+            ValueError: If a date or time is malformed.
+        """
+        first, start, end = parse_class_times(start_date_str, start_time_str, end_time_str)
+        rule = (first, parse_date_ordinal(end_date_str), 7 * int(interval_weeks), start, end,
+                occupancy_mask(start, end), frozenset())
+        if rule[2] <= 0:
+            raise ValueError(f"Invalid interval_weeks: {interval_weeks!r}")
+        conflicts = []
+        for ordinal in self._series_ordinals(rule, first, rule[1]):
+            date_str = date.fromordinal(ordinal).isoformat()
+            excluding_class_id = (class_occurrence_id(excluding_series_id, date_str)
+                                  if excluding_series_id else None)
+            if self.check_teacher_availability_conflict(
+                    teacher_id, date_str, start_time_str, end_time_str, excluding_class_id) or \
+               self.check_classroom_availability_conflict(
+                    classroom_id, date_str, start_time_str, end_time_str, excluding_class_id):
+                conflicts.append(date_str)
+        return conflicts
 
     # --- Métodos de validación de negocio (Opcional - podrían estar en la UI o una capa de servicio) ---
     # Estos métodos requerirían acceso a otros repositorios o listas de datos
     # para verificar conflictos. Por ahora, se asume que esta lógica está en ClasesFrame.
     
-    def get_scheduled_classes_by_teacher_id(self, teacher_id):
+    def get_scheduled_classes_by_teacher_id(self, teacher_id, start_date_str=None, end_date_str=None):
         """
-        Retrieves all scheduled classes for a specific teacher.
+        Retrieves the scheduled classes of a specific teacher, optionally within a date window.
+        Only loaded partitions are read (the active period, see ACTIVE_HISTORY_MONTHS): call
+        load_date_range() first to include older months.
 
         Args:
             teacher_id (str): The ID of the teacher.
+            start_date_str (str, optional): First date (YYYY-MM-DD) of the window; open if None.
+            end_date_str (str, optional): Last date (YYYY-MM-DD, included); open if None.
 
         Returns:
             list: A list of dictionaries, where each dictionary represents a scheduled class
-                  for that teacher. Returns an empty list if no classes are found or
-                  teacher_id is None.
+                  (or series occurrence) for that teacher, ordered by date and start time.
+                  Returns an empty list if no classes are found or teacher_id is None.
+
+        Raises:
+            ValueError: If a window date is given but is not a valid date.
         """
         if not teacher_id:
             return []
         
+        first, last = self._window_ordinals(start_date_str, end_date_str)
+        windowed = bool(start_date_str or end_date_str)
         teacher_id_str = str(teacher_id)
         teacher_classes = []
         for sc_dict in self.scheduled_classes_data: # Iterar sobre la lista de diccionarios directamente
             if str(sc_dict.get("teacher_id")) == teacher_id_str:
+                if windowed:
+                    times = self._class_times.get(str(sc_dict.get("id")))
+                    if times is None or not first <= times[0] <= last:
+                        continue
                 teacher_classes.append(sc_dict.copy()) # Añadir una copia del diccionario
+        for series in self.class_series_data:
+            if str(series.get("teacher_id")) == teacher_id_str:
+                teacher_classes.extend(self._expand_series(series, first, last))
+        teacher_classes.sort(key=lambda sc: self._time_sort_key(sc.get("id")))
         return teacher_classes
 
-    def check_teacher_availability_conflict(self, teacher_id, date_str, start_time_str, end_time_str, excluding_class_id=None):
+    def _check_interval_conflict(self, day_index, occupancy, series_index, resource_id, date_str, start_time_str, end_time_str, excluding_class_id=None):
         """
-        Checks if a teacher has a scheduling conflict for the given date/time.
-        (Esta es una versión simplificada; la lógica real de disponibilidad del profesor es más compleja
-         y se maneja en la UI de Profesores actualmente).
-        Aquí, solo verificamos si ya tiene otra CLASE programada.
+        Checks a resource for an overlap with the given date/time. The occupancy mask rules
+        out most cases with a single AND; only when the masks intersect is the interval index
+        bucket examined, which handles the excluded class and times that are not multiples
+        of OCCUPANCY_SLOT_MINUTES exactly. Class series are tested through their rule, without
+        expanding them: only the series indexed under the date's weekday are examined.
+
+        Args:
+            day_index (dict): self._teacher_day_index or self._classroom_day_index.
+            occupancy (dict): The matching self._teacher_day_occupancy or self._classroom_day_occupancy.
+            series_index (dict): The matching self._teacher_series_index or self._classroom_series_index.
+            resource_id (str): The teacher or classroom ID.
+            date_str (str): Date in YYYY-MM-DD format.
+            start_time_str (str): Start time in HH:MM format.
+            end_time_str (str): End time in HH:MM format.
+            excluding_class_id (str, optional): Class ID to ignore (the class being updated).
+
+        Returns:
+            bool: True if there is a conflict (or the input is malformed), False otherwise.
         """
         try:
-            new_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            new_start = datetime.strptime(start_time_str, "%H:%M").time()
-            new_end = datetime.strptime(end_time_str, "%H:%M").time()
+            new_date, new_start, new_end = parse_class_times(
+                date_str, start_time_str, end_time_str)
         except ValueError:
             return True  # Formato inválido, considera un conflicto
 
-        for sc in self.scheduled_classes_data:
-            if excluding_class_id and str(sc.get("id")) == str(excluding_class_id):
-                continue  # No comparar una clase consigo misma durante una actualización
-
-            if str(sc.get("teacher_id")) == str(teacher_id):
-                try:
-                    existing_date = datetime.strptime(
-                        sc.get("date"), "%Y-%m-%d").date()
-                    existing_start = datetime.strptime(
-                        sc.get("start_time"), "%H:%M").time()
-                    existing_end = datetime.strptime(
-                        sc.get("end_time"), "%H:%M").time()
-
-                    if new_date == existing_date and \
-                       max(new_start, existing_start) < min(new_end, existing_end):  # Hay solapamiento
-                        return True  # Conflicto encontrado
-                except (ValueError, TypeError):
-                    continue  # Saltar si hay datos mal formateados en el JSON
+        key = (str(resource_id), new_date)
+        if occupancy.get(key, 0) & occupancy_mask(new_start, new_end):
+            bucket = day_index[key]
+
+            excluding_id_str = str(excluding_class_id) if excluding_class_id else None
+            for class_id, (existing_start, existing_end) in bucket.items():
+                if class_id == excluding_id_str:
+                    continue  # No comparar una clase consigo misma durante una actualización
+                if max(new_start, existing_start) < min(new_end, existing_end):  # Hay solapamiento
+                    return True  # Conflicto encontrado
+
+        for rule in self._series_rules_on(series_index, resource_id, new_date, excluding_class_id):
+            if max(new_start, rule[3]) < min(new_end, rule[4]):
+                return True  # Choca con una ocurrencia de una serie
         return False  # No hay conflicto
 
+    def check_teacher_availability_conflict(self, teacher_id, date_str, start_time_str, end_time_str, excluding_class_id=None):
+        """
+        Checks if a teacher has a scheduling conflict for the given date/time.
+        Aquí, solo verificamos si ya tiene otra CLASE programada; las franjas de disponibilidad
+        del profesor se verifican con TeacherRepository.is_available.
+        Only the classes indexed under (teacher_id, date) are examined.
+        """
+        return self._check_interval_conflict(
+            self._teacher_day_index, self._teacher_day_occupancy, self._teacher_series_index, teacher_id, date_str, start_time_str, end_time_str,
+            excluding_class_id)
+
     def check_classroom_availability_conflict(self, classroom_id, date_str, start_time_str, end_time_str, excluding_class_id=None):
         """
         Checks if a classroom has a scheduling conflict for the given date/time.
+        Only the classes indexed under (classroom_id, date) are examined.
         """
-        try:
-            new_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            new_start = datetime.strptime(start_time_str, "%H:%M").time()
-            new_end = datetime.strptime(end_time_str, "%H:%M").time()
-        except ValueError:
-            return True  # Formato inválido, considera un conflicto
-
-        for sc in self.scheduled_classes_data:
-            if excluding_class_id and str(sc.get("id")) == str(excluding_class_id):
-                continue
-
-            if str(sc.get("classroom_id")) == str(classroom_id):
-                try:
-                    existing_date = datetime.strptime(
-                        sc.get("date"), "%Y-%m-%d").date()
-                    existing_start = datetime.strptime(
-                        sc.get("start_time"), "%H:%M").time()
-                    existing_end = datetime.strptime(
-                        sc.get("end_time"), "%H:%M").time()
-
-                    if new_date == existing_date and \
-                       max(new_start, existing_start) < min(new_end, existing_end):  # Hay solapamiento
-                        return True  # Conflicto encontrado
-                except (ValueError, TypeError):
-                    continue
-        return False  # No hay conflicto
+        return self._check_interval_conflict(
+            self._classroom_day_index, self._classroom_day_occupancy, self._classroom_series_index, classroom_id, date_str, start_time_str, end_time_str,
+            excluding_class_id)
@@ -0,0 +1,72 @@
+"""
+One-shot migration of the JSON storage files to the SQLite backend.
+
+Uso (desde la raíz del proyecto):
+    python -m repositories.sqlite_migration [--storage-dir ./storage] [--db ./storage/eduscheduler.db] [--overwrite]
+
+Después de migrar, active el backend con EDUSCHEDULER_STORAGE=sqlite.
+"""
+import argparse
+import os
+
+from repositories.classroom_repository import ClassroomRepository
+from repositories.scheduled_class_repository import ScheduledClassRepository
+from repositories.storage import SQLITE_DB_PATH, JsonFileStorage, PartitionedJsonStorage, SqliteStorage
+from repositories.subject_repository import SubjectRepository
+from repositories.teacher_repository import TeacherRepository
+
+# (tabla, función de clave primaria, archivo JSON dentro de storage_dir)
+MIGRATED_REPOSITORIES = (
+    (TeacherRepository.STORAGE_NAME, TeacherRepository._storage_key, "teachers.json"),
+    (SubjectRepository.STORAGE_NAME, SubjectRepository._storage_key, "subjects.json"),
+    (ClassroomRepository.STORAGE_NAME, ClassroomRepository._storage_key, "classrooms.json"),
+    (ScheduledClassRepository.STORAGE_NAME, ScheduledClassRepository._storage_key, "scheduled_classes.json"),
+    (ScheduledClassRepository.SERIES_STORAGE_NAME, ScheduledClassRepository._storage_key,
+     ScheduledClassRepository.SERIES_FILENAME),
+)
+
+
+def migrate_json_to_sqlite(storage_dir="./storage", db_path=SQLITE_DB_PATH, overwrite=False):
+    """
+    Copies every repository's JSON file (or monthly JSON files) into its SQLite table.
+
+    Args:
+        storage_dir (str): Directory that holds the JSON files.
+        db_path (str): Path of the SQLite database to create or fill.
+        overwrite (bool): If False, tables that already have rows are left untouched.
+
+    Returns:
+        dict: {table_name: number of migrated records, or None if skipped}.
+    """
+    results = {}
+    for table, key_func, filename in MIGRATED_REPOSITORIES:
+        sqlite_storage = SqliteStorage(db_path, table, key_func)
+        try:
+            if sqlite_storage.count() and not overwrite:
+                print(f"Skipping {table}: the table already has data (use overwrite=True).")
+                results[table] = None
+                continue
+            json_path = os.path.join(storage_dir, filename)
+            json_storage = None
+            if os.path.isdir(os.path.splitext(json_path)[0]):
+                # Clases programadas guardadas por meses (ver PartitionedJsonStorage)
+                json_storage = PartitionedJsonStorage(os.path.splitext(json_path)[0], key_func, None, table)
+            if json_storage is None or not json_storage.partitions:
+                json_storage = JsonFileStorage(json_path, key_func, table)
+            records = json_storage.load()
+            sqlite_storage.save_all(records)
+            results[table] = len(records)
+        finally:
+            sqlite_storage.connection.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Migra los archivos JSON de ./storage a una base de datos SQLite.")
+    parser.add_argument("--storage-dir", default="./storage")
+    parser.add_argument("--db", default=SQLITE_DB_PATH)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+    for table_name, migrated in migrate_json_to_sqlite(args.storage_dir, args.db, args.overwrite).items():
+        print(f"{table_name}: {'omitida' if migrated is None else f'{migrated} registros'}")
@@ -0,0 +1,784 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+# Backend de almacenamiento para los repositorios: "json" (por defecto), "journal" o "sqlite".
+# Se puede cambiar sin tocar el código con la variable de entorno EDUSCHEDULER_STORAGE.
+STORAGE_BACKEND = os.environ.get("EDUSCHEDULER_STORAGE", "json")
+SQLITE_DB_PATH = os.environ.get(
+    "EDUSCHEDULER_SQLITE_PATH", "./storage/eduscheduler.db")
+# Tamaño del journal a partir del cual se reescribe el snapshot (modo "journal")
+JOURNAL_COMPACT_THRESHOLD_BYTES = 1024 * 1024
+# Conservar la versión anterior de cada archivo JSON como '<archivo>.bak'
+JSON_KEEP_BACKUP = True
+
+
+class StorageError(Exception):
+    """
+    Raised when a storage backend cannot write (or read) its records. Repositories turn it
+    into a False result after restoring their in-memory data (see repository_batch).
+    """
+
+
+def _fsync_directory(directory):
+    """Flushes a directory entry after a rename (best effort; not available on Windows)."""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except (OSError, AttributeError):
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class JsonFileStorage:
+    """
+    Stores a repository's records as a JSON list in a single file.
+    Every mutation rewrites the whole file. Writes are atomic: the data goes to a
+    temporary file that is fsynced and then renamed over the target, keeping the
+    previous version as '<filepath>.bak'. Loading falls back to that backup when
+    the file is missing, empty or unreadable.
+    """
+
+    def __init__(self, filepath, key_func, name="data", keep_backup=JSON_KEEP_BACKUP):
+        """
+        Initializes the storage.
+
+        Args:
+            filepath (str): The path to the JSON file.
+            key_func (callable): Returns the primary key (str) of a record.
+            name (str): Name of the stored collection, used in error messages.
+            keep_backup (bool): Keep the previous version of the file as '<filepath>.bak'.
+        """
+        self.filepath = filepath
+        self.key_func = key_func
+        self.name = name
+        self.keep_backup = keep_backup
+        self.backup_path = filepath + ".bak"
+        # Lote en curso (ver repository_batch): las escrituras se difieren hasta commit_batch
+        self.in_batch = False
+        self._batch_dirty = False
+        # Ensure the storage directory exists
+        os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+
+    def _read_json(self, path):
+        """
+        Reads a JSON list from path.
+
+        Returns:
+            list: The records, or None if the file is missing, empty or unreadable.
+        """
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading {self.name} data from {path}: {e}")
+            return None
+
+    def load(self):
+        """
+        Loads the records from the JSON file, or from its backup if the file
+        is missing, empty or corrupt (e.g. after an interrupted write).
+
+        Returns:
+            list: A list of record dictionaries (empty if nothing can be read).
+        """
+        records = self._read_json(self.filepath)
+        if records is not None:
+            return records
+        backup_records = self._read_json(self.backup_path)
+        if backup_records is not None:
+            print(f"Warning: {self.filepath} could not be read; "
+                  f"loaded {self.name} data from backup {self.backup_path}")
+            return backup_records
+        return []
+
+    def save_all(self, records):
+        """
+        Atomically writes the full list of records to the JSON file.
+
+        Args:
+            records (list): The records to save.
+
+        Raises:
+            StorageError: If the file cannot be written; the previous version is kept.
+        """
+        directory = os.path.dirname(self.filepath) or "."
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=os.path.basename(self.filepath) + ".", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.keep_backup and os.path.exists(self.filepath):
+                os.replace(self.filepath, self.backup_path)
+            os.replace(tmp_path, self.filepath)
+            tmp_path = None
+            _fsync_directory(directory)
+        except OSError as e:
+            raise StorageError(f"Error saving {self.name} data to {self.filepath}: {e}") from e
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def upsert(self, record, records, previous_key=None):
+        """
+        Persists an added or updated record.
+
+        Args:
+            record (dict): The record that was added or updated.
+            records (list): The repository's full in-memory list.
+            previous_key (str, optional): The record's key before the update, if it changed.
+        """
+        if self.in_batch:
+            self._batch_dirty = True
+            return
+        self.save_all(records)
+
+    def delete(self, record, records):
+        """
+        Persists the removal of a record.
+
+        Args:
+            record (dict): The record that was removed.
+            records (list): The repository's full in-memory list (already without the record).
+        """
+        if self.in_batch:
+            self._batch_dirty = True
+            return
+        self.save_all(records)
+
+    def begin_batch(self):
+        """Starts deferring writes until commit_batch() or rollback_batch()."""
+        self.in_batch = True
+        self._batch_dirty = False
+
+    def commit_batch(self, records):
+        """
+        Ends the batch, writing the file once if anything changed.
+
+        Args:
+            records (list): The repository's full in-memory list.
+        """
+        self.in_batch = False
+        if self._batch_dirty:
+            self._batch_dirty = False
+            self.save_all(records)
+
+    def rollback_batch(self):
+        """Ends the batch discarding the deferred writes."""
+        self.in_batch = False
+        self._batch_dirty = False
+
+
+class JournaledJsonStorage(JsonFileStorage):
+    """
+    JSON snapshot plus an append-only journal (one JSON line per mutation).
+    Each add/update/delete appends a single line to '<filepath>.journal', so the
+    write cost is proportional to the record, not to the dataset. On load the
+    journal is replayed over the snapshot; once the journal grows past
+    compact_threshold bytes the snapshot is rewritten and the journal emptied.
+    """
+
+    def __init__(self, filepath, key_func, name="data",
+                 compact_threshold=JOURNAL_COMPACT_THRESHOLD_BYTES):
+        """
+        Initializes the storage.
+
+        Args:
+            filepath (str): The path to the JSON snapshot file.
+            key_func (callable): Returns the primary key (str) of a record.
+            name (str): Name of the stored collection, used in error messages.
+            compact_threshold (int): Journal size in bytes that triggers a compaction.
+        """
+        super().__init__(filepath, key_func, name)
+        self.journal_path = filepath + ".journal"
+        self.compact_threshold = compact_threshold
+        self._batch_lines = []
+
+    def load(self):
+        """
+        Loads the snapshot and replays the journal over it.
+
+        Returns:
+            list: A list of record dictionaries.
+        """
+        records = super().load()
+        if not os.path.exists(self.journal_path):
+            return records
+
+        positions = {self.key_func(r): i for i, r in enumerate(records)}
+        corrupt_journal = False
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Una línea incompleta al final indica una escritura interrumpida
+                        print(f"Warning: ignoring corrupt journal line {line_number} "
+                              f"and after in {self.journal_path}")
+                        corrupt_journal = True
+                        break
+                    self._replay_entry(entry, records, positions)
+        except IOError as e:
+            print(f"Error loading {self.name} journal from {self.journal_path}: {e}")
+
+        records = [r for r in records if r is not None]
+        # Con un journal corrupto se compacta ya: las nuevas líneas quedarían tras la línea inválida
+        if corrupt_journal or os.path.getsize(self.journal_path) >= self.compact_threshold:
+            self.compact(records)
+        return records
+
+    @staticmethod
+    def _replay_entry(entry, records, positions):
+        """Applies one journal entry to the records list (deleted slots become None)."""
+        key = entry.get("key")
+        if entry.get("op") == "delete":
+            index = positions.pop(key, None)
+            if index is not None:
+                records[index] = None
+            return
+        previous_key = entry.get("previous_key")
+        if previous_key is not None and previous_key != key and previous_key in positions:
+            positions[key] = positions.pop(previous_key)
+        if key in positions:
+            records[positions[key]] = entry.get("record")
+        else:
+            positions[key] = len(records)
+            records.append(entry.get("record"))
+
+    def _append(self, entry, records):
+        """Appends a journal entry (or buffers it during a batch)."""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        if self.in_batch:
+            self._batch_lines.append(line)
+            return
+        self._write_lines([line], records)
+
+    def _write_lines(self, lines, records):
+        """Appends lines to the journal and compacts if it is over the threshold."""
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+                journal_size = f.tell()
+        except OSError as e:
+            raise StorageError(f"Error writing {self.name} journal to {self.journal_path}: {e}") from e
+        if journal_size >= self.compact_threshold:
+            self.compact(records)
+
+    def upsert(self, record, records, previous_key=None):
+        """Appends an upsert entry for the record to the journal."""
+        entry = {"op": "upsert", "key": self.key_func(record), "record": record}
+        if previous_key is not None:
+            entry["previous_key"] = previous_key
+        self._append(entry, records)
+
+    def delete(self, record, records):
+        """Appends a delete entry for the record to the journal."""
+        self._append({"op": "delete", "key": self.key_func(record)}, records)
+
+    def save_all(self, records):
+        """Rewrites the snapshot with the given records and empties the journal."""
+        self.compact(records)
+
+    def commit_batch(self, records):
+        """Ends the batch appending all buffered entries in a single write."""
+        self.in_batch = False
+        lines, self._batch_lines = self._batch_lines, []
+        if lines:
+            self._write_lines(lines, records)
+
+    def rollback_batch(self):
+        """Ends the batch discarding the buffered entries."""
+        self.in_batch = False
+        self._batch_lines = []
+
+    def compact(self, records):
+        """
+        Writes the full records list as the new snapshot and removes the journal.
+        The snapshot is written first: if the process stops in between, replaying
+        the old journal over the new snapshot gives the same result.
+
+        Args:
+            records (list): The repository's full in-memory list.
+        """
+        super().save_all(records)
+        try:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        except OSError as e:
+            print(f"Error removing {self.name} journal {self.journal_path}: {e}")
+
+
+class PartitionedJsonStorage:
+    """
+    Stores a repository's records as JSON lists split across the files of one directory,
+    one file per partition (e.g. one per month: '2026-10.json'). Only the partitions passed
+    to load() are read, and each mutation rewrites just the partitions it touches, with the
+    same atomic write and backup as JsonFileStorage.
+
+    The partition each loaded record was read from is remembered, so a record whose
+    partition changes (e.g. a class moved to another month) is removed from the old file.
+    Writes assume that every partition they touch has been loaded.
+    """
+
+    def __init__(self, directory, key_func, partition_func, name="data", legacy_filepath=None):
+        """
+        Initializes the storage.
+
+        Args:
+            directory (str): Directory that holds one '<partition>.json' file per partition.
+            key_func (callable): Returns the primary key (str) of a record.
+            partition_func (callable): Returns the partition name (str) of a record
+                (only needed to write).
+            name (str): Name of the stored collection, used in error messages.
+            legacy_filepath (str, optional): Single-file JSON store to split into partitions
+                the first time, if the directory has none yet. It is then renamed to
+                '<legacy_filepath>.migrated'.
+        """
+        self.directory = directory
+        self.key_func = key_func
+        self.partition_func = partition_func
+        self.name = name
+        os.makedirs(self.directory, exist_ok=True)
+        # Particiones existentes en disco y particiones ya leídas
+        self.partitions = set()
+        for filename in os.listdir(self.directory):
+            for suffix in (".json", ".json.bak"):  # Sin el archivo principal se lee la copia
+                if filename.endswith(suffix):
+                    self.partitions.add(filename[:-len(suffix)])
+        self.loaded_partitions = set()
+        # Partición de la que proviene cada registro en memoria: {clave: partición}
+        self._partition_by_key = {}
+        self._dirty_partitions = set()
+        self.in_batch = False
+        self._batch_state = None
+        if legacy_filepath is not None:
+            self._migrate_legacy_file(legacy_filepath)
+
+    def _partition_storage(self, partition):
+        """Returns the JsonFileStorage of one partition file."""
+        return JsonFileStorage(os.path.join(self.directory, f"{partition}.json"),
+                               self.key_func, f"{self.name} {partition}")
+
+    def _migrate_legacy_file(self, legacy_filepath):
+        """Splits a single-file JSON store into partitions, if there are none yet."""
+        if self.partitions or not os.path.exists(legacy_filepath):
+            return
+        records = JsonFileStorage(legacy_filepath, self.key_func, self.name).load()
+        self._partition_by_key = {self.key_func(r): self.partition_func(r) for r in records}
+        self._dirty_partitions = set(self._partition_by_key.values())
+        self._write_dirty(records)
+        # Nada queda cargado: el repositorio lee después solo las particiones que necesita
+        self.loaded_partitions = set()
+        self._partition_by_key = {}
+        try:
+            os.replace(legacy_filepath, legacy_filepath + ".migrated")
+        except OSError as e:
+            print(f"Error renaming migrated {self.name} file {legacy_filepath}: {e}")
+        print(f"Migrated {len(records)} {self.name} records from {legacy_filepath} "
+              f"to {len(self.partitions)} partitions in {self.directory}")
+
+    def list_partitions(self):
+        """Returns the names of the stored partitions, sorted."""
+        return sorted(self.partitions)
+
+    def load(self, partitions=None):
+        """
+        Loads the records of the given partitions that are not loaded yet.
+
+        Args:
+            partitions (iterable, optional): Partition names; all stored partitions if None.
+
+        Returns:
+            list: The newly loaded record dictionaries.
+        """
+        records = []
+        for partition in sorted(self.partitions if partitions is None else partitions):
+            if partition in self.loaded_partitions or partition not in self.partitions:
+                continue
+            partition_records = self._partition_storage(partition).load()
+            for record in partition_records:
+                self._partition_by_key[self.key_func(record)] = partition
+            records.extend(partition_records)
+            self.loaded_partitions.add(partition)
+        return records
+
+    def _write_dirty(self, records):
+        """Rewrites every dirty partition with its records from the in-memory list."""
+        dirty, self._dirty_partitions = self._dirty_partitions, set()
+        if not dirty:
+            return
+        grouped = {partition: [] for partition in dirty}
+        for record in records:
+            bucket = grouped.get(self._partition_by_key.get(self.key_func(record)))
+            if bucket is not None:
+                bucket.append(record)
+        for partition in sorted(grouped):
+            # Una partición vacía se guarda como []: sin archivo, load() recuperaría la copia .bak
+            self._partition_storage(partition).save_all(grouped[partition])
+            self.partitions.add(partition)
+            self.loaded_partitions.add(partition)
+
+    def _mark_dirty(self, partitions, records):
+        """Marks partitions for rewriting; writes them now unless a batch is open."""
+        self._dirty_partitions.update(p for p in partitions if p is not None)
+        if not self.in_batch:
+            self._write_dirty(records)
+
+    def upsert(self, record, records, previous_key=None):
+        """
+        Persists an added or updated record, rewriting its partition (and the one it
+        came from, if it changed).
+
+        Args:
+            record (dict): The record that was added or updated.
+            records (list): The repository's full in-memory list.
+            previous_key (str, optional): The record's key before the update, if it changed.
+        """
+        key = self.key_func(record)
+        previous_partition = self._partition_by_key.pop(key if previous_key is None else previous_key, None)
+        partition = self.partition_func(record)
+        self._partition_by_key[key] = partition
+        self._mark_dirty((previous_partition, partition), records)
+
+    def delete(self, record, records):
+        """
+        Persists the removal of a record, rewriting its partition.
+
+        Args:
+            record (dict): The record that was removed.
+            records (list): The repository's full in-memory list (already without the record).
+        """
+        self._mark_dirty((self._partition_by_key.pop(self.key_func(record), None),), records)
+
+    def save_all(self, records):
+        """
+        Rewrites every loaded partition from the given records.
+
+        Args:
+            records (list): The records of the loaded partitions.
+        """
+        self._partition_by_key = {
+            self.key_func(r): self._partition_by_key.get(self.key_func(r)) or self.partition_func(r)
+            for r in records}
+        self._dirty_partitions.update(self.loaded_partitions)
+        self._dirty_partitions.update(self._partition_by_key.values())
+        self._write_dirty(records)
+
+    def begin_batch(self):
+        """Starts deferring partition writes until commit_batch() or rollback_batch()."""
+        self.in_batch = True
+        self._batch_state = (set(self.partitions), set(self.loaded_partitions), dict(self._partition_by_key))
+
+    def commit_batch(self, records):
+        """
+        Ends the batch, rewriting each partition changed inside it once.
+
+        Args:
+            records (list): The repository's full in-memory list.
+        """
+        self.in_batch = False
+        self._write_dirty(records)
+        # Si la escritura falla, rollback_batch() aún puede restaurar el estado anterior
+        self._batch_state = None
+
+    def rollback_batch(self):
+        """
+        Ends the batch discarding the deferred writes. Partitions loaded during the batch
+        are forgotten too, since the repository restores its data from before the batch.
+        """
+        self.in_batch = False
+        self.partitions, self.loaded_partitions, self._partition_by_key = self._batch_state
+        self._batch_state = None
+        self._dirty_partitions = set()
+
+
+class SqliteStorage:
+    """
+    Stores a repository's records in a SQLite table (standard library sqlite3).
+    Each record is a row keyed by its primary key with the record as JSON,
+    so every mutation is a single indexed row write. The connection may be used from
+    any thread (the repositories are loaded on a worker thread and written from the
+    Tk thread); a lock serializes its statements.
+    """
+
+    def __init__(self, db_path, table, key_func):
+        """
+        Initializes the storage and creates the table if needed.
+
+        Args:
+            db_path (str): The path to the SQLite database file.
+            table (str): The table name (must be a valid identifier).
+            key_func (callable): Returns the primary key (str) of a record.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.db_path = db_path
+        self.table = table
+        self.key_func = key_func
+        # Lote en curso: sentencias (sql, parámetros) pendientes de commit_batch
+        self.in_batch = False
+        self._batch_statements = []
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self.connection:
+            # rowid conserva el orden de inserción de los registros
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def load(self):
+        """
+        Loads the records from the table, in insertion order.
+
+        Returns:
+            list: A list of record dictionaries.
+
+        Raises:
+            StorageError: If the table cannot be read. An empty list is not returned
+                instead: the next full save would wipe the table.
+        """
+        try:
+            with self._lock:
+                rows = self.connection.execute(
+                    f"SELECT data FROM {self.table} ORDER BY rowid").fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(f"Error loading {self.table} data from {self.db_path}: {e}") from e
+        return [json.loads(data) for (data,) in rows]
+
+    def save_all(self, records):
+        """
+        Replaces the table contents with the given records in one transaction.
+
+        Args:
+            records (list): The records to save.
+
+        Raises:
+            StorageError: If the transaction fails; the table is left unchanged.
+        """
+        try:
+            with self._lock, self.connection:
+                self.connection.execute(f"DELETE FROM {self.table}")
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, data) VALUES (?, ?)",
+                    ((self.key_func(r), json.dumps(r, ensure_ascii=False)) for r in records))
+        except sqlite3.Error as e:
+            raise StorageError(f"Error saving {self.table} data to {self.db_path}: {e}") from e
+
+    def _execute(self, statements):
+        """
+        Runs (sql, params) statements in one transaction, or buffers them during a batch.
+
+        Raises:
+            StorageError: If the transaction fails; none of the statements is applied.
+        """
+        if self.in_batch:
+            self._batch_statements.extend(statements)
+            return
+        try:
+            with self._lock, self.connection:
+                for sql, params in statements:
+                    self.connection.execute(sql, params)
+        except sqlite3.Error as e:
+            raise StorageError(f"Error saving {self.table} data to {self.db_path}: {e}") from e
+
+    def upsert(self, record, records=None, previous_key=None):
+        """
+        Inserts or updates a single row.
+
+        Args:
+            record (dict): The record that was added or updated.
+            records (list, optional): Unused; kept for interface compatibility.
+            previous_key (str, optional): The record's key before the update, if it changed.
+        """
+        key = self.key_func(record)
+        data = json.dumps(record, ensure_ascii=False)
+        if previous_key is not None and previous_key != key:
+            self._execute([(f"UPDATE {self.table} SET key = ?, data = ? WHERE key = ?",
+                            (key, data, previous_key))])
+        else:
+            self._execute([(f"INSERT INTO {self.table} (key, data) VALUES (?, ?) "
+                            "ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                            (key, data))])
+
+    def delete(self, record, records=None):
+        """
+        Deletes a single row.
+
+        Args:
+            record (dict): The record that was removed.
+            records (list, optional): Unused; kept for interface compatibility.
+        """
+        self._execute([(f"DELETE FROM {self.table} WHERE key = ?", (self.key_func(record),))])
+
+    def begin_batch(self):
+        """Starts buffering row writes until commit_batch() or rollback_batch()."""
+        self.in_batch = True
+        self._batch_statements = []
+
+    def commit_batch(self, records=None):
+        """Ends the batch running all buffered row writes in a single transaction."""
+        self.in_batch = False
+        statements, self._batch_statements = self._batch_statements, []
+        if statements:
+            self._execute(statements)
+
+    def rollback_batch(self):
+        """Ends the batch discarding the buffered row writes."""
+        self.in_batch = False
+        self._batch_statements = []
+
+    def count(self):
+        """Returns the number of stored rows."""
+        with self._lock:
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+def create_storage(filepath, name, key_func):
+    """
+    Creates the storage configured in STORAGE_BACKEND for a repository.
+
+    Args:
+        filepath (str): The JSON file path (used by the "json" backend).
+        name (str): The collection name; also the SQLite table name.
+        key_func (callable): Returns the primary key (str) of a record.
+
+    Returns:
+        JsonFileStorage, JournaledJsonStorage or SqliteStorage
+    """
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteStorage(SQLITE_DB_PATH, name, key_func)
+    if STORAGE_BACKEND == "journal":
+        return JournaledJsonStorage(filepath, key_func, name)
+    return JsonFileStorage(filepath, key_func, name)
+
+
+def create_partitioned_storage(filepath, name, key_func, partition_func):
+    """
+    Creates the storage for a repository whose records can be split into partitions.
+    With the "json" backend the records go to PartitionedJsonStorage, in a directory named
+    after filepath without its extension (an existing single file is migrated); the other
+    backends keep a single store (see create_storage).
+
+    Args:
+        filepath (str): The single-file JSON path (e.g. './storage/scheduled_classes.json').
+        name (str): The collection name; also the SQLite table name.
+        key_func (callable): Returns the primary key (str) of a record.
+        partition_func (callable): Returns the partition name (str) of a record.
+
+    Returns:
+        PartitionedJsonStorage, JournaledJsonStorage or SqliteStorage
+    """
+    if STORAGE_BACKEND == "json":
+        return PartitionedJsonStorage(os.path.splitext(filepath)[0], key_func, partition_func, name,
+                                      legacy_filepath=filepath)
+    return create_storage(filepath, name, key_func)
+
+
+def remember_for_rollback(repository, record):
+    """
+    Records the current contents of a record that is about to be changed in place, so
+    that an open repository_batch can restore it if the block raises. Records that are
+    only added or removed need no call: the batch restores the list membership itself.
+
+    Args:
+        repository: The repository that owns the record.
+        record (dict): The record about to be mutated.
+    """
+    touched = getattr(repository, "_batch_touched", None)
+    if touched is not None and id(record) not in touched:
+        touched[id(record)] = (record, dict(record))
+
+
+def repository_batch(repository, data_attr, storage=None):
+    """
+    Groups a repository's mutations so they are persisted once, on exit.
+    If the block (or the final write) raises, the in-memory data and indexes are
+    restored and the exception is re-raised. Nested batches join the outermost one.
+
+    Only the list membership is copied up front; records changed in place are copied
+    when first touched (see remember_for_rollback), so opening a batch does not copy
+    every record.
+
+    Args:
+        repository: The repository (must have .storage, _rebuild_indexes() and
+            _mark_changed()).
+        data_attr (str): Name of the repository's in-memory list attribute.
+        storage (optional): The storage that persists data_attr. Defaults to
+            repository.storage.
+
+    Returns:
+        contextlib.AbstractContextManager: Yields the repository.
+    """
+    return collections_batch(repository, [(data_attr, storage if storage is not None else repository.storage)])
+
+
+@contextmanager
+def collections_batch(repository, collections):
+    """
+    Like repository_batch, for repositories that keep more than one collection.
+    All the writes are staged until the block ends and then committed in the given
+    order, so a collection whose records another one refers to should come first: if
+    a later write fails, the earlier ones are already on disk but nothing refers to
+    records that were never written.
+
+    Args:
+        repository: The repository (must have _rebuild_indexes() and _mark_changed()).
+        collections (list): (data_attr, storage) pairs, in write order.
+
+    Yields:
+        The repository.
+    """
+    # Las colecciones cuyo almacenamiento ya está en un lote se unen al lote externo
+    pending = [(data_attr, storage) for data_attr, storage in collections if not storage.in_batch]
+    if not pending:
+        yield repository
+        return
+
+    members = {data_attr: list(getattr(repository, data_attr)) for data_attr, _ in pending}
+    # El lote más externo del repositorio guarda las copias de los registros modificados
+    owns_touched = getattr(repository, "_batch_touched", None) is None
+    if owns_touched:
+        repository._batch_touched = {}
+    for _, storage in pending:
+        storage.begin_batch()
+    try:
+        yield repository
+        while pending:
+            data_attr, storage = pending[0]
+            storage.commit_batch(getattr(repository, data_attr))
+            pending.pop(0)
+    except BaseException:
+        for _, storage in pending:
+            storage.rollback_batch()
+        for data_attr, records in members.items():
+            setattr(repository, data_attr, records)
+        if owns_touched:
+            for record, original in repository._batch_touched.values():
+                record.clear()
+                record.update(original)
+        repository._rebuild_indexes()
+        repository._mark_changed()
+        raise
+    finally:
+        if owns_touched:
+            repository._batch_touched = None
@@ -1,56 +1,83 @@
-import json
-import os
 import uuid
 
+from repositories.storage import StorageError, create_storage, remember_for_rollback, repository_batch
+
 
 class SubjectRepository:
     """
-    Manages subject (materia) data persistence in a JSON file.
+    Manages subject (materia) data persistence (a JSON file by default, see repositories.storage).
     Handles loading, saving, adding, updating, and deleting subjects.
     """
 
-    def __init__(self, filepath='./storage/subjects.json'):
+    STORAGE_NAME = "subjects"
+
+    def __init__(self, filepath='./storage/subjects.json', storage=None):
         """
         Initializes the repository.
 
         Args:
             filepath (str): The path to the JSON file where subject data is stored.
+            storage (optional): Storage backend (JsonFileStorage, JournaledJsonStorage,
+                SqliteStorage). Defaults to the backend configured in
+                repositories.storage.STORAGE_BACKEND.
         """
         self.filepath = filepath
-        # Ensure the storage directory exists
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        self.storage = storage if storage is not None else create_storage(
+            filepath, self.STORAGE_NAME, self._storage_key)
         self.subjects_data = self._load_data()
+        # Contador de cambios en memoria: las vistas lo comparan para saber si deben refrescarse
+        self.revision = 0
+        # Índice por clave primaria: {id: subject_dict}
+        self._subjects_by_id = {}
+        self._rebuild_indexes()
 
     def _load_data(self):
         """
-        Loads subject data from the JSON file.
-        If the file doesn't exist or is empty, it initializes with default data (o una lista vacía).
+        Loads subject data from the storage backend.
+        If there is no stored data, it initializes with default data (o una lista vacía).
 
         Returns:
             list: A list of subject dictionaries.
         """
-        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
-            return []
-        try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading subject data from {self.filepath}: {e}")
-            return []
+        return self.storage.load()
 
     def _save_data(self, data=None):
         """
-        Saves the subject data to the JSON file.
+        Saves the subject data to the storage backend (full rewrite).
 
         Args:
             data (list, optional): The data to save. If None, saves self.subjects_data.
         """
-        try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(data if data is not None else self.subjects_data,
-                          f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error saving subject data to {self.filepath}: {e}")
+        self.storage.save_all(data if data is not None else self.subjects_data)
+
+    @staticmethod
+    def _storage_key(subject):
+        """Returns the storage primary key of a subject dictionary."""
+        return str(subject.get("id"))
+
+    def batch(self):
+        """
+        Returns a context manager that defers persistence of the subjects changed
+        inside it to a single write on exit. If the block raises, the in-memory
+        data is restored and nothing is written.
+
+        Example:
+            with subject_repo.batch():
+                for row in rows:
+                    subject_repo.add_subject(row)
+
+        Returns:
+            contextlib.AbstractContextManager: Yields this repository.
+        """
+        return repository_batch(self, "subjects_data")
+
+    def _rebuild_indexes(self):
+        """Rebuilds the id -> subject dictionary index from self.subjects_data."""
+        self._subjects_by_id = {str(s.get("id")): s for s in self.subjects_data}
+
+    def _mark_changed(self):
+        """Advances the revision counter after any change to the in-memory data."""
+        self.revision += 1
 
     def get_all_subjects(self):
         """
@@ -83,18 +110,17 @@ class SubjectRepository:
         Returns:
             list: A list of the subject's attributes if found, otherwise None.
         """
-        subject_id_str = str(subject_id)
-        for subject in self.subjects_data:
-            if str(subject.get("id")) == subject_id_str:
-                return [
-                    subject.get("id"),
-                    subject.get("name"),
-                    subject.get("intensity_hours"),
-                    subject.get("requires_lab", False),
-                    subject.get("assigned_teacher_id"),
-                    subject.get("time_slot")
-                ]
-        return None
+        subject = self._subjects_by_id.get(str(subject_id))
+        if subject is None:
+            return None
+        return [
+            subject.get("id"),
+            subject.get("name"),
+            subject.get("intensity_hours"),
+            subject.get("requires_lab", False),
+            subject.get("assigned_teacher_id"),
+            subject.get("time_slot")
+        ]
 
     def subject_id_exists(self, subject_id):
         """
@@ -106,8 +132,7 @@ class SubjectRepository:
         Returns:
             bool: True if the subject ID exists, False otherwise.
         """
-        subject_id_str = str(subject_id)
-        return any(str(s.get("id")) == subject_id_str for s in self.subjects_data)
+        return str(subject_id) in self._subjects_by_id
 
     def add_subject(self, subject_details):
         """
@@ -136,8 +161,15 @@ class SubjectRepository:
             "assigned_teacher_id": str(subject_details[4]) if subject_details[4] else None,
             "time_slot": str(subject_details[5])
         }
-        self.subjects_data.append(new_subject)
-        self._save_data()
+        try:
+            with self.batch():
+                self.subjects_data.append(new_subject)
+                self._subjects_by_id[subject_id] = new_subject
+                self.storage.upsert(new_subject, self.subjects_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save subject '{subject_id}': {e}")
+            return False
         return True
 
     def update_subject(self, original_subject_id, updated_details):
@@ -160,19 +192,30 @@ class SubjectRepository:
                   original_id_str}, Attempted: {new_id_str}")
             return False  # ID should not be changed
 
-        for i, subject in enumerate(self.subjects_data):
-            if str(subject.get("id")) == original_id_str:
-                self.subjects_data[i] = {
-                    "id": new_id_str,  # Should be same as original_id_str
-                    "name": str(updated_details[1]),
-                    "intensity_hours": int(updated_details[2]),
-                    "requires_lab": bool(updated_details[3]),
-                    "assigned_teacher_id": str(updated_details[4]) if updated_details[4] else None,
-                    "time_slot": str(updated_details[5])
-                }
-                self._save_data()
-                return True
-        return False  # Subject with original_subject_id not found
+        subject = self._subjects_by_id.get(original_id_str)
+        if subject is None:
+            return False  # Subject with original_subject_id not found
+
+        updated_subject = {
+            "id": new_id_str,  # Should be same as original_id_str
+            "name": str(updated_details[1]),
+            "intensity_hours": int(updated_details[2]),
+            "requires_lab": bool(updated_details[3]),
+            "assigned_teacher_id": str(updated_details[4]) if updated_details[4] else None,
+            "time_slot": str(updated_details[5])
+        }
+        try:
+            with self.batch():
+                # Se actualiza el diccionario en su lugar: conserva su posición en la lista
+                remember_for_rollback(self, subject)
+                subject.clear()
+                subject.update(updated_subject)
+                self.storage.upsert(subject, self.subjects_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save subject '{new_id_str}': {e}")
+            return False
+        return True
 
     def delete_subject(self, subject_id):
         """
@@ -184,12 +227,16 @@ class SubjectRepository:
         Returns:
             bool: True if deleted successfully, False otherwise.
         """
-        subject_id_str = str(subject_id)
-        original_len = len(self.subjects_data)
-        self.subjects_data = [s for s in self.subjects_data if str(
-            s.get("id")) != subject_id_str]
+        subject = self._subjects_by_id.pop(str(subject_id), None)
+        if subject is None:
+            return False
 
-        if len(self.subjects_data) < original_len:
-            self._save_data()
-            return True
-        return False
+        try:
+            with self.batch():
+                self.subjects_data = [s for s in self.subjects_data if s is not subject]
+                self.storage.delete(subject, self.subjects_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not delete subject '{subject_id}': {e}")
+            return False
+        return True
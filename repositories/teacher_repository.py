@@ -1,56 +1,121 @@
-import json
-import os
+from repositories.scheduled_class_repository import occupancy_mask, parse_class_times
+from repositories.storage import StorageError, create_storage, remember_for_rollback, repository_batch
+from utils.availability import AVAILABILITY_DAYS, AVAILABILITY_SLOT_HOURS
+
+# Disponibilidad compilada de un profesor sin franjas registradas: todo el día, todos los días
+UNRESTRICTED_AVAILABILITY_MASK = (occupancy_mask(0, 24 * 60),) * 7
+
+
+def compile_availability_mask(availability):
+    """
+    Compiles a teacher's availability ({day: ["Mañana", "Tarde", "Noche"]}) into a weekly
+    time mask, in the same units as the scheduled class occupancy masks (see occupancy_mask).
+    An availability without any slot (e.g. teachers registered before availability existed)
+    means unrestricted, the same in the class form, the timetable generator and the audit.
+
+    Args:
+        availability (dict): The teacher's availability dictionary.
+
+    Returns:
+        tuple: Seven bitmasks indexed by date.weekday(); Sunday is always 0 unless the
+               availability is unrestricted (see UNRESTRICTED_AVAILABILITY_MASK).
+    """
+    availability = availability if isinstance(availability, dict) else {}
+    masks = []
+    for day in AVAILABILITY_DAYS:
+        mask = 0
+        for slot in availability.get(day) or []:
+            if slot in AVAILABILITY_SLOT_HOURS:
+                start_hour, end_hour = AVAILABILITY_SLOT_HOURS[slot]
+                mask |= occupancy_mask(start_hour * 60, end_hour * 60)
+        masks.append(mask)
+    if not any(masks):
+        return UNRESTRICTED_AVAILABILITY_MASK
+    return tuple(masks) + (0,)
 
 
 class TeacherRepository:
     """
-    Manages teacher data persistence in a JSON file.
+    Manages teacher data persistence (a JSON file by default, see repositories.storage).
     Handles loading, saving, adding, updating, and deleting teachers,
     including their availability.
     """
 
-    def __init__(self, filepath='./storage/teachers.json'):
+    STORAGE_NAME = "teachers"
+
+    def __init__(self, filepath='./storage/teachers.json', storage=None):
         """
         Initializes the repository.
 
         Args:
             filepath (str): The path to the JSON file where teacher data is stored.
+            storage (optional): Storage backend (JsonFileStorage, JournaledJsonStorage,
+                SqliteStorage). Defaults to the backend configured in
+                repositories.storage.STORAGE_BACKEND.
         """
         self.filepath = filepath
-        # Ensure the storage directory exists
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        self.storage = storage if storage is not None else create_storage(
+            filepath, self.STORAGE_NAME, self._storage_key)
         self.teachers_data = self._load_data()
+        # Contador de cambios en memoria: las vistas lo comparan para saber si deben refrescarse
+        self.revision = 0
+        # Índice por clave primaria: {id_card: teacher_dict}
+        self._teachers_by_id = {}
+        # Disponibilidad compilada: {id_card: (máscara por weekday)} (ver compile_availability_mask)
+        self._availability_masks = {}
+        self._rebuild_indexes()
 
     def _load_data(self):
         """
-        Loads teacher data from the JSON file.
-        If the file doesn't exist or is empty, it initializes with default data (o una lista vacía).
+        Loads teacher data from the storage backend.
+        If there is no stored data, it initializes with default data (o una lista vacía).
 
         Returns:
             list: A list of teacher dictionaries.
         """
-        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
-            return []
-        try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading teacher data from {self.filepath}: {e}")
-            return []
+        return self.storage.load()
 
     def _save_data(self, data=None):
         """
-        Saves the teacher data to the JSON file.
+        Saves the teacher data to the storage backend (full rewrite).
 
         Args:
             data (list, optional): The data to save. If None, saves self.teachers_data.
         """
-        try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(data if data is not None else self.teachers_data,
-                          f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error saving teacher data to {self.filepath}: {e}")
+        self.storage.save_all(data if data is not None else self.teachers_data)
+
+    @staticmethod
+    def _storage_key(teacher):
+        """Returns the storage primary key of a teacher dictionary."""
+        return str(teacher.get("id_card"))
+
+    def batch(self):
+        """
+        Returns a context manager that defers persistence of the teachers changed
+        inside it to a single write on exit. If the block raises, the in-memory
+        data is restored and nothing is written.
+
+        Example:
+            with teacher_repo.batch():
+                for row in rows:
+                    teacher_repo.add_teacher(row)
+
+        Returns:
+            contextlib.AbstractContextManager: Yields this repository.
+        """
+        return repository_batch(self, "teachers_data")
+
+    def _rebuild_indexes(self):
+        """Rebuilds the id_card -> teacher index and the compiled availability masks from self.teachers_data."""
+        self._teachers_by_id = {
+            str(t.get("id_card")): t for t in self.teachers_data}
+        self._availability_masks = {
+            id_card: compile_availability_mask(t.get("availability"))
+            for id_card, t in self._teachers_by_id.items()}
+
+    def _mark_changed(self):
+        """Advances the revision counter after any change to the in-memory data."""
+        self.revision += 1
 
     def get_all_teachers(self):
         """
@@ -84,16 +149,15 @@ class TeacherRepository:
             list: A list of the teacher's attributes [id_card, first_name, last_name, availability_dict]
                   if found, otherwise None.
         """
-        id_card_str = str(id_card)
-        for teacher in self.teachers_data:
-            if str(teacher.get("id_card")) == id_card_str:
-                return [
-                    teacher.get("id_card"),
-                    teacher.get("first_name"),
-                    teacher.get("last_name"),
-                    teacher.get("availability", {})
-                ]
-        return None
+        teacher = self._teachers_by_id.get(str(id_card))
+        if teacher is None:
+            return None
+        return [
+            teacher.get("id_card"),
+            teacher.get("first_name"),
+            teacher.get("last_name"),
+            teacher.get("availability", {})
+        ]
 
     def teacher_id_exists(self, id_card):
         """
@@ -105,8 +169,7 @@ class TeacherRepository:
         Returns:
             bool: True if the ID card number exists, False otherwise.
         """
-        id_card_str = str(id_card)
-        return any(str(t.get("id_card")) == id_card_str for t in self.teachers_data)
+        return str(id_card) in self._teachers_by_id
 
     def add_teacher(self, teacher_details):
         """
@@ -129,8 +192,16 @@ class TeacherRepository:
             "last_name": str(teacher_details[2]),
             "availability": teacher_details[3] if len(teacher_details) > 3 and isinstance(teacher_details[3], dict) else {}
         }
-        self.teachers_data.append(new_teacher)
-        self._save_data()
+        try:
+            with self.batch():
+                self.teachers_data.append(new_teacher)
+                self._teachers_by_id[id_card] = new_teacher
+                self._availability_masks[id_card] = compile_availability_mask(new_teacher["availability"])
+                self.storage.upsert(new_teacher, self.teachers_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save teacher '{id_card}': {e}")
+            return False
         return True
 
     def update_teacher(self, original_id_card, updated_details):
@@ -158,17 +229,33 @@ class TeacherRepository:
                     f"Error: Attempt to change ID card to an existing one ({new_id_card_str}).")
                 return False
 
-        for i, teacher in enumerate(self.teachers_data):
-            if str(teacher.get("id_card")) == original_id_card_str:
-                self.teachers_data[i] = {
-                    "id_card": new_id_card_str,  # Usualmente no se cambia la cédula
-                    "first_name": str(updated_details[1]),
-                    "last_name": str(updated_details[2]),
-                    "availability": updated_details[3] if len(updated_details) > 3 and isinstance(updated_details[3], dict) else {}
-                }
-                self._save_data()
-                return True
-        return False  # Teacher with original_id_card not found
+        teacher = self._teachers_by_id.get(original_id_card_str)
+        if teacher is None:
+            return False  # Teacher with original_id_card not found
+
+        updated_teacher = {
+            "id_card": new_id_card_str,  # Usualmente no se cambia la cédula
+            "first_name": str(updated_details[1]),
+            "last_name": str(updated_details[2]),
+            "availability": updated_details[3] if len(updated_details) > 3 and isinstance(updated_details[3], dict) else {}
+        }
+        try:
+            with self.batch():
+                # Se actualiza el diccionario en su lugar: conserva su posición en la lista
+                remember_for_rollback(self, teacher)
+                teacher.clear()
+                teacher.update(updated_teacher)
+                del self._teachers_by_id[original_id_card_str]
+                self._teachers_by_id[new_id_card_str] = teacher
+                self._availability_masks.pop(original_id_card_str, None)
+                self._availability_masks[new_id_card_str] = compile_availability_mask(teacher["availability"])
+                self.storage.upsert(teacher, self.teachers_data,
+                                    previous_key=original_id_card_str)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not save teacher '{new_id_card_str}': {e}")
+            return False
+        return True
 
     def delete_teacher(self, id_card):
         """
@@ -180,12 +267,54 @@ class TeacherRepository:
         Returns:
             bool: True if deleted successfully, False otherwise.
         """
-        id_card_str = str(id_card)
-        original_len = len(self.teachers_data)
-        self.teachers_data = [t for t in self.teachers_data if str(
-            t.get("id_card")) != id_card_str]
+        teacher = self._teachers_by_id.pop(str(id_card), None)
+        if teacher is None:
+            return False
+        try:
+            with self.batch():
+                self._availability_masks.pop(str(id_card), None)
+                self.teachers_data = [t for t in self.teachers_data if t is not teacher]
+                self.storage.delete(teacher, self.teachers_data)
+                self._mark_changed()
+        except StorageError as e:
+            print(f"Error: Could not delete teacher '{id_card}': {e}")
+            return False
+        return True
+
+    def get_availability_mask(self, id_card):
+        """
+        Returns a teacher's compiled weekly availability (see compile_availability_mask).
+
+        Args:
+            id_card (str): The teacher's ID card.
 
-        if len(self.teachers_data) < original_len:
-            self._save_data()
-            return True
-        return False
+        Returns:
+            tuple: Seven bitmasks indexed by date.weekday(), or None if the teacher does not exist.
+        """
+        return self._availability_masks.get(str(id_card))
+
+    def is_available(self, id_card, date_str, start_time_str, end_time_str):
+        """
+        Checks whether a class falls entirely within the teacher's availability.
+        Constant time: one lookup of the compiled mask and one AND.
+
+        Args:
+            id_card (str): The teacher's ID card.
+            date_str (str): Date in YYYY-MM-DD format.
+            start_time_str (str): Start time in HH:MM format.
+            end_time_str (str): End time in HH:MM format.
+
+        Returns:
+            bool: True if the teacher is available for the whole class; False otherwise
+                  (also if the teacher does not exist or the input is malformed).
+        """
+        masks = self._availability_masks.get(str(id_card))
+        if masks is None:
+            return False
+        try:
+            ordinal, start, end = parse_class_times(date_str, start_time_str, end_time_str)
+        except (ValueError, TypeError):
+            return False
+        needed = occupancy_mask(start, end)
+        # El ordinal 1 (0001-01-01) fue lunes: weekday() sin construir un date
+        return bool(needed) and masks[(ordinal - 1) % 7] & needed == needed
@@ -0,0 +1,12 @@
+"""
+Definiciones que comparten el generador de horarios, la búsqueda de horas libres y la
+auditoría de conflictos, para que ninguno de ellos dependa de los otros.
+"""
+
+DAY_START_HOUR = 7
+DAY_END_HOUR = 22  # Las clases terminan a más tardar a las 22:00
+
+
+def classroom_id(classroom):
+    """ID compuesto "numero-bloque" con el que las clases programadas guardan el salón."""
+    return f"{classroom.get('number')}-{classroom.get('block')}"
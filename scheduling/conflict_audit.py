@@ -0,0 +1,204 @@
+"""
+Auditoría de conflictos sobre todas las clases programadas.
+
+Las verificaciones de ClasesFrame solo revisan la clase que se está guardando; los datos
+editados a mano o importados pueden traer cruces que nadie informa. Esta auditoría revisa el
+conjunto completo:
+
+- Profesores con dos clases que se solapan (sweep-line por profesor y fecha).
+- Salones con dos clases que se solapan (sweep-line por salón y fecha).
+- Materias que requieren laboratorio dictadas en un salón que no lo es.
+- Clases fuera de la disponibilidad del profesor.
+- Clases con fecha u horas mal formadas y referencias a profesores, materias o salones inexistentes.
+
+Los solapamientos solo pueden darse entre clases de la misma fecha, así que las fechas se
+reparten en lotes que se auditan en paralelo con un pool de procesos.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from repositories.scheduled_class_repository import occupancy_mask, parse_class_times
+from repositories.teacher_repository import compile_availability_mask
+from scheduling.common import classroom_id
+
+# Por debajo de este número de clases la auditoría se hace en el propio proceso:
+# arrancar el pool y enviar los lotes costaría más que auditar
+MIN_CLASSES_FOR_PROCESS_POOL = 20_000
+BATCHES_PER_WORKER = 4
+
+# Tablas de consulta cargadas una sola vez por proceso de trabajo (ver _init_worker)
+_worker_lookups = None
+
+
+def build_audit_lookups(teachers, subjects, classrooms):
+    """
+    Resume profesores, materias y salones en las tablas que usa la auditoría.
+
+    Returns:
+        dict: {"teacher_availability": {teacher_id: (máscara por weekday 0..6)},
+               "subject_requires_lab": {subject_id: bool},
+               "classroom_is_lab": {classroom_id: bool}}.
+    """
+    return {
+        "teacher_availability": {
+            str(t.get("id_card")): compile_availability_mask(t.get("availability")) for t in teachers},
+        "subject_requires_lab": {str(s.get("id")): bool(s.get("requires_lab")) for s in subjects},
+        "classroom_is_lab": {classroom_id(c): bool(c.get("is_lab")) for c in classrooms},
+    }
+
+
+def _empty_report():
+    return {"teacher_overlaps": [], "classroom_overlaps": [], "lab_mismatches": [],
+            "outside_availability": [], "unknown_references": [], "invalid": []}
+
+
+def _merge_report(report, partial):
+    for key, items in partial.items():
+        report[key].extend(items)
+
+
+def _audit_batch(classes, lookups):
+    """
+    Audita un lote de clases de fechas completas.
+
+    Args:
+        classes (list): Tuplas (ordinal, inicio, fin, class_id, subject_id, teacher_id, classroom_id)
+            ordenadas por fecha e inicio.
+        lookups (dict): Tablas de build_audit_lookups().
+
+    Returns:
+        dict: Informe parcial con las mismas claves que audit_scheduled_classes().
+    """
+    report = _empty_report()
+    teacher_availability = lookups["teacher_availability"]
+    subject_requires_lab = lookups["subject_requires_lab"]
+    classroom_is_lab = lookups["classroom_is_lab"]
+
+    current_date = None
+    # Clases de la fecha en curso que siguen abiertas, por recurso: [(fin, class_id), ...]
+    open_by_teacher = {}
+    open_by_classroom = {}
+    for ordinal, start, end, class_id, subject_id, teacher_id, room_id in classes:
+        if ordinal != current_date:
+            current_date = ordinal
+            weekday = date.fromordinal(ordinal).weekday()
+            open_by_teacher = {}
+            open_by_classroom = {}
+
+        for open_by_resource, resource_id, overlaps in (
+                (open_by_teacher, teacher_id, report["teacher_overlaps"]),
+                (open_by_classroom, room_id, report["classroom_overlaps"])):
+            if not resource_id:
+                continue
+            # Las clases llegan por hora de inicio: las que terminan antes de esta ya no solapan
+            still_open = [entry for entry in open_by_resource.get(resource_id, ()) if entry[0] > start]
+            for _, other_id in still_open:
+                overlaps.append((other_id, class_id))
+            still_open.append((end, class_id))
+            open_by_resource[resource_id] = still_open
+
+        availability = teacher_availability.get(teacher_id)
+        if availability is None:
+            report["unknown_references"].append((class_id, "teacher_id"))
+        else:
+            needed = occupancy_mask(start, end)
+            if availability[weekday] & needed != needed:
+                report["outside_availability"].append(class_id)
+
+        requires_lab = subject_requires_lab.get(subject_id)
+        if requires_lab is None:
+            report["unknown_references"].append((class_id, "subject_id"))
+        is_lab = classroom_is_lab.get(room_id)
+        if is_lab is None:
+            report["unknown_references"].append((class_id, "classroom_id"))
+        elif requires_lab and not is_lab:
+            report["lab_mismatches"].append(class_id)
+    return report
+
+
+def _init_worker(lookups):
+    """Inicializador del pool: guarda las tablas de consulta en el proceso de trabajo."""
+    global _worker_lookups
+    _worker_lookups = lookups
+
+
+def _audit_batch_job(classes):
+    return _audit_batch(classes, _worker_lookups)
+
+
+def _split_by_date(classes, num_batches):
+    """
+    Reparte las clases (ya ordenadas por fecha e inicio) en lotes de fechas completas
+    y de tamaño parecido.
+    """
+    target = max(1, -(-len(classes) // num_batches))
+    batches = []
+    batch = []
+    for position, entry in enumerate(classes):
+        if len(batch) >= target and entry[0] != classes[position - 1][0]:
+            batches.append(batch)
+            batch = []
+        batch.append(entry)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def audit_scheduled_classes(scheduled_classes, teachers, subjects, classrooms, max_workers=None):
+    """
+    Audita todas las clases programadas y devuelve el informe completo de infracciones.
+
+    Args:
+        scheduled_classes (iterable): Diccionarios de clases; basta con recorrerlos una vez
+            (p. ej. scheduled_class_repo.iter_scheduled_classes()).
+        teachers (list): Diccionarios de profesores (teacher_repo.teachers_data).
+        subjects (list): Diccionarios de materias (subject_repo.subjects_data).
+        classrooms (list): Diccionarios de salones (classroom_repo.classrooms_data).
+        max_workers (int, optional): Número de procesos. Por defecto, os.cpu_count(); con 1
+            (o con pocas clases) la auditoría se hace en el proceso actual.
+
+    Returns:
+        dict: {"teacher_overlaps": [(class_id, class_id), ...],
+               "classroom_overlaps": [(class_id, class_id), ...],
+               "lab_mismatches": [class_id, ...],
+               "outside_availability": [class_id, ...],
+               "unknown_references": [(class_id, campo), ...],
+               "invalid": [class_id, ...],
+               "total": número de clases auditadas}.
+    """
+    report = _empty_report()
+    report["total"] = 0
+    classes = []
+    for sc in scheduled_classes:
+        # Se cuenta al recorrer: scheduled_classes puede ser un generador
+        report["total"] += 1
+        class_id = str(sc.get("id"))
+        try:
+            ordinal, start, end = parse_class_times(
+                sc.get("date"), sc.get("start_time"), sc.get("end_time"))
+        except (ValueError, TypeError):
+            report["invalid"].append(class_id)
+            continue
+        if end <= start:
+            report["invalid"].append(class_id)
+            continue
+        classes.append((ordinal, start, end, class_id, str(sc.get("subject_id") or ""),
+                        str(sc.get("teacher_id") or ""), str(sc.get("classroom_id") or "")))
+    if not classes:
+        return report
+    classes.sort()
+
+    lookups = build_audit_lookups(teachers, subjects, classrooms)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(classes) < MIN_CLASSES_FOR_PROCESS_POOL:
+        _merge_report(report, _audit_batch(classes, lookups))
+        return report
+
+    batches = _split_by_date(classes, workers * BATCHES_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(lookups,)) as executor:
+        # map() conserva el orden de los lotes: el informe sale ordenado por fecha
+        for partial in executor.map(_audit_batch_job, batches):
+            _merge_report(report, partial)
+    return report
@@ -0,0 +1,81 @@
+"""
+Búsqueda de horas libres para programar una clase.
+
+Se parte de las máscaras de ocupación por día que mantiene ScheduledClassRepository para el
+profesor y para cada salón; una hora de inicio es válida si el profesor y algún salón
+compatible tienen libres todas las franjas de la clase (y, si se indica, el profesor está
+disponible en ellas).
+"""
+from datetime import datetime
+
+from repositories.scheduled_class_repository import OCCUPANCY_SLOT_MINUTES, occupancy_mask
+from scheduling.common import DAY_END_HOUR, DAY_START_HOUR, classroom_id
+
+_DAY_START_SLOT = DAY_START_HOUR * 60 // OCCUPANCY_SLOT_MINUTES
+_DAY_END_SLOT = DAY_END_HOUR * 60 // OCCUPANCY_SLOT_MINUTES
+
+
+def _free_run_length(busy_mask, first_slot, end_slot):
+    """Franjas libres seguidas (dentro de la jornada) del hueco que contiene [first_slot, end_slot)."""
+    while first_slot > _DAY_START_SLOT and not busy_mask >> (first_slot - 1) & 1:
+        first_slot -= 1
+    while end_slot < _DAY_END_SLOT and not busy_mask >> end_slot & 1:
+        end_slot += 1
+    return end_slot - first_slot
+
+
+def find_free_slots(scheduled_class_repo, classrooms, teacher_id, intensity_hours, requires_lab,
+                    date_str, excluding_class_id=None, availability_mask=None):
+    """
+    Busca las horas de inicio en que se puede programar una clase sin conflictos.
+
+    Los salones de cada hora se ordenan por ajuste: primero los del tipo pedido (una materia
+    que no requiere laboratorio no ocupa uno si hay otros libres), luego los que dejan menos
+    tiempo libre suelto alrededor de la clase y, al final, los de menor capacidad.
+
+    Args:
+        scheduled_class_repo (ScheduledClassRepository): Fuente de la ocupación del día; el
+            mes de date_str debe estar cargado (ScheduledClassRepository.load_date_range).
+        classrooms (list): Diccionarios de salones (classroom_repo.classrooms_data).
+        teacher_id (str): Profesor de la clase.
+        intensity_hours (int): Duración de la clase, en horas.
+        requires_lab (bool): Si la materia solo puede dictarse en un laboratorio.
+        date_str (str): Fecha en formato YYYY-MM-DD.
+        excluding_class_id (str, optional): Clase que se está editando; su propia ocupación no cuenta.
+        availability_mask (tuple, optional): Disponibilidad compilada del profesor
+            (TeacherRepository.get_availability_mask); si se indica, solo se ofrecen horas dentro de ella.
+
+    Returns:
+        list: [("HH:MM", [classroom_id, ...]), ...] por hora de inicio, en orden; vacía si no
+              hay ninguna hora libre o la fecha no es válida.
+    """
+    hours = int(intensity_hours)
+    teacher_busy = scheduled_class_repo.get_teacher_day_occupancy(teacher_id, date_str, excluding_class_id)
+    if availability_mask is not None:
+        try:
+            weekday = datetime.strptime(date_str, "%Y-%m-%d").weekday()
+        except (ValueError, TypeError):
+            return []
+        teacher_busy |= ~availability_mask[weekday]  # Fuera de su disponibilidad cuenta como ocupado
+    rooms = []
+    for classroom in classrooms:
+        is_lab = bool(classroom.get("is_lab"))
+        if requires_lab and not is_lab:
+            continue
+        room_id = classroom_id(classroom)
+        busy = scheduled_class_repo.get_classroom_day_occupancy(room_id, date_str, excluding_class_id)
+        rooms.append((room_id, is_lab != bool(requires_lab), int(classroom.get("capacity") or 0), busy))
+
+    slots = []
+    for hour in range(DAY_START_HOUR, DAY_END_HOUR - hours + 1):
+        needed = occupancy_mask(hour * 60, (hour + hours) * 60)
+        if teacher_busy & needed:
+            continue
+        first_slot = hour * 60 // OCCUPANCY_SLOT_MINUTES
+        end_slot = (hour + hours) * 60 // OCCUPANCY_SLOT_MINUTES
+        free_rooms = sorted(
+            (mismatch, _free_run_length(busy, first_slot, end_slot) - (end_slot - first_slot), capacity, room_id)
+            for room_id, mismatch, capacity, busy in rooms if not busy & needed)
+        if free_rooms:
+            slots.append((f"{hour:02d}:00", [room[-1] for room in free_rooms]))
+    return slots
@@ -0,0 +1,394 @@
+"""
+Generación automática de horarios.
+
+Cada materia con profesor asignado recibe un encuentro semanal (día, hora de inicio y salón)
+de `intensity_hours` horas, igual que al programar una clase a mano en VentanaClase, y ese
+encuentro se repite en cada fecha de ese día de la semana dentro del rango pedido. Al
+guardarlo, cada materia queda como una serie semanal de clases (ScheduledClassRepository).
+
+La búsqueda es un problema de satisfacción de restricciones:
+
+- Dominio de cada materia: pares (día, hora) dentro de su franja (Diurna/Nocturna) y de la
+  disponibilidad del profesor, sin chocar con clases ya programadas y con algún salón
+  compatible libre. Ocupación y disponibilidad son máscaras de bits (ver occupancy_mask y
+  compile_availability_mask en los repositorios).
+- Las restricciones de profesor solo relacionan materias de un mismo profesor: se resuelve
+  un subproblema por profesor, empezando por los más restringidos, mientras la ocupación de
+  los salones se acumula entre subproblemas.
+- En cada subproblema: variable más restringida primero (MRV), valor menos restrictivo
+  primero (LCV), comprobación hacia adelante y ramificación y poda sobre las horas ubicadas,
+  con un presupuesto de nodos. Lo que no cabe se informa como no ubicado.
+"""
+import uuid
+from datetime import date, timedelta
+
+from repositories.scheduled_class_repository import occupancy_mask, parse_class_times
+from repositories.teacher_repository import compile_availability_mask
+from scheduling.common import DAY_END_HOUR, DAY_START_HOUR, classroom_id
+from utils.availability import AVAILABILITY_DAYS
+
+# Horas [inicio, fin) de cada franja de materia
+SUBJECT_SLOT_HOURS = {"Diurna": (7, 18), "Nocturna": (18, 22)}
+
+DEFAULT_NODE_LIMIT = 2000  # Nodos de búsqueda por profesor
+
+_HOURS_PER_DAY = 24  # Codificación de un valor del dominio: día * 24 + hora
+
+
+def hours_mask(start_hour, end_hour):
+    """Máscara de ocupación (ver occupancy_mask) de las horas completas [start_hour, end_hour)."""
+    return occupancy_mask(start_hour * 60, end_hour * 60)
+
+
+def dates_by_weekday(start_date, end_date):
+    """
+    Agrupa las fechas del rango (ambos extremos incluidos) por día de la semana, sin domingos.
+
+    Args:
+        start_date (date): Primera fecha.
+        end_date (date): Última fecha.
+
+    Returns:
+        dict: {weekday (0..5): ["YYYY-MM-DD", ...]}.
+    """
+    groups = {}
+    current = start_date
+    while current <= end_date:
+        if current.weekday() < len(AVAILABILITY_DAYS):
+            groups.setdefault(current.weekday(), []).append(current.strftime("%Y-%m-%d"))
+        current += timedelta(days=1)
+    return groups
+
+
+def _busy_masks_by_weekday(scheduled_classes, start_ordinal, end_ordinal):
+    """
+    Ocupación que ya tienen profesores y salones en el rango, por día de la semana.
+    Un recurso se considera ocupado a una hora si lo está en alguna de las fechas de ese día:
+    el encuentro semanal que se genere debe caber en todas ellas.
+
+    Returns:
+        tuple: ({(teacher_id, weekday): máscara}, {(classroom_id, weekday): máscara},
+                set de subject_id con clases en el rango).
+    """
+    teacher_busy = {}
+    classroom_busy = {}
+    scheduled_subjects = set()
+    for sc in scheduled_classes:
+        try:
+            ordinal, start, end = parse_class_times(
+                sc.get("date"), sc.get("start_time"), sc.get("end_time"))
+        except (ValueError, TypeError):
+            continue  # Datos mal formateados: no ocupan nada
+        if not start_ordinal <= ordinal <= end_ordinal:
+            continue
+        weekday = date.fromordinal(ordinal).weekday()
+        mask = occupancy_mask(start, end)
+        key = (str(sc.get("teacher_id")), weekday)
+        teacher_busy[key] = teacher_busy.get(key, 0) | mask
+        key = (str(sc.get("classroom_id")), weekday)
+        classroom_busy[key] = classroom_busy.get(key, 0) | mask
+        if sc.get("subject_id"):
+            scheduled_subjects.add(str(sc.get("subject_id")))
+    return teacher_busy, classroom_busy, scheduled_subjects
+
+
+class _TimetableSearch:
+    """
+    Estado de la búsqueda. Las restricciones de profesor solo relacionan a las materias de un
+    mismo profesor, así que se resuelve un subproblema pequeño por profesor (ramificación y
+    poda); la ocupación de los salones es global y se acumula de un profesor al siguiente.
+    """
+
+    def __init__(self, subjects, rooms, room_busy, node_limit):
+        self.subjects = subjects      # [{"id", "teacher_id", "hours", "lab", "domain": set}]
+        self.rooms = rooms            # [(classroom_id, is_lab, capacity)]
+        self.room_busy = room_busy    # {(room_index, weekday): máscara}
+        self.node_limit = node_limit
+        self.nodes = 0
+        # Orden de preferencia de salones: los de laboratorio quedan al final para las materias
+        # que no los necesitan, y dentro de cada grupo, primero los de menor capacidad
+        by_fit = sorted(range(len(rooms)), key=lambda i: (rooms[i][1], rooms[i][2]))
+        self.rooms_for_lab = [i for i in by_fit if rooms[i][1]]
+        self.rooms_for_regular = by_fit
+        self.assignment = {}  # {índice de materia: (valor, índice de salón)}
+
+    def _free_room(self, subject, value):
+        weekday, hour = divmod(value, _HOURS_PER_DAY)
+        mask = hours_mask(hour, hour + subject["hours"])
+        room_busy = self.room_busy
+        for room_index in (self.rooms_for_lab if subject["lab"] else self.rooms_for_regular):
+            if not room_busy.get((room_index, weekday), 0) & mask:
+                return room_index
+        return None
+
+    def _occupy(self, subject, value, room_index, occupied):
+        weekday, hour = divmod(value, _HOURS_PER_DAY)
+        mask = hours_mask(hour, hour + subject["hours"])
+        key = (room_index, weekday)
+        if occupied:
+            self.room_busy[key] = self.room_busy.get(key, 0) | mask
+        else:
+            self.room_busy[key] &= ~mask
+
+    @staticmethod
+    def _overlapping_values(value, hours, other_hours):
+        """Valores de una materia de `other_hours` horas que chocan con `value` de `hours` horas."""
+        weekday, hour = divmod(value, _HOURS_PER_DAY)
+        base = weekday * _HOURS_PER_DAY
+        return range(base + max(0, hour - other_hours + 1), base + hour + hours)
+
+    def run(self):
+        """Ejecuta la búsqueda. Devuelve {índice de materia: (valor, índice de salón)}."""
+        by_teacher = {}
+        for index, subject in enumerate(self.subjects):
+            by_teacher.setdefault(subject["teacher_id"], []).append(index)
+        # Primero los profesores más restringidos: menos opciones por materia y más horas que ubicar
+        # (y, a igualdad, más horas de laboratorio, el recurso más escaso)
+        order = sorted(by_teacher.values(), key=lambda group: (
+            min(len(self.subjects[i]["domain"]) for i in group),
+            -sum(self.subjects[i]["hours"] for i in group),
+            -sum(self.subjects[i]["hours"] for i in group if self.subjects[i]["lab"])))
+        for group in order:
+            for index, value, room_index in self._solve_teacher(group):
+                self._occupy(self.subjects[index], value, room_index, True)
+                self.assignment[index] = (value, room_index)
+        return self.assignment
+
+    def _solve_teacher(self, group):
+        """
+        Ubica el mayor número de horas posible de las materias de un profesor.
+
+        Búsqueda en profundidad con MRV, LCV y comprobación hacia adelante; cada materia puede
+        además quedar sin ubicar, y una rama se poda cuando ni ubicando todo lo que queda
+        superaría a la mejor solución encontrada. Se detiene al ubicarlo todo o al agotar
+        node_limit nodos, quedándose con la mejor solución hasta ese momento.
+
+        Returns:
+            list: [(índice de materia, valor, índice de salón), ...].
+        """
+        subjects = self.subjects
+        domains = {i: set(subjects[i]["domain"]) for i in group}
+        total_hours = sum(subjects[i]["hours"] for i in group)
+        best = {"hours": -1, "placed": []}
+        placed = []
+        nodes = [0]
+
+        def order_values(index, pending):
+            # LCV: valores que menos podan a las materias pendientes; a igualdad, días con menos
+            # horas ya asignadas (reparte la carga del profesor) y horas más tempranas
+            hours = subjects[index]["hours"]
+            day_hours = {}
+            for other, value, _ in placed:
+                weekday = value // _HOURS_PER_DAY
+                day_hours[weekday] = day_hours.get(weekday, 0) + subjects[other]["hours"]
+
+            def cost(value):
+                pruned = 0
+                for other in pending:
+                    domain = domains[other]
+                    pruned += sum(1 for v in self._overlapping_values(value, hours, subjects[other]["hours"])
+                                  if v in domain)
+                weekday, hour = divmod(value, _HOURS_PER_DAY)
+                return pruned, day_hours.get(weekday, 0), hour, weekday
+
+            return sorted(domains[index], key=cost)
+
+        def search(pending, placed_hours, open_hours):
+            if placed_hours + open_hours <= best["hours"] or best["hours"] == total_hours:
+                return
+            if not pending:
+                best["hours"], best["placed"] = placed_hours, list(placed)
+                return
+            nodes[0] += 1
+            if nodes[0] > self.node_limit:
+                # Presupuesto agotado: lo ubicado en esta rama cuenta como solución parcial
+                if placed_hours > best["hours"]:
+                    best["hours"], best["placed"] = placed_hours, list(placed)
+                return
+            index = min(pending, key=lambda i: (len(domains[i]), -subjects[i]["hours"]))
+            subject = subjects[index]
+            rest = [i for i in pending if i != index]
+            for value in order_values(index, rest):
+                room_index = self._free_room(subject, value)
+                if room_index is None:
+                    continue
+                pruned = []
+                for other in rest:
+                    removed = [v for v in self._overlapping_values(value, subject["hours"], subjects[other]["hours"])
+                               if v in domains[other]]
+                    if removed:
+                        domains[other].difference_update(removed)
+                        pruned.append((other, removed))
+                # Las materias que se quedan sin valores ya no pueden ubicarse en esta rama
+                wiped = [i for i in rest if not domains[i]]
+                self._occupy(subject, value, room_index, True)
+                placed.append((index, value, room_index))
+                search([i for i in rest if domains[i]], placed_hours + subject["hours"],
+                       open_hours - subject["hours"] - sum(subjects[i]["hours"] for i in wiped))
+                placed.pop()
+                self._occupy(subject, value, room_index, False)
+                for other, removed in pruned:
+                    domains[other].update(removed)
+                if best["hours"] == total_hours or nodes[0] > self.node_limit:
+                    return
+            # Rama en la que esta materia queda sin ubicar
+            search(rest, placed_hours, open_hours - subject["hours"])
+
+        search(list(group), 0, total_hours)
+        self.nodes += nodes[0]
+        return best["placed"]
+
+
+def build_timetable(teachers, subjects, classrooms, scheduled_classes, start_date, end_date,
+                    min_capacity=0, node_limit=DEFAULT_NODE_LIMIT):
+    """
+    Calcula un horario sin conflictos para las materias que aún no tienen clases en el rango.
+    No modifica ningún repositorio, así que puede ejecutarse en un hilo de trabajo sobre copias
+    de los datos.
+
+    Args:
+        teachers (list): Diccionarios de profesores (teacher_repo.teachers_data).
+        subjects (list): Diccionarios de materias (subject_repo.subjects_data).
+        classrooms (list): Diccionarios de salones (classroom_repo.classrooms_data).
+        scheduled_classes (list): Clases ya programadas; se respetan como ocupación.
+        start_date (date): Primera fecha del rango.
+        end_date (date): Última fecha del rango (incluida).
+        min_capacity (int): Capacidad mínima de los salones que se pueden usar.
+        node_limit (int): Nodos de búsqueda por profesor; agotados, se conserva la mejor solución hallada.
+
+    Returns:
+        dict: {"series": [[id, primera fecha, última fecha, inicio, fin, subject_id, teacher_id,
+                           classroom_id], ...] (una serie semanal por materia ubicada),
+               "session_count": clases (sesiones) que crean las series,
+               "placements": {subject_id: (día, inicio, fin, classroom_id)},
+               "unscheduled": {subject_id: motivo},
+               "already_scheduled": [subject_id, ...],
+               "nodes": nodos de búsqueda explorados}.
+
+    Raises:
+        ValueError: Si el rango de fechas está invertido.
+    """
+    if end_date < start_date:
+        raise ValueError("La fecha final es anterior a la fecha inicial.")
+    dates = dates_by_weekday(start_date, end_date)
+    weekdays = sorted(dates)
+    teacher_busy, classroom_busy, scheduled_subjects = _busy_masks_by_weekday(
+        scheduled_classes, start_date.toordinal(), end_date.toordinal())
+    availability = {str(t.get("id_card")): compile_availability_mask(t.get("availability")) for t in teachers}
+
+    rooms = [(classroom_id(c), bool(c.get("is_lab")), int(c.get("capacity") or 0))
+             for c in classrooms if int(c.get("capacity") or 0) >= min_capacity]
+    room_busy = {}
+    for room_index, (room_id, _, _) in enumerate(rooms):
+        for weekday in weekdays:
+            mask = classroom_busy.get((room_id, weekday), 0)
+            if mask:
+                room_busy[(room_index, weekday)] = mask
+
+    # Horas de inicio con algún salón libre, por (laboratorio, día, duración). Muchos salones
+    # comparten la misma ocupación, así que se agrupan por máscara antes de recorrerlos.
+    room_starts = {}
+
+    def starts_with_free_room(lab, weekday, hours):
+        key = (lab, weekday, hours)
+        if key not in room_starts:
+            masks = {room_busy.get((i, weekday), 0) for i, room in enumerate(rooms) if room[1] or not lab}
+            starts = 0
+            for hour in range(DAY_START_HOUR, DAY_END_HOUR - hours + 1):
+                needed = hours_mask(hour, hour + hours)
+                if any(not mask & needed for mask in masks):
+                    starts |= 1 << hour
+            room_starts[key] = starts
+        return room_starts[key]
+
+    result = {"series": [], "session_count": 0, "placements": {}, "unscheduled": {}, "already_scheduled": [], "nodes": 0}
+    variables = []
+    for s in subjects:
+        subject_id = str(s.get("id"))
+        teacher_id = str(s.get("assigned_teacher_id") or "")
+        if subject_id in scheduled_subjects:
+            result["already_scheduled"].append(subject_id)
+            continue
+        if not teacher_id:
+            result["unscheduled"][subject_id] = "La materia no tiene profesor asignado."
+            continue
+        if teacher_id not in availability:
+            result["unscheduled"][subject_id] = "El profesor asignado no existe."
+            continue
+        hours = int(s.get("intensity_hours") or 0)
+        lab = bool(s.get("requires_lab"))
+        if hours <= 0:
+            result["unscheduled"][subject_id] = "La intensidad horaria no es válida."
+            continue
+        if lab and not any(room[1] for room in rooms):
+            result["unscheduled"][subject_id] = "No hay salones de laboratorio."
+            continue
+
+        window = hours_mask(*SUBJECT_SLOT_HOURS.get(s.get("time_slot"), (DAY_START_HOUR, DAY_END_HOUR)))
+        domain = set()
+        for weekday in weekdays:
+            allowed = window & availability[teacher_id][weekday] & ~teacher_busy.get((teacher_id, weekday), 0)
+            starts = starts_with_free_room(lab, weekday, hours)
+            for hour in range(DAY_START_HOUR, DAY_END_HOUR - hours + 1):
+                needed = hours_mask(hour, hour + hours)
+                if allowed & needed == needed and starts >> hour & 1:
+                    domain.add(weekday * _HOURS_PER_DAY + hour)
+        if not domain:
+            result["unscheduled"][subject_id] = \
+                "No hay horas libres dentro de la franja de la materia y la disponibilidad del profesor."
+            continue
+        variables.append({"id": subject_id, "teacher_id": teacher_id, "hours": hours,
+                          "lab": lab, "domain": domain})
+
+    search = _TimetableSearch(variables, rooms, room_busy, node_limit)
+    assignment = search.run()
+    result["nodes"] = search.nodes
+
+    for index, subject in enumerate(variables):
+        if index not in assignment:
+            result["unscheduled"][subject["id"]] = \
+                "No se encontró un hueco sin conflictos con las demás materias."
+            continue
+        value, room_index = assignment[index]
+        weekday, hour = divmod(value, _HOURS_PER_DAY)
+        start_time = f"{hour:02d}:00"
+        end_time = f"{hour + subject['hours']:02d}:00"
+        room_id = rooms[room_index][0]
+        result["placements"][subject["id"]] = (AVAILABILITY_DAYS[weekday], start_time, end_time, room_id)
+        result["series"].append([str(uuid.uuid4()), dates[weekday][0], dates[weekday][-1], start_time, end_time,
+                                 subject["id"], subject["teacher_id"], room_id])
+        result["session_count"] += len(dates[weekday])
+    return result
+
+
+def save_timetable(scheduled_class_repo, series):
+    """
+    Guarda el horario generado como series semanales de clases, en una sola escritura
+    (scheduled_class_repo.batch()). Cada fecha se vuelve a verificar contra el repositorio por
+    si cambió desde que se calculó el horario; las que ahora chocan quedan como fechas
+    canceladas de su serie.
+
+    Args:
+        scheduled_class_repo (ScheduledClassRepository): Repositorio de destino.
+        series (list): Filas de build_timetable()["series"].
+
+    Returns:
+        tuple: (clases guardadas, clases omitidas por conflicto).
+    """
+    added = skipped = 0
+    if series:
+        # Las verificaciones de conflicto solo ven los meses cargados
+        scheduled_class_repo.load_date_range(min(row[1] for row in series), max(row[2] for row in series))
+    with scheduled_class_repo.batch():
+        for row in series:
+            _, first_date, last_date, start_time, end_time, _, teacher_id, room_id = row
+            total = len(range(date.fromisoformat(first_date).toordinal(),
+                              date.fromisoformat(last_date).toordinal() + 1, 7))
+            conflicts = scheduled_class_repo.find_class_series_conflicts(
+                teacher_id, room_id, first_date, last_date, start_time, end_time)
+            if len(conflicts) < total and scheduled_class_repo.add_class_series(row, exceptions=conflicts):
+                added += total - len(conflicts)
+                skipped += len(conflicts)
+            else:
+                skipped += total
+    return added, skipped
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Las pruebas importan los paquetes del proyecto desde la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories.scheduled_class_repository import ScheduledClassRepository  # noqa: E402
+
+
+@pytest.fixture
+def class_repo(tmp_path):
+    """ScheduledClassRepository vacío, guardado por meses en un directorio temporal."""
+    return ScheduledClassRepository(str(tmp_path / "scheduled_classes.json"))
+
+
+@pytest.fixture
+def weekly_series():
+    """Fila de una serie semanal de cinco lunes (2026-03-02 a 2026-03-30), 08:00-10:00."""
+    return ["S1", "2026-03-02", "2026-03-30", "08:00", "10:00", "M1", "T1", "101-A"]
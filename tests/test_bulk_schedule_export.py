@@ -0,0 +1,68 @@
+import os
+import zipfile
+
+from utils.bulk_schedule_export import export_all_teacher_schedules, schedule_file_name
+
+TEACHER_NAMES = {"T1": "Ana María", "T2": "Pedro Ruiz"}
+
+
+def _class(class_id, teacher_id):
+    return {"id": class_id, "date": "2026-03-02", "start_time": "08:00", "end_time": "10:00",
+            "subject_id": "M1", "teacher_id": teacher_id, "classroom_id": "101-A"}
+
+
+CLASSES = [_class("C1", "T1"), _class("C2", "T2"), _class("C3", "T1"), _class("C4", None)]
+
+
+def test_one_workbook_per_teacher_with_progress(tmp_path):
+    progress = []
+
+    result = export_all_teacher_schedules(
+        CLASSES, TEACHER_NAMES, {"M1": "Cálculo"}, {}, str(tmp_path), max_workers=1,
+        progress_callback=lambda done, total, teacher_id: progress.append((done, total)))
+
+    assert result["total"] == 2 and result["errors"] == {}
+    assert result["exported"] == {
+        "T1": str(tmp_path / schedule_file_name("Ana María", "T1")),
+        "T2": str(tmp_path / schedule_file_name("Pedro Ruiz", "T2"))}
+    assert all(os.path.exists(path) for path in result["exported"].values())
+    assert progress == [(1, 2), (2, 2)]
+
+
+def test_a_failing_teacher_is_reported_and_the_rest_exported(tmp_path):
+    # Un directorio con el nombre del libro de T2 hace fallar solo su escritura
+    os.mkdir(tmp_path / schedule_file_name("Pedro Ruiz", "T2"))
+
+    result = export_all_teacher_schedules(CLASSES, TEACHER_NAMES, {}, {}, str(tmp_path), max_workers=1)
+
+    assert list(result["exported"]) == ["T1"]
+    assert list(result["errors"]) == ["T2"]
+    assert result["errors"]["T2"].startswith("IsADirectoryError")
+
+
+def test_zip_output_holds_every_workbook(tmp_path):
+    zip_path = str(tmp_path / "horarios.zip")
+
+    result = export_all_teacher_schedules(CLASSES, {"T1": "Ana María"}, {}, {}, zip_path,
+                                          as_zip=True, max_workers=1)
+
+    expected = {"T1": schedule_file_name("Ana María", "T1"), "T2": schedule_file_name("T2", "T2")}
+    assert result["exported"] == expected and result["errors"] == {}
+    with zipfile.ZipFile(zip_path) as archive:
+        assert sorted(archive.namelist()) == sorted(expected.values())
+    assert os.listdir(tmp_path) == ["horarios.zip"]
+
+
+def test_zip_write_failure_marks_every_teacher(tmp_path):
+    zip_path = str(tmp_path / "no_existe" / "horarios.zip")
+
+    result = export_all_teacher_schedules(CLASSES, TEACHER_NAMES, {}, {}, zip_path, as_zip=True, max_workers=1)
+
+    assert result["exported"] == {}
+    assert sorted(result["errors"]) == ["T1", "T2"]
+    assert all(error.startswith("No se pudo escribir el zip") for error in result["errors"].values())
+
+
+def test_nothing_to_export_without_classes(tmp_path):
+    assert export_all_teacher_schedules([_class("C4", None)], {}, {}, {}, str(tmp_path / "x.zip"),
+                                        as_zip=True, max_workers=1) == {"exported": {}, "errors": {}, "total": 0}
@@ -0,0 +1,72 @@
+from ui.busqueda_indexada import IndiceBusqueda
+
+PROFESORES = [
+    {"id": "1", "nombre": "Ana María", "email": "ana@colegio.edu"},
+    {"id": "2", "nombre": "Mariana López", "email": "mlopez@colegio.edu"},
+    {"id": "3", "nombre": "Pedro Ruiz", "email": "pruiz@colegio.edu"},
+    {"id": "4", "nombre": "Anabel Gómez", "email": "agomez@colegio.edu"},
+]
+
+
+class TextosContados(list):
+    """Lista de textos del índice que cuenta cuántos se revisan en cada búsqueda."""
+
+    revisados = 0
+
+    def __getitem__(self, i):
+        self.revisados += 1
+        return super().__getitem__(i)
+
+
+def _indice(registros=PROFESORES):
+    indice = IndiceBusqueda(lambda p: (p["nombre"], p["email"]))
+    indice.reconstruir(registros)
+    indice._textos = TextosContados(indice._textos)
+    return indice
+
+
+def _ids(registros):
+    return [r["id"] for r in registros]
+
+
+def test_search_ignores_case_and_keeps_the_original_order():
+    indice = _indice()
+
+    assert _ids(indice.buscar("ANA")) == ["1", "2", "4"]
+    assert indice.buscar("") == PROFESORES
+
+
+def test_refining_the_query_only_rechecks_previous_matches():
+    indice = _indice()
+    indice.buscar("ana")
+    indice._textos.revisados = 0
+
+    assert _ids(indice.buscar("anab")) == ["4"]
+    assert indice._textos.revisados == 3
+
+
+def test_a_different_query_scans_every_record_again():
+    indice = _indice()
+    indice.buscar("anab")
+    indice._textos.revisados = 0
+
+    assert _ids(indice.buscar("ruiz")) == ["3"]
+    assert indice._textos.revisados == len(PROFESORES)
+    assert _ids(indice.buscar("ana")) == ["1", "2", "4"]
+
+
+def test_rebuilding_forgets_the_previous_matches():
+    indice = _indice()
+    indice.buscar("ana")
+
+    indice.reconstruir(PROFESORES + [{"id": "5", "nombre": "Susana Díaz", "email": "sdiaz@colegio.edu"}])
+
+    assert _ids(indice.buscar("anas")) == []
+    assert _ids(indice.buscar("ana")) == ["1", "2", "4", "5"]
+
+
+def test_matches_do_not_span_two_fields():
+    indice = _indice()
+
+    assert indice.buscar("ruizpruiz") == []
+    assert indice.buscar("ruiz pruiz") == []
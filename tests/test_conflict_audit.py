@@ -0,0 +1,65 @@
+import random
+from datetime import date, timedelta
+
+from scheduling import conflict_audit
+from scheduling.conflict_audit import audit_scheduled_classes
+
+TEACHERS = [{"id_card": "T1", "availability": {"Lunes": ["Mañana"]}},
+            {"id_card": "T2", "availability": {}}]
+SUBJECTS = [{"id": "M1", "requires_lab": False}, {"id": "LAB", "requires_lab": True}]
+CLASSROOMS = [{"number": "101", "block": "A", "is_lab": False},
+              {"number": "102", "block": "A", "is_lab": True}]
+
+
+def _class(class_id, date_str, start, end, subject="M1", teacher="T2", room="101-A"):
+    return {"id": class_id, "date": date_str, "start_time": start, "end_time": end,
+            "subject_id": subject, "teacher_id": teacher, "classroom_id": room}
+
+
+def test_audit_reports_each_kind_of_violation():
+    classes = [
+        _class("A", "2026-03-02", "08:00", "10:00", teacher="T1"),
+        _class("B", "2026-03-02", "09:30", "12:30", teacher="T1", room="102-A"),
+        _class("C", "2026-03-02", "09:30", "11:00"),
+        _class("D", "2026-03-03", "08:00", "09:00", subject="LAB"),
+        _class("E", "2026-03-03", "08:00", "09:00", teacher="T9", room="102-A"),
+        _class("F", "2026-03-03", "10:00", "09:00"),
+    ]
+
+    report = audit_scheduled_classes(classes, TEACHERS, SUBJECTS, CLASSROOMS, max_workers=1)
+
+    assert report["teacher_overlaps"] == [("A", "B")]
+    assert report["classroom_overlaps"] == [("A", "C")]
+    assert report["lab_mismatches"] == ["D"]
+    assert report["outside_availability"] == ["B"]
+    assert report["unknown_references"] == [("E", "teacher_id")]
+    assert report["invalid"] == ["F"]
+    assert report["total"] == 6
+
+
+def test_audit_accepts_a_generator():
+    classes = [_class("A", "2026-03-02", "08:00", "10:00"), _class("B", "2026-03-02", "09:00", "11:00"),
+               _class("X", "mal", "08:00", "09:00")]
+
+    report = audit_scheduled_classes((sc for sc in classes), TEACHERS, SUBJECTS, CLASSROOMS, max_workers=1)
+
+    assert report["classroom_overlaps"] == [("A", "B")]
+    assert report["total"] == 3
+
+
+def test_process_pool_gives_the_serial_report(monkeypatch):
+    rng = random.Random(3)
+    classes = []
+    for i in range(400):
+        day = (date(2026, 3, 2) + timedelta(days=rng.randrange(20))).isoformat()
+        hour = rng.randrange(7, 12)
+        classes.append(_class(f"C{i:03d}", day, f"{hour:02d}:00", f"{hour + 2:02d}:00",
+                              subject=rng.choice(["M1", "LAB"]), teacher=rng.choice(["T1", "T2"]),
+                              room=rng.choice(["101-A", "102-A"])))
+
+    serial = audit_scheduled_classes(classes, TEACHERS, SUBJECTS, CLASSROOMS, max_workers=1)
+    monkeypatch.setattr(conflict_audit, "MIN_CLASSES_FOR_PROCESS_POOL", 0)
+    pooled = audit_scheduled_classes(classes, TEACHERS, SUBJECTS, CLASSROOMS, max_workers=2)
+
+    assert pooled == serial
+    assert serial["teacher_overlaps"] and serial["lab_mismatches"]
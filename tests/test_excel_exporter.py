@@ -0,0 +1,68 @@
+import openpyxl
+
+from utils.excel_exporter import ScheduleNameResolver, write_teacher_schedule_to_excel
+
+
+class SubjectRepoFalso:
+    def __init__(self, names):
+        self.names = names
+        self.lookups = []
+
+    def get_subject_by_id(self, subject_id):
+        self.lookups.append(subject_id)
+        name = self.names.get(subject_id)
+        return [subject_id, name, 2, False, None, "Diurna"] if name else None
+
+
+class ClassroomRepoFalso:
+    def __init__(self, keys):
+        self.keys = keys
+        self.lookups = []
+
+    def get_classroom(self, number, block):
+        self.lookups.append((number, block))
+        return [number, block, 30, False] if (number, block) in self.keys else None
+
+
+def test_unknown_and_missing_ids_are_left_out():
+    resolver = ScheduleNameResolver(SubjectRepoFalso({"M1": "Cálculo"}), ClassroomRepoFalso({("101", "A")}))
+
+    subject_names, classroom_names = resolver.resolve(["M1", "M9", None], ["101-A", "999-Z", "101", None])
+
+    assert subject_names == {"M1": "Cálculo"}
+    assert classroom_names == {"101-A": "101-A"}
+
+
+def test_without_repositories_nothing_is_resolved():
+    resolver = ScheduleNameResolver(None, None)
+
+    assert resolver.resolve(["M1"], ["101-A"]) == ({}, {})
+
+
+def test_each_id_is_looked_up_once():
+    subject_repo = SubjectRepoFalso({"M1": "Cálculo"})
+    classroom_repo = ClassroomRepoFalso({("101", "A-2")})
+    resolver = ScheduleNameResolver(subject_repo, classroom_repo)
+    schedule = [{"subject_id": "M1", "classroom_id": "101-A-2"}, {"subject_id": "M9", "classroom_id": "101-A-2"}]
+
+    first = resolver.resolve_schedule(schedule)
+    second = resolver.resolve_schedule(schedule + [{"subject_id": "M1", "classroom_id": None}])
+
+    assert first == second == ({"M1": "Cálculo"}, {"101-A-2": "101-A-2"})
+    assert sorted(subject_repo.lookups) == ["M1", "M9"]
+    assert classroom_repo.lookups == [("101", "A-2")]
+
+
+def test_unresolved_ids_are_exported_as_is(tmp_path):
+    resolver = ScheduleNameResolver(SubjectRepoFalso({"M1": "Cálculo"}), ClassroomRepoFalso(set()))
+    schedule = [
+        {"date": "2026-03-03", "start_time": "10:00", "end_time": "12:00", "subject_id": "M9", "classroom_id": "101-A"},
+        {"date": "2026-03-02", "start_time": "08:00", "end_time": "10:00", "subject_id": "M1", "classroom_id": "101-A"},
+    ]
+    file_path = str(tmp_path / "horario.xlsx")
+
+    write_teacher_schedule_to_excel(schedule, "Ana", *resolver.resolve_schedule(schedule), file_path)
+
+    rows = list(openpyxl.load_workbook(file_path).active.iter_rows(min_row=4, values_only=True))
+    assert rows == [("Lunes", "2026-03-02", "08:00 AM", "10:00 AM", "Cálculo", "101-A"),
+                    ("Martes", "2026-03-03", "10:00 AM", "12:00 PM", "M9", "101-A")]
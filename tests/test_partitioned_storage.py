@@ -0,0 +1,76 @@
+import json
+import os
+from datetime import date, timedelta
+
+from repositories.scheduled_class_repository import ScheduledClassRepository
+
+TODAY = date.today()
+OLD_DATE = (TODAY - timedelta(days=730)).isoformat()
+RECENT_DATE = TODAY.isoformat()
+
+
+def _row(class_id, date_str, teacher_id="T1"):
+    return [class_id, date_str, "08:00", "10:00", "M1", teacher_id, "101-A"]
+
+
+def _write_legacy_file(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([dict(zip(["id", "date", "start_time", "end_time", "subject_id", "teacher_id", "classroom_id"],
+                            _row(class_id, date_str)))
+                   for class_id, date_str in (("OLD", OLD_DATE), ("NEW", RECENT_DATE))], f)
+
+
+def test_legacy_file_is_split_by_month_and_only_the_active_period_loads(tmp_path):
+    path = str(tmp_path / "scheduled_classes.json")
+    _write_legacy_file(path)
+
+    repo = ScheduledClassRepository(path)
+
+    assert os.path.exists(path + ".migrated")
+    assert sorted(os.listdir(tmp_path / "scheduled_classes")) == sorted(
+        [OLD_DATE[:7] + ".json", RECENT_DATE[:7] + ".json"])
+    assert [c["id"] for c in repo.scheduled_classes_data] == ["NEW"]
+
+
+def test_queries_do_not_page_in_until_the_range_is_loaded(tmp_path):
+    path = str(tmp_path / "scheduled_classes.json")
+    _write_legacy_file(path)
+    repo = ScheduledClassRepository(path)
+
+    assert not repo.check_teacher_availability_conflict("T1", OLD_DATE, "09:00", "11:00")
+    assert repo.get_scheduled_classes_sorted(OLD_DATE) == []
+    assert [c["id"] for c in repo.get_scheduled_classes_by_teacher_id("T1")] == ["NEW"]
+
+    assert repo.load_date_range(OLD_DATE, OLD_DATE) == 1
+    assert repo.check_teacher_availability_conflict("T1", OLD_DATE, "09:00", "11:00")
+    assert [c["id"] for c in repo.get_scheduled_classes_by_teacher_id("T1", OLD_DATE, OLD_DATE)] == ["OLD"]
+
+
+def test_moving_a_class_to_another_month_rewrites_both_files(tmp_path):
+    path = str(tmp_path / "scheduled_classes.json")
+    repo = ScheduledClassRepository(path)
+    repo.add_scheduled_class(_row("C1", RECENT_DATE))
+
+    assert repo.update_scheduled_class("C1", _row("C1", OLD_DATE))
+
+    reloaded = ScheduledClassRepository(path)
+    assert reloaded.scheduled_classes_data == []
+    reloaded.load_date_range()
+    assert reloaded.get_scheduled_class_by_id("C1") == _row("C1", OLD_DATE)
+
+
+def test_rolled_back_batch_forgets_the_months_it_paged_in(tmp_path):
+    path = str(tmp_path / "scheduled_classes.json")
+    _write_legacy_file(path)
+    repo = ScheduledClassRepository(path)
+
+    try:
+        with repo.batch():
+            repo.add_scheduled_class(_row("C2", OLD_DATE, "T2"))
+            raise RuntimeError
+    except RuntimeError:
+        pass
+
+    assert [c["id"] for c in repo.scheduled_classes_data] == ["NEW"]
+    repo.load_date_range()
+    assert sorted(c["id"] for c in repo.scheduled_classes_data) == ["NEW", "OLD"]
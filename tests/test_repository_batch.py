@@ -0,0 +1,59 @@
+import pytest
+
+from repositories.classroom_repository import ClassroomRepository
+from repositories.teacher_repository import TeacherRepository
+
+
+@pytest.fixture
+def teacher_repo(tmp_path):
+    repo = TeacherRepository(str(tmp_path / "teachers.json"))
+    repo.add_teacher(["1", "Ana", "Pérez", {"Lunes": ["Mañana"]}])
+    repo.add_teacher(["2", "Luis", "Gómez", {}])
+    return repo
+
+
+def test_batch_writes_once_on_exit(teacher_repo, monkeypatch):
+    writes = []
+    save_all = teacher_repo.storage.save_all
+    monkeypatch.setattr(teacher_repo.storage, "save_all", lambda records: writes.append(1) or save_all(records))
+
+    with teacher_repo.batch():
+        teacher_repo.add_teacher(["3", "Eva", "Ruiz", {}])
+        teacher_repo.delete_teacher("2")
+
+    assert len(writes) == 1
+    reloaded = TeacherRepository(teacher_repo.filepath)
+    assert [t[0] for t in reloaded.get_all_teachers()] == ["1", "3"]
+
+
+def test_batch_rollback_restores_records_indexes_and_file(teacher_repo):
+    revision = teacher_repo.revision
+
+    with pytest.raises(RuntimeError):
+        with teacher_repo.batch():
+            teacher_repo.add_teacher(["3", "Eva", "Ruiz", {}])
+            teacher_repo.update_teacher("1", ["1", "Ana María", "Pérez", {"Martes": ["Noche"]}])
+            teacher_repo.delete_teacher("2")
+            raise RuntimeError
+
+    assert teacher_repo.get_all_teachers() == [
+        ["1", "Ana", "Pérez", {"Lunes": ["Mañana"]}], ["2", "Luis", "Gómez", {}]]
+    assert not teacher_repo.teacher_id_exists("3")
+    assert teacher_repo.is_available("1", "2026-03-02", "08:00", "10:00")
+    assert teacher_repo.revision > revision
+    assert TeacherRepository(teacher_repo.filepath).get_all_teachers() == teacher_repo.get_all_teachers()
+
+
+def test_rollback_restores_a_record_updated_twice(tmp_path):
+    repo = ClassroomRepository(str(tmp_path / "classrooms.json"))
+    repo.add_classroom(["101", "A", 30, False])
+
+    with pytest.raises(RuntimeError):
+        with repo.batch():
+            repo.update_classroom("101", "A", ["102", "A", 40, False])
+            repo.update_classroom("102", "A", ["103", "B", 50, True])
+            raise RuntimeError
+
+    assert repo.classroom_exists("101", "A")
+    assert not repo.classroom_exists("103", "B")
+    assert repo.get_all_classrooms() == [["101", "A", 30, False]]
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from repositories.scheduled_class_repository import ScheduledClassRepository, occupancy_mask
+
+DATES = ["2026-03-02", "2026-03-03", "2026-03-04"]
+TEACHERS = ["T1", "T2", "T3"]
+ROOMS = ["101-A", "102-A"]
+
+
+def _time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _random_class(rng, class_id):
+    # Minutos sueltos (no solo cuartos de hora): ejercitan la revisión del índice tras la máscara
+    start = rng.randrange(7 * 60, 20 * 60, rng.choice((5, 15, 30)))
+    end = start + rng.choice((20, 45, 60, 90, 120))
+    return [class_id, rng.choice(DATES), _time(start), _time(end), "M1", rng.choice(TEACHERS), rng.choice(ROOMS)]
+
+
+def _apply_random_change(rng, repo, model, next_id):
+    """Añade, edita (fecha, profesor, salón u horas) o elimina una clase en el repositorio y en el modelo."""
+    action = rng.random()
+    if action < 0.45 or not model:
+        details = _random_class(rng, f"C{next_id}")
+        assert repo.add_scheduled_class(details)
+        model[details[0]] = details
+    elif action < 0.8:
+        class_id = rng.choice(sorted(model))
+        details = list(model[class_id])
+        changed = _random_class(rng, class_id)
+        for field in rng.sample(range(1, 7), rng.randint(1, 3)):
+            details[field] = changed[field]
+        if details[2] >= details[3]:
+            details[2], details[3] = changed[2], changed[3]
+        assert repo.update_scheduled_class(class_id, details)
+        model[class_id] = details
+    else:
+        class_id = rng.choice(sorted(model))
+        assert repo.delete_scheduled_class(class_id)
+        del model[class_id]
+
+
+def _minutes(time_str):
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _brute_force_conflict(model, field, resource_id, date_str, start, end, excluding=None):
+    return any(details[field] == resource_id and details[1] == date_str and class_id != excluding
+               and max(start, _minutes(details[2])) < min(end, _minutes(details[3]))
+               for class_id, details in model.items())
+
+
+def _assert_conflicts_match(rng, repo, model):
+    for _ in range(60):
+        date_str = rng.choice(DATES)
+        start = rng.randrange(7 * 60, 21 * 60, 5)
+        end = start + rng.choice((10, 30, 60, 150))
+        excluding = rng.choice(sorted(model)) if model and rng.random() < 0.3 else None
+        teacher_id, room_id = rng.choice(TEACHERS), rng.choice(ROOMS)
+        assert repo.check_teacher_availability_conflict(
+            teacher_id, date_str, _time(start), _time(end), excluding) == \
+            _brute_force_conflict(model, 5, teacher_id, date_str, start, end, excluding)
+        assert repo.check_classroom_availability_conflict(
+            room_id, date_str, _time(start), _time(end), excluding) == \
+            _brute_force_conflict(model, 6, room_id, date_str, start, end, excluding)
+
+
+def _brute_force_mask(model, field, resource_id, date_str, excluding=None):
+    mask = 0
+    for class_id, details in model.items():
+        if details[field] == resource_id and details[1] == date_str and class_id != excluding:
+            mask |= occupancy_mask(_minutes(details[2]), _minutes(details[3]))
+    return mask
+
+
+def _assert_masks_match(repo, model):
+    # Máscaras exactas, no solo sin huecos: una franja sobrante tras editar o eliminar
+    # ocultaría horas libres en la búsqueda de horas y en el generador
+    for date_str in DATES:
+        for excluding in (None, *sorted(model)[:3]):
+            for teacher_id in TEACHERS:
+                assert repo.get_teacher_day_occupancy(teacher_id, date_str, excluding) == \
+                    _brute_force_mask(model, 5, teacher_id, date_str, excluding)
+            for room_id in ROOMS:
+                assert repo.get_classroom_day_occupancy(room_id, date_str, excluding) == \
+                    _brute_force_mask(model, 6, room_id, date_str, excluding)
+
+
+def _run_random_changes(rng, repo, model, check):
+    for step in range(150):
+        if rng.random() < 0.1:
+            # Un lote que falla no debe dejar nada en los índices
+            discarded = dict(model)
+            with pytest.raises(RuntimeError):
+                with repo.batch():
+                    for extra in range(rng.randint(1, 4)):
+                        _apply_random_change(rng, repo, discarded, f"{step}x{extra}")
+                    raise RuntimeError("rollback")
+        else:
+            _apply_random_change(rng, repo, model, step)
+        check(repo, model)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_conflict_checks_match_a_brute_force_scan(class_repo, seed):
+    rng = random.Random(seed)
+    model = {}
+    _run_random_changes(rng, class_repo, model, lambda repo, model: _assert_conflicts_match(rng, repo, model))
+
+    reloaded = ScheduledClassRepository(class_repo.filepath)
+    reloaded.load_date_range(DATES[0], DATES[-1])
+    _assert_conflicts_match(rng, reloaded, model)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_occupancy_masks_match_a_brute_force_scan(class_repo, seed):
+    rng = random.Random(100 + seed)
+    model = {}
+    _run_random_changes(rng, class_repo, model, _assert_masks_match)
@@ -0,0 +1,105 @@
+from repositories.scheduled_class_repository import ScheduledClassRepository, class_occurrence_id
+from repositories.storage import StorageError
+
+
+def test_occurrence_edit_becomes_standalone_class(class_repo, weekly_series):
+    class_repo.add_class_series(weekly_series)
+    occurrence_id = class_occurrence_id("S1", "2026-03-09")
+
+    assert class_repo.update_scheduled_class(
+        occurrence_id, [occurrence_id, "2026-03-09", "11:00", "13:00", "M1", "T1", "101-A"])
+
+    assert class_repo.get_class_series_by_id("S1")[9] == ["2026-03-09"]
+    assert class_repo.get_scheduled_class_by_id(occurrence_id)[2] == "11:00"
+
+
+def test_rejected_occurrence_edit_leaves_series_unchanged(class_repo, weekly_series, monkeypatch):
+    class_repo.add_class_series(weekly_series)
+    class_repo.add_scheduled_class(["C1", "2026-03-09", "11:00", "13:00", "M2", "T1", "102-A"])
+    series_before = class_repo.get_class_series_by_id("S1")
+    occurrence_id = class_occurrence_id("S1", "2026-03-09")
+    # La nueva clase choca con C1 (mismo profesor y hora) y su alta se rechaza
+    monkeypatch.setattr(class_repo, "add_scheduled_class", lambda details: False)
+
+    assert not class_repo.update_scheduled_class(
+        occurrence_id, [occurrence_id, "2026-03-09", "11:00", "13:00", "M1", "T1", "101-A"])
+
+    assert class_repo.get_class_series_by_id("S1") == series_before
+    assert class_repo.scheduled_class_id_exists(occurrence_id)
+    assert class_repo.check_teacher_availability_conflict("T1", "2026-03-09", "08:30", "09:00")
+    reloaded = ScheduledClassRepository(class_repo.filepath)
+    assert reloaded.get_class_series_by_id("S1") == series_before
+
+
+def test_failed_class_write_leaves_series_file_unchanged(class_repo, weekly_series, monkeypatch):
+    class_repo.add_class_series(weekly_series)
+    with open(class_repo.series_storage.filepath, "rb") as f:
+        series_file_before = f.read()
+    occurrence_id = class_occurrence_id("S1", "2026-03-09")
+
+    def fail_write(records):
+        raise StorageError("disk full")
+
+    monkeypatch.setattr(class_repo.storage, "_write_dirty", fail_write)
+
+    assert not class_repo.update_scheduled_class(
+        occurrence_id, [occurrence_id, "2026-03-09", "11:00", "13:00", "M1", "T1", "101-A"])
+
+    with open(class_repo.series_storage.filepath, "rb") as f:
+        assert f.read() == series_file_before
+    assert class_repo.get_class_series_by_id("S1")[9] == []
+    assert class_repo.check_teacher_availability_conflict("T1", "2026-03-09", "08:30", "09:00")
+    reloaded = ScheduledClassRepository(class_repo.filepath)
+    assert reloaded.scheduled_class_id_exists(occurrence_id)
+    assert reloaded.get_scheduled_class_by_id(occurrence_id)[2] == "08:00"
+
+
+def test_series_expands_lazily_within_the_window(class_repo, weekly_series):
+    class_repo.add_class_series(weekly_series)
+
+    occurrences = class_repo.expand_class_series("2026-03-09", "2026-03-23")
+
+    assert [c["date"] for c in occurrences] == ["2026-03-09", "2026-03-16", "2026-03-23"]
+    assert next(class_repo.expand_class_series())["id"] == class_occurrence_id("S1", "2026-03-02")
+
+
+def test_series_every_other_week(class_repo, weekly_series):
+    class_repo.add_class_series(weekly_series, interval_weeks=2)
+
+    assert [c["date"] for c in class_repo.expand_class_series()] == ["2026-03-02", "2026-03-16", "2026-03-30"]
+    assert not class_repo.scheduled_class_id_exists(class_occurrence_id("S1", "2026-03-09"))
+
+
+def test_cancelled_occurrence_frees_its_slot(class_repo, weekly_series):
+    class_repo.add_class_series(weekly_series)
+    occurrence_id = class_occurrence_id("S1", "2026-03-16")
+    assert class_repo.check_classroom_availability_conflict("101-A", "2026-03-16", "09:00", "11:00")
+
+    assert class_repo.delete_scheduled_class(occurrence_id)
+
+    assert class_repo.get_class_series_by_id("S1")[9] == ["2026-03-16"]
+    assert not class_repo.scheduled_class_id_exists(occurrence_id)
+    assert not class_repo.check_classroom_availability_conflict("101-A", "2026-03-16", "09:00", "11:00")
+    assert "2026-03-16" not in [c[1] for c in class_repo.get_scheduled_classes_sorted()]
+    assert not class_repo.delete_scheduled_class(occurrence_id)
+
+
+def test_series_conflicts_are_found_per_date(class_repo, weekly_series):
+    class_repo.add_class_series(weekly_series)
+    class_repo.add_scheduled_class(["C1", "2026-04-07", "09:00", "10:00", "M2", "T2", "102-A"])
+
+    conflicts = class_repo.find_class_series_conflicts(
+        "T1", "102-A", "2026-03-03", "2026-04-14", "09:00", "11:00")
+
+    assert conflicts == ["2026-04-07"]
+    assert class_repo.find_class_series_conflicts(
+        "T1", "101-A", "2026-03-02", "2026-03-30", "08:00", "10:00", excluding_series_id="S1") == []
+
+
+def test_series_survive_a_reload(class_repo, weekly_series):
+    class_repo.add_class_series(weekly_series, exceptions=["2026-03-09"])
+
+    reloaded = ScheduledClassRepository(class_repo.filepath)
+
+    assert reloaded.get_all_class_series() == class_repo.get_all_class_series()
+    assert len(list(reloaded.expand_class_series())) == 4
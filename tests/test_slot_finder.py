@@ -0,0 +1,51 @@
+from repositories.teacher_repository import compile_availability_mask
+from scheduling.slot_finder import find_free_slots
+from scheduling.common import DAY_END_HOUR, DAY_START_HOUR
+
+MONDAY = "2026-03-02"
+CLASSROOMS = [{"number": "101", "block": "A", "capacity": 30, "is_lab": False},
+              {"number": "102", "block": "A", "capacity": 20, "is_lab": True},
+              {"number": "103", "block": "A", "capacity": 40, "is_lab": False}]
+
+
+def _hours(slots):
+    return [hour for hour, _ in slots]
+
+
+def test_every_start_hour_is_free_on_an_empty_day(class_repo):
+    slots = find_free_slots(class_repo, CLASSROOMS, "T1", 2, False, MONDAY)
+
+    assert _hours(slots) == [f"{h:02d}:00" for h in range(DAY_START_HOUR, DAY_END_HOUR - 1)]
+    # Primero los salones que no son laboratorio; entre ellos, el de menor capacidad
+    assert slots[0][1] == ["101-A", "103-A", "102-A"]
+
+
+def test_teacher_classes_and_lab_requirement_narrow_the_slots(class_repo):
+    class_repo.add_scheduled_class(["C1", MONDAY, "08:00", "10:00", "M1", "T1", "103-A"])
+
+    slots = dict(find_free_slots(class_repo, CLASSROOMS, "T1", 2, True, MONDAY))
+
+    assert "07:00" not in slots and "09:00" not in slots
+    assert slots["10:00"] == ["102-A"]
+    assert "08:00" in dict(find_free_slots(class_repo, CLASSROOMS, "T1", 2, True, MONDAY,
+                                           excluding_class_id="C1"))
+
+
+def test_best_fit_room_leaves_the_smallest_gap(class_repo):
+    class_repo.add_scheduled_class(["C1", MONDAY, "07:00", "10:00", "M1", "T2", "101-A"])
+    class_repo.add_scheduled_class(["C2", MONDAY, "12:00", "13:00", "M1", "T3", "103-A"])
+
+    slots = dict(find_free_slots(class_repo, CLASSROOMS, "T1", 2, False, MONDAY))
+
+    # De 10:00 a 12:00 el salón 103-A queda justo entre sus dos clases; 101-A dejaría un hueco suelto
+    assert slots["10:00"][:2] == ["103-A", "101-A"]
+    assert slots["07:00"] == ["103-A", "102-A"]
+
+
+def test_only_hours_inside_the_teacher_availability(class_repo):
+    mask = compile_availability_mask({"Lunes": ["Mañana"]})
+
+    slots = find_free_slots(class_repo, CLASSROOMS, "T1", 2, False, MONDAY, availability_mask=mask)
+
+    assert _hours(slots) == ["07:00", "08:00", "09:00", "10:00"]
+    assert find_free_slots(class_repo, CLASSROOMS, "T1", 2, False, "2026-03-03", availability_mask=mask) == []
@@ -0,0 +1,165 @@
+import os
+import threading
+
+import pytest
+
+from repositories.storage import JournaledJsonStorage, JsonFileStorage, SqliteStorage, StorageError
+from repositories.teacher_repository import TeacherRepository
+
+
+@pytest.fixture
+def sqlite_teacher_repo(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "eduscheduler.db"), "teachers", TeacherRepository._storage_key)
+    return TeacherRepository(str(tmp_path / "teachers.json"), storage=storage)
+
+
+def test_sqlite_write_error_reaches_the_caller(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "eduscheduler.db"), "teachers", TeacherRepository._storage_key)
+    storage.connection.close()
+
+    with pytest.raises(StorageError):
+        storage.upsert({"id_card": "1"})
+
+
+def test_failed_sqlite_write_returns_false_and_restores_memory(sqlite_teacher_repo):
+    sqlite_teacher_repo.add_teacher(["1", "Ana", "Pérez", {}])
+    sqlite_teacher_repo.storage.connection.close()
+
+    assert not sqlite_teacher_repo.add_teacher(["2", "Luis", "Gómez", {}])
+    assert not sqlite_teacher_repo.update_teacher("1", ["1", "Ana María", "Pérez", {}])
+    assert not sqlite_teacher_repo.delete_teacher("1")
+
+    assert sqlite_teacher_repo.get_all_teachers() == [["1", "Ana", "Pérez", {}]]
+    assert not sqlite_teacher_repo.teacher_id_exists("2")
+
+
+def test_failed_batch_commit_rolls_back(sqlite_teacher_repo):
+    sqlite_teacher_repo.add_teacher(["1", "Ana", "Pérez", {}])
+    sqlite_teacher_repo.storage.connection.close()
+
+    with pytest.raises(StorageError):
+        with sqlite_teacher_repo.batch():
+            sqlite_teacher_repo.add_teacher(["2", "Luis", "Gómez", {}])
+            sqlite_teacher_repo.update_teacher("1", ["1", "Ana María", "Pérez", {}])
+
+    assert sqlite_teacher_repo.get_all_teachers() == [["1", "Ana", "Pérez", {}]]
+
+
+def test_sqlite_repository_writes_from_another_thread(tmp_path):
+    db_path = str(tmp_path / "eduscheduler.db")
+    loaded = []
+    # Igual que RepositoryRegistry.load_all(): el repositorio se crea en un hilo de trabajo
+    loader = threading.Thread(target=lambda: loaded.append(TeacherRepository(
+        str(tmp_path / "teachers.json"),
+        storage=SqliteStorage(db_path, "teachers", TeacherRepository._storage_key))))
+    loader.start()
+    loader.join()
+    repo = loaded[0]
+
+    assert repo.add_teacher(["1", "Ana", "Pérez", {}])
+    assert repo.update_teacher("1", ["1", "Ana María", "Pérez", {}])
+
+    reopened = SqliteStorage(db_path, "teachers", TeacherRepository._storage_key)
+    assert reopened.load() == [{"id_card": "1", "first_name": "Ana María", "last_name": "Pérez",
+                                "availability": {}}]
+
+
+def _key(record):
+    return str(record["id"])
+
+
+def test_json_storage_round_trip_keeps_a_backup(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = JsonFileStorage(path, _key)
+    storage.save_all([{"id": "1"}])
+    storage.save_all([{"id": "1"}, {"id": "2"}])
+
+    assert JsonFileStorage(path, _key).load() == [{"id": "1"}, {"id": "2"}]
+    assert JsonFileStorage(path + ".bak", _key).load() == [{"id": "1"}]
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_json_storage_falls_back_to_backup_when_file_is_corrupt(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = JsonFileStorage(path, _key)
+    storage.save_all([{"id": "1"}])
+    storage.save_all([{"id": "1"}, {"id": "2"}])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('[{"id": ')  # Escritura interrumpida
+
+    assert JsonFileStorage(path, _key).load() == [{"id": "1"}]
+
+
+def test_journal_replays_mutations_over_the_snapshot(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = JournaledJsonStorage(path, _key)
+    records = [{"id": "1", "v": 1}, {"id": "2", "v": 1}]
+    storage.save_all(records)
+    records[0] = {"id": "1", "v": 2}
+    storage.upsert(records[0], records)
+    records.append({"id": "3", "v": 1})
+    storage.upsert(records[2], records)
+    renamed = {"id": "4", "v": 1}
+    records[1] = renamed
+    storage.upsert(renamed, records, previous_key="2")
+    deleted = records.pop(2)
+    storage.delete(deleted, records)
+
+    assert os.path.getsize(path + ".journal") > 0
+    assert JournaledJsonStorage(path, _key).load() == [{"id": "1", "v": 2}, {"id": "4", "v": 1}]
+
+
+def test_journal_compacts_past_the_threshold(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = JournaledJsonStorage(path, _key, compact_threshold=200)
+    records = []
+    for i in range(10):
+        records.append({"id": str(i), "text": "x" * 20})
+        storage.upsert(records[-1], records)
+
+    assert not os.path.exists(path + ".journal") or os.path.getsize(path + ".journal") < 200
+    snapshot = JsonFileStorage(path, _key).load()
+    assert snapshot and snapshot == records[:len(snapshot)]
+    assert JournaledJsonStorage(path, _key).load() == records
+
+
+def test_journal_ignores_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = JournaledJsonStorage(path, _key)
+    records = [{"id": "1"}]
+    storage.upsert(records[0], records)
+    with open(path + ".journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "upsert", "key": "2", "rec')
+
+    assert JournaledJsonStorage(path, _key).load() == [{"id": "1"}]
+
+
+def test_sqlite_storage_row_writes(tmp_path):
+    db_path = str(tmp_path / "eduscheduler.db")
+    storage = SqliteStorage(db_path, "data", _key)
+    storage.upsert({"id": "1", "v": 1})
+    storage.upsert({"id": "2", "v": 1})
+    storage.upsert({"id": "1", "v": 2})
+    storage.upsert({"id": "3", "v": 1}, previous_key="2")
+    storage.delete({"id": "1"})
+
+    assert storage.count() == 1
+    assert SqliteStorage(db_path, "data", _key).load() == [{"id": "3", "v": 1}]
+
+
+def test_sqlite_batch_commits_in_one_transaction_or_not_at_all(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "eduscheduler.db"), "data", _key)
+    storage.begin_batch()
+    storage.upsert({"id": "1"})
+    storage.upsert({"id": "2"})
+    assert storage.count() == 0
+    storage.commit_batch()
+    assert storage.count() == 2
+
+    storage.begin_batch()
+    storage.delete({"id": "1"})
+    storage.rollback_batch()
+    assert storage.load() == [{"id": "1"}, {"id": "2"}]
+
+    storage.save_all([{"id": "9"}])
+    assert storage.load() == [{"id": "9"}]
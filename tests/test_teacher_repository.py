@@ -0,0 +1,24 @@
+from repositories.teacher_repository import TeacherRepository, compile_availability_mask
+from scheduling.conflict_audit import audit_scheduled_classes
+
+
+def test_availability_limits_classes_to_registered_slots(tmp_path):
+    repo = TeacherRepository(str(tmp_path / "teachers.json"))
+    repo.add_teacher(["1", "Ana", "Pérez", {"Lunes": ["Mañana"]}])
+
+    assert repo.is_available("1", "2026-03-02", "08:00", "10:00")
+    assert not repo.is_available("1", "2026-03-02", "11:00", "13:00")
+    assert not repo.is_available("1", "2026-03-03", "08:00", "10:00")
+
+
+def test_empty_availability_is_unrestricted(tmp_path):
+    repo = TeacherRepository(str(tmp_path / "teachers.json"))
+    repo.add_teacher(["1", "Ana", "Pérez", {}])
+
+    assert repo.is_available("1", "2026-03-08", "06:00", "23:00")
+    assert compile_availability_mask({"Lunes": []}) == compile_availability_mask(None)
+    report = audit_scheduled_classes(
+        [{"id": "C1", "date": "2026-03-02", "start_time": "20:00", "end_time": "22:00",
+          "subject_id": "M1", "teacher_id": "1", "classroom_id": "101-A"}],
+        [{"id_card": "1", "availability": {}}], [{"id": "M1"}], [{"number": "101", "block": "A"}])
+    assert report["outside_availability"] == []
@@ -0,0 +1,140 @@
+from datetime import date
+
+from repositories.scheduled_class_repository import class_occurrence_id
+from scheduling.timetable_generator import build_timetable, save_timetable
+
+MONDAY = date(2026, 3, 2)
+SATURDAY = date(2026, 3, 7)
+
+
+def _teacher(id_card, availability=None):
+    return {"id_card": id_card, "first_name": "Nombre", "last_name": id_card, "availability": availability or {}}
+
+
+def _subject(subject_id, teacher_id, hours=2, lab=False, time_slot="Diurna"):
+    return {"id": subject_id, "name": subject_id, "intensity_hours": hours, "requires_lab": lab,
+            "assigned_teacher_id": teacher_id, "time_slot": time_slot}
+
+
+def _room(number, capacity=30, is_lab=False):
+    return {"number": number, "block": "A", "capacity": capacity, "is_lab": is_lab}
+
+
+def _hour(time_str):
+    return int(time_str[:2])
+
+
+def _assert_conflict_free(result, subjects):
+    teacher_of = {s["id"]: s["assigned_teacher_id"] for s in subjects}
+    placed = [(subject_id, day, _hour(start), _hour(end), room)
+              for subject_id, (day, start, end, room) in result["placements"].items()]
+    for i, (a, day_a, start_a, end_a, room_a) in enumerate(placed):
+        for b, day_b, start_b, end_b, room_b in placed[i + 1:]:
+            if day_a == day_b and start_a < end_b and start_b < end_a:
+                assert room_a != room_b, (a, b)
+                assert teacher_of[a] != teacher_of[b], (a, b)
+
+
+def test_timetable_has_no_teacher_or_room_conflicts():
+    teachers = [_teacher(f"T{t}") for t in range(3)]
+    subjects = [_subject(f"M{t}{n}", f"T{t}", hours=3) for t in range(3) for n in range(4)]
+    rooms = [_room("101"), _room("102")]
+
+    result = build_timetable(teachers, subjects, rooms, [], MONDAY, SATURDAY)
+
+    assert result["unscheduled"] == {}
+    assert len(result["placements"]) == len(subjects) == len(result["series"])
+    assert result["session_count"] == len(subjects)
+    _assert_conflict_free(result, subjects)
+
+
+def test_lab_subjects_get_labs_and_time_slots_are_respected():
+    teachers = [_teacher("T1")]
+    subjects = [_subject("LAB", "T1", lab=True), _subject("NOCHE", "T1", time_slot="Nocturna"),
+                _subject("DIA", "T1", hours=4)]
+    rooms = [_room("101"), _room("LAB1", is_lab=True)]
+
+    placements = build_timetable(teachers, subjects, rooms, [], MONDAY, SATURDAY)["placements"]
+
+    assert placements["LAB"][3] == "LAB1-A"
+    assert placements["DIA"][3] == "101-A"
+    assert _hour(placements["NOCHE"][1]) >= 18 and _hour(placements["NOCHE"][2]) <= 22
+    assert _hour(placements["DIA"][2]) <= 18 and _hour(placements["LAB"][2]) <= 18
+
+
+def test_subjects_stay_within_teacher_availability():
+    teachers = [_teacher("T1", {"Martes": ["Tarde"]})]
+    subjects = [_subject("M1", "T1", hours=3), _subject("M2", "T1", hours=3)]
+
+    result = build_timetable(teachers, subjects, [_room("101")], [], MONDAY, SATURDAY)
+
+    assert sorted(result["placements"].values()) == [
+        ("Martes", "12:00", "15:00", "101-A"), ("Martes", "15:00", "18:00", "101-A")]
+
+
+def test_node_limit_keeps_the_partial_solution():
+    teachers = [_teacher("T1")]
+    subjects = [_subject(f"M{n}", "T1") for n in range(3)]
+
+    limited = build_timetable(teachers, subjects, [_room("101")], [], MONDAY, SATURDAY, node_limit=1)
+    full = build_timetable(teachers, subjects, [_room("101")], [], MONDAY, SATURDAY)
+
+    assert len(limited["placements"]) == 1
+    assert set(limited["unscheduled"].values()) == {"No se encontró un hueco sin conflictos con las demás materias."}
+    assert len(full["placements"]) == 3 and full["unscheduled"] == {}
+
+
+def test_unscheduled_subjects_report_why():
+    teachers = [_teacher("T1"), _teacher("T2", {"Lunes": ["Noche"]})]
+    subjects = [_subject("SIN_PROFESOR", None), _subject("PROFESOR_INEXISTENTE", "T9"),
+                _subject("SIN_HORAS", "T1", hours=0), _subject("LAB", "T1", lab=True),
+                _subject("FUERA_DE_FRANJA", "T2"), _subject("PROGRAMADA", "T1")]
+    scheduled = [{"id": "C1", "date": "2026-03-03", "start_time": "08:00", "end_time": "10:00",
+                  "subject_id": "PROGRAMADA", "teacher_id": "T1", "classroom_id": "101-A"}]
+
+    result = build_timetable(teachers, subjects, [_room("101")], scheduled, MONDAY, SATURDAY)
+
+    assert result["unscheduled"] == {
+        "SIN_PROFESOR": "La materia no tiene profesor asignado.",
+        "PROFESOR_INEXISTENTE": "El profesor asignado no existe.",
+        "SIN_HORAS": "La intensidad horaria no es válida.",
+        "LAB": "No hay salones de laboratorio.",
+        "FUERA_DE_FRANJA": "No hay horas libres dentro de la franja de la materia y la disponibilidad del profesor.",
+    }
+    assert result["already_scheduled"] == ["PROGRAMADA"]
+    assert result["series"] == []
+
+
+def test_existing_classes_are_treated_as_busy():
+    scheduled = [{"id": "C1", "date": "2026-03-04", "start_time": "07:00", "end_time": "18:00",
+                  "subject_id": "OTRA", "teacher_id": "T1", "classroom_id": "101-A"}]
+
+    result = build_timetable([_teacher("T1", {"Miércoles": ["Mañana", "Tarde"]})], [_subject("M1", "T1")],
+                             [_room("101")], scheduled, MONDAY, SATURDAY)
+
+    assert "M1" in result["unscheduled"]
+
+
+def test_save_timetable_skips_dates_that_now_conflict(class_repo):
+    teachers = [_teacher("T1", {"Lunes": ["Mañana"]})]
+    result = build_timetable(teachers, [_subject("M1", "T1")], [_room("101")], [], MONDAY, date(2026, 3, 21))
+    series_id, first_date, last_date, start_time, end_time = result["series"][0][:5]
+    assert (first_date, last_date) == ("2026-03-02", "2026-03-16")
+    # Después de calcular el horario, alguien programa al mismo profesor el segundo lunes
+    class_repo.add_scheduled_class(["C1", "2026-03-09", start_time, end_time, "OTRA", "T1", "102-A"])
+
+    assert save_timetable(class_repo, result["series"]) == (2, 1)
+
+    assert class_repo.get_class_series_by_id(series_id)[9] == ["2026-03-09"]
+    assert not class_repo.scheduled_class_id_exists(class_occurrence_id(series_id, "2026-03-09"))
+
+
+def test_save_timetable_drops_series_that_conflict_on_every_date(class_repo):
+    result = build_timetable([_teacher("T1", {"Lunes": ["Mañana"]})], [_subject("M1", "T1")],
+                             [_room("101")], [], MONDAY, SATURDAY)
+    series_id, first_date, _, start_time, end_time = result["series"][0][:5]
+    class_repo.add_scheduled_class(["C1", first_date, start_time, end_time, "OTRA", "T2", "101-A"])
+
+    assert save_timetable(class_repo, result["series"]) == (0, 1)
+
+    assert class_repo.get_class_series_by_id(series_id) is None
@@ -0,0 +1,97 @@
+import random
+
+from ui.treeview_sync import SincronizadorTreeview
+
+
+class ArbolFalso:
+    """Sustituto de un ttk.Treeview plano con las operaciones que usa SincronizadorTreeview."""
+
+    def __init__(self):
+        self.filas = {}
+        self.orden = []
+
+    def get_children(self, item=""):
+        return tuple(self.orden)
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        assert iid not in self.filas
+        self.filas[iid] = (tuple(values), tuple(tags))
+        self.orden.insert(len(self.orden) if index == "end" else index, iid)
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.filas[iid]
+            self.orden.remove(iid)
+
+    def item(self, iid, values=(), tags=()):
+        self.filas[iid] = (tuple(values), tuple(tags))
+
+    def detach(self, iid):
+        self.orden.remove(iid)
+
+    def move(self, iid, parent, index):
+        if iid in self.orden:
+            self.orden.remove(iid)
+        self.orden.insert(index, iid)
+
+    def index(self, iid):
+        return self.orden.index(iid)
+
+    def contenido(self):
+        return [(iid, self.filas[iid][0], self.filas[iid][1][0]) for iid in self.orden]
+
+
+def _esperado(filas, inicio=0):
+    return [(iid, tuple(valores), "par" if (inicio + i) % 2 == 0 else "impar")
+            for i, (iid, valores) in enumerate(filas)]
+
+
+def test_only_the_differences_are_applied():
+    arbol = ArbolFalso()
+    sincronizador = SincronizadorTreeview(arbol)
+    filas = [(str(i), (f"fila {i}",)) for i in range(6)]
+    assert sincronizador.sincronizar(filas)["insertadas"] == 6
+
+    nuevas = [filas[0], ("2", ("fila 2 editada",)), filas[3], filas[1], ("9", ("nueva",)), filas[5]]
+    conteo = sincronizador.sincronizar(nuevas)
+
+    assert arbol.contenido() == _esperado(nuevas)
+    assert conteo["insertadas"] == 1
+    assert conteo["eliminadas"] == 1
+    assert conteo["movidas"] == 1
+    assert sincronizador.contiene("9") and not sincronizador.contiene("4")
+
+
+def test_unchanged_rows_cost_nothing():
+    arbol = ArbolFalso()
+    sincronizador = SincronizadorTreeview(arbol)
+    filas = [(str(i), (i,)) for i in range(50)]
+    sincronizador.sincronizar(filas)
+
+    assert sincronizador.sincronizar(filas) == {"insertadas": 0, "eliminadas": 0, "actualizadas": 0, "movidas": 0}
+
+
+def test_window_start_fixes_the_row_parity():
+    arbol = ArbolFalso()
+    sincronizador = SincronizadorTreeview(arbol)
+    filas = [(str(i), (i,)) for i in range(4)]
+    sincronizador.sincronizar(filas, inicio=0)
+
+    sincronizador.sincronizar(filas, inicio=1)
+
+    assert arbol.contenido() == _esperado(filas, inicio=1)
+
+
+def test_random_updates_keep_the_tree_equal_to_the_rows():
+    rng = random.Random(5)
+    arbol = ArbolFalso()
+    sincronizador = SincronizadorTreeview(arbol)
+    for _ in range(100):
+        iids = rng.sample(range(40), rng.randrange(40))
+        filas = [(str(iid), (iid, rng.randrange(3))) for iid in iids]
+        sincronizador.sincronizar(filas)
+        assert arbol.contenido() == _esperado(filas)
+
+    sincronizador.reiniciar()
+    assert arbol.orden == []
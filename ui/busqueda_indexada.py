@@ -0,0 +1,89 @@
+"""
+Búsqueda en vivo para las listas de gestión: un índice de texto en minúsculas construido una
+vez por carga de datos y una llamada diferida que agrupa las pulsaciones de teclas.
+"""
+
+ESPERA_BUSQUEDA_MS = 200
+SEPARADOR_CAMPOS = "\x1f"  # No aparece en lo que se escribe en un Entry: evita coincidencias entre campos
+
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda por subcadena sobre una lista de registros. El texto buscable de cada
+    registro (sus campos en minúsculas) se calcula al reconstruir el índice, no en cada consulta.
+
+    Mientras el usuario amplía la consulta (p. ej. "ana" -> "anab"), los resultados nuevos son
+    un subconjunto de los anteriores, así que solo se revisan las coincidencias previas.
+    """
+
+    def __init__(self, campos):
+        """
+        Args:
+            campos (callable): Recibe un registro y devuelve los valores en los que se busca.
+        """
+        self.campos = campos
+        self._registros = []
+        self._textos = []
+        self._ultima_consulta = ""
+        self._ultimas_posiciones = None
+
+    def __len__(self):
+        return len(self._registros)
+
+    def reconstruir(self, registros):
+        """Indexa `registros` (en ese orden). Debe llamarse cada vez que cambian los datos."""
+        self._registros = list(registros)
+        self._textos = [
+            SEPARADOR_CAMPOS.join(str(valor).lower() for valor in self.campos(registro))
+            for registro in self._registros]
+        self._ultima_consulta = ""
+        self._ultimas_posiciones = None
+
+    def buscar(self, consulta):
+        """
+        Devuelve los registros cuyo texto contiene `consulta` (sin distinguir mayúsculas),
+        en el orden original. Con una consulta vacía devuelve todos.
+        """
+        consulta = consulta.lower()
+        if not consulta:
+            self._ultima_consulta, self._ultimas_posiciones = "", None
+            return list(self._registros)
+
+        textos = self._textos
+        if self._ultimas_posiciones is not None and self._ultima_consulta in consulta:
+            candidatas = self._ultimas_posiciones
+        else:
+            candidatas = range(len(textos))
+        posiciones = [i for i in candidatas if consulta in textos[i]]
+
+        self._ultima_consulta, self._ultimas_posiciones = consulta, posiciones
+        registros = self._registros
+        return [registros[i] for i in posiciones]
+
+
+class LlamadaDiferida:
+    """
+    Ejecuta `funcion` cuando han pasado `espera_ms` milisegundos sin nuevas peticiones
+    (p. ej. al dejar de teclear), usando el bucle de eventos de Tk.
+    """
+
+    def __init__(self, widget, funcion, espera_ms=ESPERA_BUSQUEDA_MS):
+        self.widget = widget
+        self.funcion = funcion
+        self.espera_ms = espera_ms
+        self._pendiente = None
+
+    def programar(self, *args):
+        """Reinicia la espera. Acepta y descarta los argumentos de trace_add o de un evento."""
+        self.cancelar()
+        self._pendiente = self.widget.after(self.espera_ms, self._ejecutar)
+
+    def cancelar(self):
+        """Descarta la ejecución pendiente, si la hay."""
+        if self._pendiente is not None:
+            self.widget.after_cancel(self._pendiente)
+            self._pendiente = None
+
+    def _ejecutar(self):
+        self._pendiente = None
+        self.funcion()
@@ -0,0 +1,235 @@
+"""
+Carga de datos en un hilo de trabajo con entrega por partes al hilo de Tk.
+
+Tk no es seguro entre hilos: el trabajo pesado (leer repositorios, preparar filas) se hace
+en un hilo aparte que no toca widgets, y los resultados se entregan al hilo de Tk con after().
+"""
+import queue
+import threading
+import time
+from tkinter import ttk
+
+INTERVALO_CONSULTA_MS = 30
+PRESUPUESTO_POR_CICLO_MS = 15
+
+
+class CargaEnSegundoPlano:
+    """
+    Consume un iterable de partes en un hilo de trabajo y entrega cada parte al hilo de Tk.
+    En cada ciclo de after() solo se procesan las partes que caben en un presupuesto de
+    tiempo, de modo que la interfaz sigue atendiendo eventos mientras llegan los datos.
+
+    Iniciar una carga nueva cancela la anterior: sus partes pendientes se descartan.
+    """
+
+    def __init__(self, widget, intervalo_ms=INTERVALO_CONSULTA_MS, presupuesto_ms=PRESUPUESTO_POR_CICLO_MS):
+        self.widget = widget
+        self.intervalo_ms = intervalo_ms
+        self.presupuesto_ms = presupuesto_ms
+        self._cola = queue.Queue()
+        self._generacion = 0
+        self._cancelado = None   # threading.Event de la carga en curso
+        self._callbacks = None   # (al_recibir, al_terminar, al_fallar) de la carga en curso
+        self._consulta = None    # id de after() pendiente
+
+    @property
+    def en_curso(self):
+        """Indica si hay una carga sin terminar."""
+        return self._callbacks is not None
+
+    def iniciar(self, partes, al_recibir, al_terminar=None, al_fallar=None):
+        """
+        Args:
+            partes (iterable): Normalmente un generador; se recorre en el hilo de trabajo,
+                así que no debe tocar widgets ni variables de Tk.
+            al_recibir (callable): al_recibir(parte), en el hilo de Tk, por cada parte.
+            al_terminar (callable, optional): Se llama en el hilo de Tk tras la última parte.
+            al_fallar (callable, optional): al_fallar(excepción) si el iterable lanza un error.
+                Por defecto se imprime el error.
+        """
+        self.cancelar()
+        self._generacion += 1
+        cancelado = threading.Event()
+        self._cancelado = cancelado
+        self._callbacks = (al_recibir, al_terminar, al_fallar)
+        threading.Thread(target=self._trabajar, args=(partes, self._generacion, cancelado),
+                         daemon=True).start()
+        self._programar_consulta()
+
+    def cancelar(self):
+        """Cancela la carga en curso; el hilo de trabajo se detiene antes de su siguiente parte."""
+        if self._cancelado is not None:
+            self._cancelado.set()
+            self._cancelado = None
+        self._callbacks = None
+        if self._consulta is not None:
+            self.widget.after_cancel(self._consulta)
+            self._consulta = None
+
+    def _trabajar(self, partes, generacion, cancelado):
+        """Hilo de trabajo: produce las partes y las deja en la cola."""
+        try:
+            for parte in partes:
+                if cancelado.is_set():
+                    return
+                self._cola.put((generacion, "parte", parte))
+            self._cola.put((generacion, "fin", None))
+        except Exception as e:
+            self._cola.put((generacion, "error", e))
+
+    def _programar_consulta(self):
+        if self._consulta is None and self.en_curso:
+            self._consulta = self.widget.after(self.intervalo_ms, self._consultar)
+
+    def _consultar(self):
+        """Hilo de Tk: entrega las partes recibidas hasta agotar el presupuesto del ciclo."""
+        self._consulta = None
+        limite = time.perf_counter() + self.presupuesto_ms / 1000
+        while self.en_curso and time.perf_counter() < limite:
+            try:
+                generacion, tipo, dato = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if generacion != self._generacion:
+                continue  # Parte de una carga cancelada
+            al_recibir, al_terminar, al_fallar = self._callbacks
+            if tipo == "parte":
+                al_recibir(dato)
+                continue
+            self._cancelado = None
+            self._callbacks = None
+            if tipo == "fin":
+                if al_terminar:
+                    al_terminar()
+            elif al_fallar:
+                al_fallar(dato)
+            else:
+                print(f"Error en la carga en segundo plano: {dato}")
+        self._programar_consulta()
+
+
+class ContenidoEnSegundoPlano:
+    """
+    Mixin para frames cuyo contenido puede prepararse en un hilo de trabajo. El frame define:
+
+    - REPOSITORIOS_CONTENIDO: nombres en RepositoryRegistry de los repositorios que muestra.
+    - _preparar_contenido(): se llama en el hilo de Tk (puede leer variables de Tk) y devuelve
+      un iterable de partes que se recorre en el hilo de trabajo.
+    - _recibir_contenido(parte): aplica una parte a los widgets, en el hilo de Tk.
+
+    actualizar_contenido() recorre las partes en el propio hilo de Tk (p. ej. tras guardar,
+    cuando el código siguiente necesita la lista ya cargada); actualizar_contenido_en_segundo_plano()
+    las prepara en un hilo de trabajo (al iniciar y al cambiar de vista).
+
+    El frame recuerda la revisión de sus repositorios que mostró por última vez, de modo que
+    contenido_vigente() permite saltarse la recarga si nada ha cambiado.
+    """
+
+    REPOSITORIOS_CONTENIDO = ()
+
+    def _carga_contenido(self):
+        carga = getattr(self, "_carga", None)
+        if carga is None:
+            carga = self._carga = CargaEnSegundoPlano(self)
+        return carga
+
+    def _version_contenido(self):
+        """Revisión actual de los repositorios que muestra el frame."""
+        repositorios = self.controller.repositories
+        return tuple(getattr(repositorios, nombre).revision for nombre in self.REPOSITORIOS_CONTENIDO)
+
+    def contenido_vigente(self):
+        """Indica si lo que muestra el frame corresponde a la revisión actual de sus datos."""
+        return getattr(self, "_version_mostrada", None) == self._version_contenido()
+
+    def actualizar_contenido(self):
+        """Actualiza la vista con los datos del repositorio (síncrono)."""
+        self._carga_contenido().cancelar()
+        version = self._version_contenido()
+        for parte in self._preparar_contenido():
+            self._recibir_contenido(parte)
+        self._version_mostrada = version
+        self._avisar_fin_de_carga()
+
+    def actualizar_contenido_en_segundo_plano(self, al_terminar=None):
+        """
+        Actualiza la vista preparando los datos en un hilo de trabajo. Si ya hay una carga en
+        curso de esta misma revisión (p. ej. la del precalentamiento), se espera a esa carga.
+
+        Args:
+            al_terminar (callable, optional): Se llama al terminar la carga, también si falla o
+                si otra actualización la reemplaza antes de terminar.
+        """
+        version = self._version_contenido()
+        carga = self._carga_contenido()
+        if carga.en_curso and getattr(self, "_version_en_carga", None) == version:
+            if al_terminar:
+                self._avisos_fin_de_carga.append(al_terminar)
+            return
+
+        def al_completar():
+            self._version_mostrada = version
+            self._avisar_fin_de_carga()
+
+        def al_fallar(error):
+            print(f"Error al cargar {type(self).__name__}: {error}")
+            self._avisar_fin_de_carga()
+
+        carga.cancelar()
+        self._avisar_fin_de_carga()
+        self._version_en_carga = version
+        self._avisos_fin_de_carga = [al_terminar] if al_terminar else []
+        carga.iniciar(self._preparar_contenido(), self._recibir_contenido, al_completar, al_fallar)
+
+    def _avisar_fin_de_carga(self):
+        self._version_en_carga = None
+        avisos = getattr(self, "_avisos_fin_de_carga", None) or []
+        self._avisos_fin_de_carga = []
+        for al_terminar in avisos:
+            al_terminar()
+
+
+class IndicadorCarga(ttk.Frame):
+    """
+    Barra de estado con un texto y una barra de progreso. Se muestra mientras haya alguna
+    carga registrada con mostrar() y se oculta cuando todas han llamado a ocultar().
+    """
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, padding="5 2", **kwargs)
+        self.etiqueta = ttk.Label(self, text="")
+        self.etiqueta.pack(side="left", padx=(0, 10))
+        self.barra = ttk.Progressbar(self, length=200)
+        self.barra.pack(side="left")
+        self._cargas = {}  # {clave: texto}
+        self._opciones_pack = {}
+
+    def colocar(self, **opciones_pack):
+        """Guarda las opciones de pack() con las que se muestra el indicador."""
+        self._opciones_pack = opciones_pack
+
+    def mostrar(self, clave, texto, hechos=None, total=None):
+        """
+        Registra (o actualiza) una carga. Sin `total` la barra es indeterminada.
+        """
+        self._cargas[clave] = texto
+        self.etiqueta.configure(text=texto)
+        if total:
+            if str(self.barra.cget("mode")) != "determinate":
+                self.barra.stop()
+                self.barra.configure(mode="determinate")
+            self.barra.configure(maximum=total, value=hechos or 0)
+        elif str(self.barra.cget("mode")) != "indeterminate":
+            self.barra.configure(mode="indeterminate")
+            self.barra.start(15)
+        if not self.winfo_ismapped():
+            self.pack(**self._opciones_pack)
+
+    def ocultar(self, clave):
+        """Da por terminada la carga `clave`; el indicador se oculta cuando no queda ninguna."""
+        self._cargas.pop(clave, None)
+        if self._cargas:
+            self.etiqueta.configure(text=next(reversed(self._cargas.values())))
+            return
+        self.barra.stop()
+        self.pack_forget()
@@ -8,9 +8,19 @@ try:
 except ImportError:
     TKCALENDAR_AVAILABLE = False
 
+from repositories.scheduled_class_repository import parse_date_ordinal
+from scheduling.slot_finder import find_free_slots
+from ui.carga_segundo_plano import ContenidoEnSegundoPlano
 from ui.config_ui import COLOR_FILA_PAR, COLOR_FILA_IMPAR, FUENTE_GENERAL
+from ui.treeview_virtual import TreeviewVirtual
 
-from repositories.scheduled_class_repository import ScheduledClassRepository
+# Nombres de los días indexados por date.weekday()
+DIAS_SEMANA_COMPLETA = ["Lunes", "Martes", "Miércoles",
+                        "Jueves", "Viernes", "Sábado", "Domingo"]
+# Filas de clases que se entregan al TreeView en cada parte de la carga
+FILAS_POR_PARTE = 2000
+# Horas de inicio que se ofrecen mientras no se ha elegido profesor, materia y fecha
+HORAS_INICIO_CLASE = [f"{h:02d}:00" for h in range(7, 22)]  # 7 AM a 9 PM (21:00)
 
 
 class VentanaClase(tk.Toplevel):
@@ -49,6 +59,8 @@ class VentanaClase(tk.Toplevel):
             frame_form, textvariable=self.profesor_var, width=43, state="readonly", font=FUENTE_GENERAL)
         self.profesor_combobox.grid(
             row=current_row, column=1, padx=5, pady=7, sticky="ew")
+        self.profesor_combobox.bind(
+            "<<ComboboxSelected>>", self._actualizar_horas_libres)
         # Formato: [(id_profesor, "Nombre Apellido"), ...]
         self.profesores_listos = []
         self._cargar_profesores_para_combobox()
@@ -63,7 +75,7 @@ class VentanaClase(tk.Toplevel):
         self.materia_combobox.grid(
             row=current_row, column=1, padx=5, pady=7, sticky="ew")
         self.materia_combobox.bind(
-            "<<ComboboxSelected>>", self._actualizar_hora_fin_label)
+            "<<ComboboxSelected>>", self._actualizar_horas_libres)
         # Formato: [(id_materia, nombre, intensidad, req_sistemas), ...]
         self.materias_listas = []
         self._cargar_materias_para_combobox()
@@ -106,8 +118,10 @@ class VentanaClase(tk.Toplevel):
         ttk.Label(frame_form, text="Hora Inicio:", font=FUENTE_GENERAL).grid(
             row=current_row, column=0, padx=5, pady=7, sticky="w")
         self.hora_inicio_var = tk.StringVar()
-        horas_disponibles_clase = [
-            f"{h:02d}:00" for h in range(7, 22)]  # 7 AM a 9 PM (21:00)
+        horas_disponibles_clase = HORAS_INICIO_CLASE
+        # Salones libres para cada hora de inicio, ordenados por ajuste: {"HH:MM": [id_salon, ...]}
+        # None mientras falte profesor, materia o fecha (se ofrecen todas las horas y salones)
+        self.salones_por_hora = None
 
         self.hora_inicio_combobox = ttk.Combobox(
             frame_form, textvariable=self.hora_inicio_var, values=horas_disponibles_clase,
@@ -115,7 +129,7 @@ class VentanaClase(tk.Toplevel):
         self.hora_inicio_combobox.grid(
             row=current_row, column=1, padx=5, pady=7, sticky="ew")
         self.hora_inicio_combobox.bind(
-            "<<ComboboxSelected>>", self._actualizar_hora_fin_label)
+            "<<ComboboxSelected>>", self._al_cambiar_hora_inicio)
         if horas_disponibles_clase and self.modo == "programar":
             self.hora_inicio_var.set(
                 horas_disponibles_clase[0])  # Default 07:00
@@ -164,7 +178,8 @@ class VentanaClase(tk.Toplevel):
 
             self.hora_inicio_var.set(clase_data[2])
 
-        self._actualizar_hora_fin_label()  # Calcular hora fin inicial
+        self._actualizar_horas_libres()  # Horas libres y hora fin iniciales
+        self.fecha_var.trace_add("write", self._actualizar_horas_libres)
 
         frame_botones = ttk.Frame(self, padding="15 10 10 10")
         frame_botones.pack(fill="x", side="bottom")
@@ -182,68 +197,50 @@ class VentanaClase(tk.Toplevel):
 
     def _cargar_profesores_para_combobox(self):
         self.profesores_listos = []
-        prof_frame = self.controller.frames.get('ProfesoresFrame')
-        if prof_frame and hasattr(prof_frame, 'teacher_repo'):
-            try:
-                todos_los_profesores = prof_frame.teacher_repo.get_all_teachers()
-                # Formato esperado por get_all_teachers: [[id, nombre, apellido, disponibilidad_dict], ...]
-                for p_data in todos_los_profesores:
-                    if len(p_data) >= 3:
-                        self.profesores_listos.append(
-                            (str(p_data[0]), f"{p_data[1]} {p_data[2]}"))
-                self.profesor_combobox['values'] = [
-                    display for _, display in self.profesores_listos]
-            except Exception as e:
-                print(f"Error cargando profesores en VentanaClase: {e}")
-                self.profesor_combobox['values'] = []
-        else:
+        # Repositorio compartido: no depende de que ProfesoresFrame se haya creado
+        try:
+            todos_los_profesores = self.controller.repositories.teacher_repo.get_all_teachers()
+            # Formato esperado por get_all_teachers: [[id, nombre, apellido, disponibilidad_dict], ...]
+            for p_data in todos_los_profesores:
+                if len(p_data) >= 3:
+                    self.profesores_listos.append(
+                        (str(p_data[0]), f"{p_data[1]} {p_data[2]}"))
+            self.profesor_combobox['values'] = [
+                display for _, display in self.profesores_listos]
+        except Exception as e:
+            print(f"Error cargando profesores en VentanaClase: {e}")
             self.profesor_combobox['values'] = []
-            print(
-                "Advertencia (VentanaClase): No se pudo acceder a ProfesoresFrame o su teacher_repo.")
 
     def _cargar_materias_para_combobox(self):
         self.materias_listas = []
-        mat_frame = self.controller.frames.get('MateriasFrame')
-        if mat_frame and hasattr(mat_frame, 'subject_repo'):
-            try:
-                todas_las_materias = mat_frame.subject_repo.get_all_subjects()
-                # Formato esperado: [[id, nombre, intensidad, req_sist, id_prof, franja], ...]
-                for m_data in todas_las_materias:
-                    if len(m_data) >= 4:  # id, nombre, intensidad, req_sist
-                        self.materias_listas.append((str(m_data[0]), str(
-                            m_data[1]), int(m_data[2]), bool(m_data[3])))
-                self.materia_combobox['values'] = [
-                    nombre for _, nombre, _, _ in self.materias_listas]
-            except Exception as e:
-                print(f"Error cargando materias en VentanaClase: {e}")
-                self.materia_combobox['values'] = []
-
-        else:
+        try:
+            todas_las_materias = self.controller.repositories.subject_repo.get_all_subjects()
+            # Formato esperado: [[id, nombre, intensidad, req_sist, id_prof, franja], ...]
+            for m_data in todas_las_materias:
+                if len(m_data) >= 4:  # id, nombre, intensidad, req_sist
+                    self.materias_listas.append((str(m_data[0]), str(
+                        m_data[1]), int(m_data[2]), bool(m_data[3])))
+            self.materia_combobox['values'] = [
+                nombre for _, nombre, _, _ in self.materias_listas]
+        except Exception as e:
+            print(f"Error cargando materias en VentanaClase: {e}")
             self.materia_combobox['values'] = []
-            print(
-                "Advertencia (VentanaClase): No se pudo acceder a MateriasFrame o su subject_repo.")
 
     def _cargar_salones_para_combobox(self):
         self.salones_listos = []
-        sal_frame = self.controller.frames.get('ClassroomsFrame')
-        if sal_frame and hasattr(sal_frame, 'classroom_repo'):
-            try:
-                todos_los_salones = sal_frame.classroom_repo.get_all_classrooms()
-                # Formato esperado: [[numero, bloque, capacidad, es_sistemas], ...]
-                for s_data in todos_los_salones:
-                    if len(s_data) >= 4:
-                        id_compuesto = f"{s_data[0]}-{s_data[1]}"
-                        self.salones_listos.append(
-                            (id_compuesto, int(s_data[2]), bool(s_data[3])))
-                self.salon_combobox['values'] = [
-                    display_id for display_id, _, _ in self.salones_listos]
-            except Exception as e:
-                print(f"Error cargando salones en VentanaClase: {e}")
-                self.salon_combobox['values'] = []
-        else:
+        try:
+            todos_los_salones = self.controller.repositories.classroom_repo.get_all_classrooms()
+            # Formato esperado: [[numero, bloque, capacidad, es_sistemas], ...]
+            for s_data in todos_los_salones:
+                if len(s_data) >= 4:
+                    id_compuesto = f"{s_data[0]}-{s_data[1]}"
+                    self.salones_listos.append(
+                        (id_compuesto, int(s_data[2]), bool(s_data[3])))
+            self.salon_combobox['values'] = [
+                display_id for display_id, _, _ in self.salones_listos]
+        except Exception as e:
+            print(f"Error cargando salones en VentanaClase: {e}")
             self.salon_combobox['values'] = []
-            print(
-                "Advertencia (VentanaClase): No se pudo acceder a SalonesFrame o su classroom_repo.")
 
     def _get_id_from_display(self, display_val, lista_de_tuplas, item_index_for_id=0, item_index_for_display=1):
         if not display_val:
@@ -263,6 +260,51 @@ class VentanaClase(tk.Toplevel):
                 return item_tupla[item_index_for_display]
         return None
 
+    def _actualizar_horas_libres(self, *args):
+        """
+        Con profesor, materia y fecha elegidos, ofrece solo las horas de inicio dentro de la
+        disponibilidad del profesor en que él y algún salón compatible están libres; si falta
+        alguno, todas las horas y salones.
+        """
+        id_profesor = self._get_id_from_display(self.profesor_var.get(), self.profesores_listos)
+        materia = next(
+            (m for m in self.materias_listas if m[1] == self.materia_var.get()), None)
+        fecha_str = self.fecha_var.get().strip()
+        self.salones_por_hora = None
+        if id_profesor and materia and fecha_str:
+            try:
+                datetime.strptime(fecha_str, "%Y-%m-%d")
+                repositorios = self.controller.repositories
+                # Las consultas de ocupación no leen del disco: el mes se carga aquí si hace falta
+                repositorios.scheduled_class_repo.load_date_range(fecha_str, fecha_str)
+                self.salones_por_hora = dict(find_free_slots(
+                    repositorios.scheduled_class_repo, repositorios.classroom_repo.classrooms_data,
+                    id_profesor, materia[2], materia[3], fecha_str,
+                    excluding_class_id=self.clase_original_id,
+                    availability_mask=repositorios.teacher_repo.get_availability_mask(id_profesor)))
+            except ValueError:
+                pass  # Fecha a medio escribir en el Entry de respaldo
+
+        if self.salones_por_hora is None:
+            horas = HORAS_INICIO_CLASE
+        else:
+            horas = list(self.salones_por_hora)
+        self.hora_inicio_combobox['values'] = horas
+        if self.hora_inicio_var.get() not in horas:
+            self.hora_inicio_var.set(horas[0] if horas else "")
+        self._al_cambiar_hora_inicio()
+
+    def _al_cambiar_hora_inicio(self, event=None):
+        """Ofrece los salones libres a la hora elegida (el mejor ajuste primero) y recalcula la hora fin."""
+        if self.salones_por_hora is None:
+            salones = [id_salon for id_salon, _, _ in self.salones_listos]
+        else:
+            salones = self.salones_por_hora.get(self.hora_inicio_var.get(), [])
+        self.salon_combobox['values'] = salones
+        if self.salon_var.get() not in salones:
+            self.salon_var.set(salones[0] if salones and self.salones_por_hora is not None else "")
+        self._actualizar_hora_fin_label()
+
     def _actualizar_hora_fin_label(self, event=None):
         materia_nombre_seleccionada = self.materia_var.get()
         hora_inicio_str = self.hora_inicio_var.get()
@@ -345,22 +387,30 @@ class VentanaClase(tk.Toplevel):
             self.destroy()
 
 
-class ClasesFrame(ttk.Frame):
+class ClasesFrame(ContenidoEnSegundoPlano, ttk.Frame):
     """
     Frame principal para la gestión de Clases Programadas.
     """
 
+    # Las filas muestran nombres de profesores y materias: sus cambios también recargan la vista
+    REPOSITORIOS_CONTENIDO = ("scheduled_class_repo", "teacher_repo", "subject_repo")
+
     def __init__(self, parent, controller):
         super().__init__(parent, padding="10")
         self.controller = controller
-        # Inicializar el repositorio de clases programadas
-        self.scheduled_class_repo = ScheduledClassRepository()  # <--- USA EL REPOSITORIO
+        # Repositorio de clases programadas compartido (ver RepositoryRegistry)
+        self.scheduled_class_repo = controller.repositories.scheduled_class_repo
 
         # ID de la clase seleccionada (UUID)
         self.clase_seleccionada_id_tree = None
         self.filtro_fecha_var = tk.StringVar()
         # self.clases_data_actual se llenará en actualizar_contenido
         self.clases_data_actual = []
+        # Caché de nombres visibles {id: nombre}; se invalida al editar profesores o materias
+        self._nombres_profesores = None
+        self._nombres_materias = None
+        # Caché de filas del TreeView: {fila del repositorio (tupla): fila visual (tupla)}
+        self._filas_visuales = {}
 
         frame_controles_superior = ttk.Frame(self, style="Controls.TFrame")
         frame_controles_superior.pack(pady=(0, 5), padx=0, fill="x")
@@ -418,14 +468,13 @@ class ClasesFrame(ttk.Frame):
 
         self.tree_clases.pack(expand=True, fill="both",
                               padx=0, pady=(0, 10), side="left")
-        scrollbar_clases = ttk.Scrollbar(
-            self, orient="vertical", command=self.tree_clases.yview)
-        self.tree_clases.configure(yscrollcommand=scrollbar_clases.set)
+        scrollbar_clases = ttk.Scrollbar(self, orient="vertical")
         scrollbar_clases.pack(side="right", fill="y")
+        # Lista virtual: solo las filas visibles se materializan (ver ui/treeview_virtual.py)
+        self.lista_clases = TreeviewVirtual(self.tree_clases, scrollbar_clases)
         self.tree_clases.bind("<<TreeviewSelect>>",
                               self._on_clase_seleccionada)
-
-        self.actualizar_contenido()
+        # El contenido se carga al mostrar el frame (ver Aplicacion.mostrar_frame)
 
     def _aplicar_filtro_fecha(self):
         self.actualizar_contenido()  # Llama a actualizar_contenido que ya usa el filtro
@@ -434,103 +483,134 @@ class ClasesFrame(ttk.Frame):
         self.filtro_fecha_var.set("")  # Limpiar el filtro de fecha
         self.actualizar_contenido()  # Recargar todas las clases
 
+    def _tabla_nombres_profesores(self):
+        """Devuelve {cédula: nombre visible} (hilo de Tk); se guarda hasta que se editen los profesores."""
+        if self._nombres_profesores is None:
+            # Una sola pasada sobre los profesores en lugar de una búsqueda por fila
+            self._nombres_profesores = {
+                str(t.get("id_card")): f"{t.get('first_name')} {t.get('last_name')}"
+                for t in self.controller.repositories.teacher_repo.teachers_data}
+        return self._nombres_profesores
+
+    def _tabla_nombres_materias(self):
+        """Devuelve {id: nombre} de las materias (hilo de Tk); se guarda hasta que se editen las materias."""
+        if self._nombres_materias is None:
+            self._nombres_materias = {
+                str(m.get("id")): str(m.get("name"))
+                for m in self.controller.repositories.subject_repo.subjects_data}
+        return self._nombres_materias
+
+    @staticmethod
+    def _nombre_o_desconocido(tabla, id_valor, desconocido):
+        return tabla.get(str(id_valor), desconocido) if id_valor else "N/A"
+
     def _get_nombre_profesor(self, id_profesor):
-        if not id_profesor:
-            return "N/A"
-        prof_frame = self.controller.frames.get('ProfesoresFrame')
-        if prof_frame and hasattr(prof_frame, 'teacher_repo'):
-            prof_data = prof_frame.teacher_repo.get_teacher_by_id(id_profesor)
-            return f"{prof_data[1]} {prof_data[2]}" if prof_data else "Prof. Desconocido"
-        return "Error Acceso Prof."
+        return self._nombre_o_desconocido(self._tabla_nombres_profesores(), id_profesor, "Prof. Desconocido")
 
     def _get_nombre_materia(self, id_materia):
-        if not id_materia:
-            return "N/A"
-        mat_frame = self.controller.frames.get('MateriasFrame')
-        if mat_frame and hasattr(mat_frame, 'subject_repo'):
-            mat_data = mat_frame.subject_repo.get_subject_by_id(id_materia)
-            return str(mat_data[1]) if mat_data else "Materia Desconocida"
-        return "Error Acceso Mat."
+        return self._nombre_o_desconocido(self._tabla_nombres_materias(), id_materia, "Materia Desconocida")
+
+    def actualizar_combobox_profesores(self):
+        """Llamado por ProfesoresFrame tras editar profesores: invalida los nombres en caché y refresca."""
+        self._nombres_profesores = None
+        self._filas_visuales = {}
+        # Este frame no está visible: reconstruir las filas sin bloquear la vista actual
+        self.actualizar_contenido_en_segundo_plano()
+
+    def actualizar_combobox_materias(self):
+        """Llamado por MateriasFrame tras editar materias: invalida los nombres en caché y refresca."""
+        self._nombres_materias = None
+        self._filas_visuales = {}
+        self.actualizar_contenido_en_segundo_plano()
 
     # El ID del salón ya es "numero-bloque"
     def _get_display_salon(self, id_salon_compuesto):
         return str(id_salon_compuesto) if id_salon_compuesto else "N/A"
 
-    def actualizar_contenido(self):
-        """Actualiza el TreeView con las clases, aplicando el filtro de fecha si existe."""
-        # El filtro de fecha se aplica en _cargar_clases_en_treeview
-        self._cargar_clases_en_treeview()
-        self._actualizar_estado_botones_clase()
+    def _construir_fila_visual(self, clase_row, nombres_profesores, nombres_materias):
+        """
+        Construye la tupla de valores del TreeView para una fila del repositorio.
+        Solo usa sus argumentos (no lee los repositorios): se llama desde el hilo de trabajo.
+        """
+        # clase_row: (id, fecha, hora_inicio, hora_fin, id_materia, id_profesor, id_salon_compuesto)
+        id_clase, fecha_str, hora_inicio_str, hora_fin_str, id_materia, id_profesor, id_salon_compuesto = clase_row
 
-    def _cargar_clases_en_treeview(self):
-        """Carga las clases en el TreeView, aplicando el filtro de fecha."""
-        for i in self.tree_clases.get_children():
-            self.tree_clases.delete(i)
+        try:
+            dia_semana = DIAS_SEMANA_COMPLETA[date.fromordinal(parse_date_ordinal(fecha_str)).weekday()]
+        except (TypeError, ValueError):
+            dia_semana = "N/A"
 
-        # <--- USA EL REPOSITORIO
-        todas_las_clases = self.scheduled_class_repo.get_all_scheduled_classes()
+        return (id_clase, fecha_str, dia_semana, hora_inicio_str, hora_fin_str,
+                self._nombre_o_desconocido(nombres_materias, id_materia, "Materia Desconocida"),
+                self._nombre_o_desconocido(nombres_profesores, id_profesor, "Prof. Desconocido"),
+                self._get_display_salon(id_salon_compuesto))
 
+    def _preparar_contenido(self):
+        """
+        Lee el filtro de fecha y toma una copia de las clases y de las tablas de nombres
+        (hilo de Tk); devuelve las partes de la carga, que solo dan formato a esa copia.
+        Si el filtro no es una fecha válida, no se aplica y se muestran todas.
+        """
         filtro_fecha_str = self.filtro_fecha_var.get()
-        datos_a_mostrar = todas_las_clases
-
         if filtro_fecha_str:
             try:
-                # Validar que el filtro de fecha sea válido antes de usarlo
-                datetime.strptime(filtro_fecha_str, "%Y-%m-%d")
-                datos_a_mostrar = [
-                    clase for clase in todas_las_clases if clase[1] == filtro_fecha_str]
-            except ValueError:
-                # Si el filtro no es una fecha válida, no se aplica o se muestra un error
-                # Aquí optamos por no filtrar si el formato es incorrecto, mostrando todas.
+                parse_date_ordinal(filtro_fecha_str)
+            except (TypeError, ValueError):
                 # Podrías añadir un messagebox si prefieres.
-                print(f"Advertencia: Filtro de fecha '{
-                      filtro_fecha_str}' no es válido. Mostrando todas las clases.")
+                print(f"Advertencia: Filtro de fecha '{filtro_fecha_str}' no es válido. Mostrando todas las clases.")
                 self.filtro_fecha_var.set("")  # Limpiar filtro inválido
-                # datos_a_mostrar ya es todas_las_clases
-
-        dias_es = ["Lunes", "Martes", "Miércoles",
-                   "Jueves", "Viernes", "Sábado", "Domingo"]
-
-        # Ordenar por fecha y luego por hora de inicio
-        try:
-            data_ordenada = sorted(
-                datos_a_mostrar,
-                key=lambda x: (datetime.strptime(
-                    x[1], "%Y-%m-%d"), datetime.strptime(x[2], "%H:%M"))
-            )
-        # Manejar posibles errores si los datos no son como se esperan
-        except (TypeError, ValueError) as e:
-            print(f"Error al ordenar clases: {e}. Mostrando sin ordenar.")
-            data_ordenada = datos_a_mostrar
-
-        for idx, clase_row in enumerate(data_ordenada):
-            # clase_row: [id, fecha, hora_inicio, hora_fin, id_materia, id_profesor, id_salon_compuesto]
-            id_clase, fecha_str, hora_inicio_str, hora_fin_str, id_materia, id_profesor, id_salon_compuesto = clase_row
-
-            nombre_materia = self._get_nombre_materia(id_materia)
-            nombre_profesor = self._get_nombre_profesor(id_profesor)
-            display_salon = self._get_display_salon(id_salon_compuesto)
-
-            try:
-                dia_semana = dias_es[datetime.strptime(
-                    fecha_str, "%Y-%m-%d").weekday()]
-            except ValueError:
-                dia_semana = "N/A"
+                filtro_fecha_str = ""
+        if filtro_fecha_str:
+            # Un mes anterior al periodo activo se lee aquí, y no en el hilo de trabajo
+            self.scheduled_class_repo.load_date_range(filtro_fecha_str, filtro_fecha_str)
+        # El repositorio ordena por fecha y hora de inicio usando la forma numérica
+        # precalculada, y filtra por fecha si se indica. Devuelve listas nuevas: el hilo de
+        # trabajo no toca los datos del repositorio aunque se editen mientras tanto.
+        data_ordenada = self.scheduled_class_repo.get_scheduled_classes_sorted(filtro_fecha_str or None)
+        return self._producir_filas_clases(
+            data_ordenada, self._tabla_nombres_profesores(), self._tabla_nombres_materias(),
+            self._filas_visuales)
+
+    def _producir_filas_clases(self, data_ordenada, nombres_profesores, nombres_materias, filas_previas):
+        """
+        Genera las filas del TreeView en partes de FILAS_POR_PARTE (se recorre en un hilo de trabajo).
+        Solo usa sus argumentos, tomados en el hilo de Tk por _preparar_contenido().
 
-            visual_row = [id_clase, fecha_str, dia_semana, hora_inicio_str,
-                          hora_fin_str, nombre_materia, nombre_profesor, display_salon]
-            tag = 'par' if idx % 2 == 0 else 'impar'
-            self.tree_clases.insert(
-                "", "end", values=visual_row, iid=id_clase, tags=(tag,))
+        Yields:
+            tuple: (inicio, filas, caché); la caché de filas visuales solo va en la última parte.
+        """
+        # La fila del repositorio es la clave: si la clase cambia, su clave cambia y se recalcula.
+        # El diccionario se reconstruye en cada carga para no retener clases eliminadas.
+        filas_visuales = {}
+        inicio, filas = 0, []
+        for clase_row in data_ordenada:
+            clave = tuple(clase_row)
+            visual_row = filas_previas.get(clave)
+            if visual_row is None:
+                visual_row = self._construir_fila_visual(clave, nombres_profesores, nombres_materias)
+            filas_visuales[clave] = visual_row
+            filas.append((clave[0], visual_row))
+            if len(filas) == FILAS_POR_PARTE:
+                yield inicio, filas, None
+                inicio, filas = inicio + len(filas), []
+        yield inicio, filas, filas_visuales
+
+    def _recibir_contenido(self, parte):
+        """Añade una parte de filas al TreeView; con la última, cierra la carga (solo aplica los cambios)."""
+        inicio, filas, filas_visuales = parte
+        self.lista_clases.cargar_parte(filas, inicio)
+        if filas_visuales is None:
+            return
+        self.lista_clases.terminar_carga()
+        self._filas_visuales = filas_visuales
 
-        if self.clase_seleccionada_id_tree and not self.tree_clases.exists(self.clase_seleccionada_id_tree):
+        if self.clase_seleccionada_id_tree and not self.lista_clases.existe(self.clase_seleccionada_id_tree):
             self.clase_seleccionada_id_tree = None
         # Asegurar que los botones se actualicen
         self._actualizar_estado_botones_clase()
 
     def _on_clase_seleccionada(self, event=None):
-        seleccion = self.tree_clases.selection()
-        self.clase_seleccionada_id_tree = seleccion[0] if seleccion else None
+        self.clase_seleccionada_id_tree = self.lista_clases.seleccion()
         self._actualizar_estado_botones_clase()
 
     def _actualizar_estado_botones_clase(self):
@@ -614,21 +694,21 @@ class ClasesFrame(ttk.Frame):
             return False
 
         # 2. Validaciones de Negocio (Conflictos, etc.)
-        # Acceder a los repositorios de otros frames
-        prof_frame = self.controller.frames.get('ProfesoresFrame')
-        mat_frame = self.controller.frames.get('MateriasFrame')
-        sal_frame = self.controller.frames.get(
-            'SalonesFrame')  # Asumiendo que es ClassroomsFrame
-
-        if not (prof_frame and mat_frame and sal_frame and
-                hasattr(prof_frame, 'teacher_repo') and
-                hasattr(mat_frame, 'subject_repo') and
-                hasattr(sal_frame, 'classroom_repo')):
-            messagebox.showerror(
-                "Error Interno", "No se pudieron cargar los datos necesarios para la validación.", parent=active_toplevel)
+        # Repositorios compartidos (los otros frames pueden no haberse creado todavía)
+        subject_repo = self.controller.repositories.subject_repo
+        classroom_repo = self.controller.repositories.classroom_repo
+
+        # 2.1. Disponibilidad del Profesor (franjas registradas en su ficha)
+        if not self.controller.repositories.teacher_repo.is_available(
+                nuevo_id_profesor, nueva_fecha_str, nueva_hora_inicio_str, nueva_hora_fin_str):
+            prof_nombre = self._get_nombre_profesor(nuevo_id_profesor)
+            messagebox.showerror("Profesor No Disponible",
+                                 f"El profesor {prof_nombre} no está disponible en ese horario según su disponibilidad registrada.",
+                                 parent=active_toplevel)
             return False
 
-        # 2.1. Conflicto de Profesor
+        # 2.2. Conflicto de Profesor (las consultas de conflicto solo ven los meses cargados)
+        self.scheduled_class_repo.load_date_range(nueva_fecha_str, nueva_fecha_str)
         if self.scheduled_class_repo.check_teacher_availability_conflict(
                 nuevo_id_profesor, nueva_fecha_str, nueva_hora_inicio_str, nueva_hora_fin_str,
                 excluding_class_id=id_clase_original):
@@ -639,7 +719,7 @@ class ClasesFrame(ttk.Frame):
                                  parent=active_toplevel)
             return False
 
-        # 2.2. Conflicto de Salón
+        # 2.3. Conflicto de Salón
         if self.scheduled_class_repo.check_classroom_availability_conflict(
                 nuevo_id_salon_compuesto, nueva_fecha_str, nueva_hora_inicio_str, nueva_hora_fin_str,
                 excluding_class_id=id_clase_original):
@@ -649,8 +729,8 @@ class ClasesFrame(ttk.Frame):
                                  parent=active_toplevel)
             return False
 
-        # 2.3. Compatibilidad Materia-Salón (requiere sala de sistemas)
-        materia_sel_data_list = mat_frame.subject_repo.get_subject_by_id(
+        # 2.4. Compatibilidad Materia-Salón (requiere sala de sistemas)
+        materia_sel_data_list = subject_repo.get_subject_by_id(
             nuevo_id_materia)
         # classroom_repo.get_classroom espera (numero, bloque)
         num_salon_busqueda, bloque_salon_busqueda = None, None
@@ -667,7 +747,7 @@ class ClasesFrame(ttk.Frame):
                                  nuevo_id_salon_compuesto}' no tiene el formato esperado 'Numero-Bloque'.", parent=active_toplevel)
             return False
 
-        salon_sel_data_list = sal_frame.classroom_repo.get_classroom(
+        salon_sel_data_list = classroom_repo.get_classroom(
             num_salon_busqueda, bloque_salon_busqueda)
 
         if not materia_sel_data_list:
@@ -702,10 +782,8 @@ class ClasesFrame(ttk.Frame):
             messagebox.showinfo(
                 "Éxito", "Clase guardada correctamente.", parent=active_toplevel)
             self.actualizar_contenido()
-            if self.tree_clases.exists(nueva_id_clase):
-                self.tree_clases.selection_set(nueva_id_clase)
-                self.tree_clases.focus(nueva_id_clase)
-                self.tree_clases.see(nueva_id_clase)
+            if self.lista_clases.existe(nueva_id_clase):
+                self.lista_clases.seleccionar(nueva_id_clase)
                 self.clase_seleccionada_id_tree = nueva_id_clase
             else:
                 self.clase_seleccionada_id_tree = None
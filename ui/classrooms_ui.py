@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from ui.config_ui import COLOR_FILA_PAR, COLOR_FILA_IMPAR, BLOQUES_SALON
-from repositories.classroom_repository import ClassroomRepository
+from ui.busqueda_indexada import IndiceBusqueda, LlamadaDiferida
+from ui.carga_segundo_plano import ContenidoEnSegundoPlano
+from ui.treeview_virtual import TreeviewVirtual
 
 
 class ClassroomWindow(tk.Toplevel):
@@ -168,11 +170,14 @@ class ClassroomWindow(tk.Toplevel):
             self.destroy()
 
 
-class ClassroomsFrame(ttk.Frame):
+class ClassroomsFrame(ContenidoEnSegundoPlano, ttk.Frame):
+    REPOSITORIOS_CONTENIDO = ("classroom_repo",)
+
     def __init__(self, parent, controller):
         super().__init__(parent, padding="10")
         self.controller = controller
-        self.classroom_repo = ClassroomRepository()
+        # Repositorio de salones compartido (ver RepositoryRegistry)
+        self.classroom_repo = controller.repositories.classroom_repo
 
         # Almacenará el iid COMPUESTO ("numero-bloque")
         self.salon_seleccionado_iid = None
@@ -185,9 +190,12 @@ class ClassroomsFrame(ttk.Frame):
             frame_controles, text="Buscar Salón (Número o Bloque):").pack(
             side="left", padx=(0, 5)
         )
+        # Índice de búsqueda sobre número y bloque; se reconstruye en actualizar_contenido
+        self.indice_salones = IndiceBusqueda(lambda salon: salon[:2])
+        self.busqueda_diferida = LlamadaDiferida(self, self._filtrar_salones_live)
         self.search_var_salon = tk.StringVar()
         self.search_var_salon.trace_add(
-            "write", self._filtrar_salones_live)
+            "write", self.busqueda_diferida.programar)
         search_entry_salon = ttk.Entry(
             frame_controles, textvariable=self.search_var_salon, width=25)
         search_entry_salon.pack(side="left", padx=5, fill="x", expand=True)
@@ -233,15 +241,14 @@ class ClassroomsFrame(ttk.Frame):
         self.tree_salones.pack(expand=True, fill="both",
                                padx=0, pady=(0, 10), side="left")
 
-        scrollbar_salones = ttk.Scrollbar(
-            self, orient="vertical", command=self.tree_salones.yview)
-        self.tree_salones.configure(yscrollcommand=scrollbar_salones.set)
+        scrollbar_salones = ttk.Scrollbar(self, orient="vertical")
         scrollbar_salones.pack(side="right", fill="y")
+        # Lista virtual: solo las filas visibles se materializan (ver ui/treeview_virtual.py)
+        self.lista_salones = TreeviewVirtual(self.tree_salones, scrollbar_salones)
 
         self.tree_salones.bind("<<TreeviewSelect>>",
                                self._on_salon_seleccionado)
-
-        self.actualizar_contenido()
+        # El contenido se carga al mostrar el frame (ver Aplicacion.mostrar_frame)
 
     def _parse_selected_iid(self):
         """Parsea el iid compuesto ("numero-bloque") y devuelve (numero, bloque)."""
@@ -257,55 +264,51 @@ class ClassroomsFrame(ttk.Frame):
                   self.salon_seleccionado_iid}")
             return None, None
 
-    def actualizar_contenido(self):
-        self.salones_data_actual = self.classroom_repo.get_all_classrooms()
-        if self.tree_salones.selection():
-            self.tree_salones.selection_remove(self.tree_salones.selection())
+    def _preparar_contenido(self):
+        # Hilo de Tk: la copia de los salones se toma aquí, no en el hilo de trabajo
+        return self._producir_indice_salones(self.classroom_repo.get_all_classrooms())
+
+    def _producir_indice_salones(self, salones):
+        # Se recorre en un hilo de trabajo: no toca widgets ni el repositorio
+        indice = IndiceBusqueda(self.indice_salones.campos)
+        indice.reconstruir(salones)
+        yield indice
+
+    def _recibir_contenido(self, indice):
+        self.indice_salones = indice
+        self.lista_salones.limpiar_seleccion()
         self.salon_seleccionado_iid = None  # CAMBIADO
-        self._actualizar_estado_botones_salon()
-        self._cargar_salones_en_treeview(self.salones_data_actual)
+        self.busqueda_diferida.cancelar()
+        self._filtrar_salones_live()
 
     def _cargar_salones_en_treeview(self, data_a_cargar):
-        for i in self.tree_salones.get_children():
-            self.tree_salones.delete(i)
-        for idx, salon_row_data in enumerate(data_a_cargar):
+        filas = []
+        for salon_row_data in data_a_cargar:
             visual_row = list(salon_row_data)
             if len(visual_row) > 3:
                 visual_row[3] = "Sí" if salon_row_data[3] else "No"
 
-            tag = 'par' if idx % 2 == 0 else 'impar'
-
             # --- CAMBIO CRÍTICO: Generar iid único ---
             numero_salon = str(salon_row_data[0])
             bloque_salon = str(salon_row_data[1])
             item_iid = f"{numero_salon}-{bloque_salon}"
             # --- FIN CAMBIO CRÍTICO ---
 
-            self.tree_salones.insert(
-                # USA item_iid
-                "", "end", values=visual_row, iid=item_iid, tags=(tag,))
+            filas.append((item_iid, visual_row))  # USA item_iid
+        self.lista_salones.cargar(filas)
 
-    def _filtrar_salones_live(self, *args):
-        query = self.search_var_salon.get().lower()
-        todos_los_salones = self.classroom_repo.get_all_classrooms()
-        if not query:
-            self.salones_data_actual = todos_los_salones
-        else:
-            self.salones_data_actual = [
-                list(s_data) for s_data in todos_los_salones
-                if query in str(s_data[0]).lower() or query in str(s_data[1]).lower()
-            ]
+    def _filtrar_salones_live(self):
+        # El índice ya tiene el texto en minúsculas de cada salón
+        self.salones_data_actual = self.indice_salones.buscar(self.search_var_salon.get())
         self._cargar_salones_en_treeview(self.salones_data_actual)
 
         # Verificar si el iid seleccionado sigue existiendo en los items cargados
-        if self.salon_seleccionado_iid and not self.tree_salones.exists(self.salon_seleccionado_iid):
+        if self.salon_seleccionado_iid and not self.lista_salones.existe(self.salon_seleccionado_iid):
             self.salon_seleccionado_iid = None
         self._actualizar_estado_botones_salon()
 
     def _on_salon_seleccionado(self, event=None):
-        seleccion = self.tree_salones.selection()
-        # CAMBIADO
-        self.salon_seleccionado_iid = seleccion[0] if seleccion else None
+        self.salon_seleccionado_iid = self.lista_salones.seleccion()
         self._actualizar_estado_botones_salon()
 
     def _actualizar_estado_botones_salon(self):
@@ -422,10 +425,8 @@ class ClassroomsFrame(ttk.Frame):
                 nuevo_numero_salon}-{nuevo_bloque_salon}"  # NUEVO iid
             try:
                 # CAMBIADO para usar nuevo_iid
-                if self.tree_salones.exists(nuevo_iid):
-                    self.tree_salones.selection_set(nuevo_iid)
-                    self.tree_salones.focus(nuevo_iid)
-                    self.tree_salones.see(nuevo_iid)
+                if self.lista_salones.existe(nuevo_iid):
+                    self.lista_salones.seleccionar(nuevo_iid)
                     self.salon_seleccionado_iid = nuevo_iid  # CAMBIADO
                 else:
                     self.salon_seleccionado_iid = None
@@ -1,5 +1,7 @@
 from tkinter import ttk
 
+from utils.availability import AVAILABILITY_DAYS, AVAILABILITY_SLOT_HOURS
+
 APP_THEME = 'arc'
 COLOR_FILA_PAR = "#ECECEC"
 COLOR_FILA_IMPAR = "#FFFFFF"
@@ -14,8 +16,8 @@ FUENTE_TREEVIEW_CABECERA = ("Segoe UI", 10, "bold")
 FUENTE_TREEVIEW_FILA = ("Segoe UI", 10)
 FUENTE_MENU = ("Segoe UI", 9)
 
-DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado"]
-FRANJAS_HORARIAS_DISPONIBILIDAD = ["Mañana", "Tarde", "Noche"]
+DIAS_SEMANA = list(AVAILABILITY_DAYS)
+FRANJAS_HORARIAS_DISPONIBILIDAD = list(AVAILABILITY_SLOT_HOURS)
 FRANJAS_HORARIAS_MATERIA = ["Diurna", "Nocturna"]
 BLOQUES_SALON = ["A", "B"]
 
@@ -4,7 +4,9 @@ from tkinter import ttk, messagebox
 import uuid  # VentanaMateria usa uuid
 from ui.config_ui import (COLOR_FILA_PAR, COLOR_FILA_IMPAR,
                           FRANJAS_HORARIAS_MATERIA, FUENTE_GENERAL)
-from repositories.subject_repository import SubjectRepository
+from ui.busqueda_indexada import IndiceBusqueda, LlamadaDiferida
+from ui.carga_segundo_plano import ContenidoEnSegundoPlano
+from ui.treeview_virtual import TreeviewVirtual
 
 
 class VentanaMateria(tk.Toplevel):
@@ -124,21 +126,16 @@ class VentanaMateria(tk.Toplevel):
     def _cargar_profesores_para_combobox(self):
         """
         Carga la lista de profesores (ID, Nombre Completo) para el ComboBox.
-        Obtiene los datos del TeacherRepository a través de ProfesoresFrame.
+        Obtiene los datos del TeacherRepository compartido (controller.repositories).
         """
         self.profesores_listos = []
-        prof_frame = self.controller.frames.get('ProfesoresFrame')
-        # Asegurarse que ProfesoresFrame y su teacher_repo existen
-        if prof_frame and hasattr(prof_frame, 'teacher_repo') and prof_frame.teacher_repo is not None:
-            todos_los_profesores_data = prof_frame.teacher_repo.get_all_teachers()
-            # teacher_repo.get_all_teachers() devuelve [[id_card, first_name, last_name, availability_dict], ...]
-            for prof_data in todos_los_profesores_data:
-                if len(prof_data) >= 3:
-                    id_prof = str(prof_data[0])
-                    nombre_completo = f"{prof_data[1]} {prof_data[2]}"
-                    self.profesores_listos.append((id_prof, nombre_completo))
-        else:
-            print("Advertencia (VentanaMateria): No se pudo acceder a ProfesoresFrame o su teacher_repo para cargar profesores.")
+        todos_los_profesores_data = self.controller.repositories.teacher_repo.get_all_teachers()
+        # teacher_repo.get_all_teachers() devuelve [[id_card, first_name, last_name, availability_dict], ...]
+        for prof_data in todos_los_profesores_data:
+            if len(prof_data) >= 3:
+                id_prof = str(prof_data[0])
+                nombre_completo = f"{prof_data[1]} {prof_data[2]}"
+                self.profesores_listos.append((id_prof, nombre_completo))
 
     def _get_id_from_display(self, display_val, lista_de_tuplas, item_index_for_id=0, item_index_for_display=1):
         if not display_val:
@@ -201,16 +198,19 @@ class VentanaMateria(tk.Toplevel):
             self.destroy()
 
 
-class MateriasFrame(ttk.Frame):
+class MateriasFrame(ContenidoEnSegundoPlano, ttk.Frame):
     """
     Frame principal para la gestión de Materias (CRUD y visualización).
     """
 
+    # La columna "Profesor Asignado" también depende de los profesores
+    REPOSITORIOS_CONTENIDO = ("subject_repo", "teacher_repo")
+
     def __init__(self, parent, controller):
         super().__init__(parent, padding="10")
         self.controller = controller
-        # Inicializar el repositorio de materias
-        self.subject_repo = SubjectRepository()  # <--- USA EL REPOSITORIO
+        # Repositorio de materias compartido (ver RepositoryRegistry)
+        self.subject_repo = controller.repositories.subject_repo
 
         self.materias_data_actual = []
         # ID de la materia seleccionada (UUID)
@@ -221,8 +221,13 @@ class MateriasFrame(ttk.Frame):
 
         ttk.Label(frame_controles, text="Buscar Materia:").pack(
             side="left", padx=(0, 5))
+        # Nombres de profesores por cédula, leídos una vez por carga (ver actualizar_contenido)
+        self._nombres_profesores = {}
+        # Índice sobre ID, nombre, profesor asignado y franja; se reconstruye en actualizar_contenido
+        self.indice_materias = IndiceBusqueda(self._campos_busqueda_materia)
+        self.busqueda_diferida = LlamadaDiferida(self, self._filtrar_materias_live)
         self.search_var_materia = tk.StringVar()
-        self.search_var_materia.trace_add("write", self._filtrar_materias_live)
+        self.search_var_materia.trace_add("write", self.busqueda_diferida.programar)
         search_entry_materia = ttk.Entry(
             frame_controles, textvariable=self.search_var_materia, width=30)
         search_entry_materia.pack(side="left", padx=5, fill="x", expand=True)
@@ -268,52 +273,66 @@ class MateriasFrame(ttk.Frame):
         self.tree_materias.pack(expand=True, fill="both",
                                 padx=0, pady=(0, 10), side="left")
 
-        scrollbar_materias = ttk.Scrollbar(
-            self, orient="vertical", command=self.tree_materias.yview)
-        self.tree_materias.configure(yscrollcommand=scrollbar_materias.set)
+        scrollbar_materias = ttk.Scrollbar(self, orient="vertical")
         scrollbar_materias.pack(side="right", fill="y")
+        # Lista virtual: solo las filas visibles se materializan (ver ui/treeview_virtual.py)
+        self.lista_materias = TreeviewVirtual(self.tree_materias, scrollbar_materias)
 
         self.tree_materias.bind("<<TreeviewSelect>>",
                                 self._on_materia_seleccionada)
+        # El contenido se carga al mostrar el frame (ver Aplicacion.mostrar_frame)
 
-        self.actualizar_contenido()
-
-    def _get_nombre_profesor_para_materia(self, id_profesor):
+    def _get_nombre_profesor_para_materia(self, id_profesor, nombres_profesores=None):
         """Obtiene el nombre completo de un profesor dado su ID (cédula)."""
         if not id_profesor:
             return "N/A"  # Si no hay ID de profesor, no se puede buscar
-
-        prof_frame = self.controller.frames.get('ProfesoresFrame')
-        # Asegurarse que ProfesoresFrame y su teacher_repo existen
-        if prof_frame and hasattr(prof_frame, 'teacher_repo') and prof_frame.teacher_repo is not None:
-            prof_data_list = prof_frame.teacher_repo.get_teacher_by_id(
-                id_profesor)
-            # teacher_repo.get_teacher_by_id devuelve [id_card, first_name, last_name, availability_dict]
-            # Verificar que tenemos al menos id, nombre, apellido
-            if prof_data_list and len(prof_data_list) >= 3:
-                # Nombre Apellido
-                return f"{prof_data_list[1]} {prof_data_list[2]}"
-        else:
-            print(
-                "Advertencia (MateriasFrame): No se pudo acceder a ProfesoresFrame o su teacher_repo.")
-        return "Prof. Desconocido"  # O "N/A" si no se encuentra o hay error
-
-    def actualizar_contenido(self):
-        """Actualiza la vista de materias cargando datos desde el repositorio."""
-        self.materias_data_actual = self.subject_repo.get_all_subjects()  # <--- USA EL REPOSITORIO
-
-        if self.tree_materias.selection():
-            self.tree_materias.selection_remove(self.tree_materias.selection())
+        if nombres_profesores is None:
+            nombres_profesores = self._nombres_profesores
+        return nombres_profesores.get(str(id_profesor), "Prof. Desconocido")
+
+    def _leer_nombres_profesores(self):
+        """Construye en una sola pasada el diccionario {cédula: "Nombre Apellido"}."""
+        return {
+            str(t.get("id_card")): f"{t.get('first_name')} {t.get('last_name')}"
+            for t in self.controller.repositories.teacher_repo.teachers_data}
+
+    def _campos_busqueda_materia(self, m_data, nombres_profesores=None):
+        """Valores en los que busca el filtro: ID, nombre, profesor asignado y franja."""
+        campos = [m_data[0], m_data[1],
+                  self._get_nombre_profesor_para_materia(m_data[4] if len(m_data) > 4 else None,
+                                                         nombres_profesores)]
+        if len(m_data) > 5:
+            campos.append(m_data[5])
+        return campos
+
+    def _preparar_contenido(self):
+        """
+        Toma una copia de las materias y de los nombres de profesores (hilo de Tk) y devuelve
+        la parte de la carga, que solo construye el índice de búsqueda sobre esa copia.
+        """
+        nombres_profesores = self._leer_nombres_profesores()
+        materias = self.subject_repo.get_all_subjects()  # <--- USA EL REPOSITORIO
+        return self._producir_indice_materias(materias, nombres_profesores)
+
+    def _producir_indice_materias(self, materias, nombres_profesores):
+        """Construye el índice de búsqueda (se recorre en un hilo de trabajo)."""
+        indice = IndiceBusqueda(
+            lambda m_data: self._campos_busqueda_materia(m_data, nombres_profesores))
+        indice.reconstruir(materias)
+        yield nombres_profesores, indice
+
+    def _recibir_contenido(self, parte):
+        """Muestra las materias recién leídas aplicando el texto de búsqueda actual."""
+        self._nombres_profesores, self.indice_materias = parte
+        self.lista_materias.limpiar_seleccion()
         self.materia_seleccionada_id_tree = None
-        self._actualizar_estado_botones_materia()
-        self._cargar_materias_en_treeview(self.materias_data_actual)
+        self.busqueda_diferida.cancelar()
+        self._filtrar_materias_live()
 
     def _cargar_materias_en_treeview(self, data_a_cargar):
-        """Carga o recarga los datos en el widget Treeview."""
-        for i in self.tree_materias.get_children():
-            self.tree_materias.delete(i)
-
-        for idx, materia_row_data in enumerate(data_a_cargar):
+        """Carga o recarga los datos en el widget Treeview (solo aplica los cambios)."""
+        filas = []
+        for materia_row_data in data_a_cargar:
             visual_row = list(materia_row_data)
 
             if len(visual_row) > 3:  # Índice 3: requires_lab
@@ -338,40 +357,22 @@ class MateriasFrame(ttk.Frame):
             while len(visual_row) < num_cols_tree:
                 visual_row.append("N/A")
 
-            tag = 'par' if idx % 2 == 0 else 'impar'
-            self.tree_materias.insert(
-                "", "end", values=visual_row[:num_cols_tree], iid=str(materia_row_data[0]), tags=(tag,))
-
-    def _filtrar_materias_live(self, *args):
-        """Filtra las materias en el Treeview basado en el texto de búsqueda."""
-        query = self.search_var_materia.get().lower()
-        todas_las_materias = self.subject_repo.get_all_subjects()  # <--- USA EL REPOSITORIO
-
-        if not query:
-            self.materias_data_actual = todas_las_materias
-        else:
-            self.materias_data_actual = []
-            for m_data in todas_las_materias:
-                nombre_prof_str = self._get_nombre_profesor_para_materia(
-                    m_data[4] if len(m_data) > 4 else None).lower()
-
-                if query in str(m_data[0]).lower() or \
-                   query in str(m_data[1]).lower() or \
-                   query in nombre_prof_str or \
-                   (len(m_data) > 5 and query in str(m_data[5]).lower()):
-                    self.materias_data_actual.append(list(m_data))
+            filas.append((str(materia_row_data[0]), visual_row[:num_cols_tree]))
+        self.lista_materias.cargar(filas)
 
+    def _filtrar_materias_live(self):
+        """Filtra las materias en el Treeview basado en el texto de búsqueda (usa el índice)."""
+        self.materias_data_actual = self.indice_materias.buscar(self.search_var_materia.get())
         self._cargar_materias_en_treeview(self.materias_data_actual)
 
         if self.materia_seleccionada_id_tree and \
-           not self.tree_materias.exists(self.materia_seleccionada_id_tree):
+           not self.lista_materias.existe(self.materia_seleccionada_id_tree):
             self.materia_seleccionada_id_tree = None
         self._actualizar_estado_botones_materia()
 
     def _on_materia_seleccionada(self, event=None):
         """Manejador para cuando una materia es seleccionada en el Treeview."""
-        seleccion = self.tree_materias.selection()
-        self.materia_seleccionada_id_tree = seleccion[0] if seleccion else None
+        self.materia_seleccionada_id_tree = self.lista_materias.seleccion()
         self._actualizar_estado_botones_materia()
 
     def _actualizar_estado_botones_materia(self):
@@ -480,10 +481,8 @@ class MateriasFrame(ttk.Frame):
                 "Éxito", "Materia guardada correctamente.", parent=active_toplevel)
             self.actualizar_contenido()
 
-            if self.tree_materias.exists(nuevo_id_materia):
-                self.tree_materias.selection_set(nuevo_id_materia)
-                self.tree_materias.focus(nuevo_id_materia)
-                self.tree_materias.see(nuevo_id_materia)
+            if self.lista_materias.existe(nuevo_id_materia):
+                self.lista_materias.seleccionar(nuevo_id_materia)
                 self.materia_seleccionada_id_tree = nuevo_id_materia
             else:
                 self.materia_seleccionada_id_tree = None
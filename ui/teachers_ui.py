@@ -4,7 +4,9 @@ from ui.config_ui import (
     COLOR_FILA_PAR, COLOR_FILA_IMPAR, DIAS_SEMANA,
     FRANJAS_HORARIAS_DISPONIBILIDAD, FUENTE_LABELS_FORMULARIOS
 )
-from repositories.teacher_repository import TeacherRepository
+from ui.busqueda_indexada import IndiceBusqueda, LlamadaDiferida
+from ui.carga_segundo_plano import ContenidoEnSegundoPlano
+from ui.treeview_virtual import TreeviewVirtual
 
 
 class VentanaDisponibilidad(tk.Toplevel):
@@ -274,16 +276,19 @@ class VentanaProfesor(tk.Toplevel):
             self.destroy()  # Se cierra si el guardado en ProfesoresFrame fue exitoso
 
 
-class ProfesoresFrame(ttk.Frame):
+class ProfesoresFrame(ContenidoEnSegundoPlano, ttk.Frame):
     """
     Frame principal para la gestión de Profesores (CRUD y visualización).
     """
 
+    # Repositorios cuya revisión decide si hay que recargar la vista (ver ContenidoEnSegundoPlano)
+    REPOSITORIOS_CONTENIDO = ("teacher_repo",)
+
     def __init__(self, parent, controller):
         super().__init__(parent, padding="10")
         self.controller = controller
-        # Inicializar el repositorio de profesores
-        self.teacher_repo = TeacherRepository()  # <--- USA EL REPOSITORIO
+        # Repositorio de profesores compartido (ver RepositoryRegistry)
+        self.teacher_repo = controller.repositories.teacher_repo
 
         self.profesores_data_actual = []
         self.profesor_seleccionado_id_tree = None  # Cédula del profesor seleccionado
@@ -293,8 +298,11 @@ class ProfesoresFrame(ttk.Frame):
 
         ttk.Label(frame_controles, text="Buscar Profesor:").pack(
             side="left", padx=(0, 5))
+        # Índice de búsqueda sobre cédula, nombre y apellido; se reconstruye en actualizar_contenido
+        self.indice_profesores = IndiceBusqueda(lambda profesor: profesor[:3])
+        self.busqueda_diferida = LlamadaDiferida(self, self._filtrar_profesores_live)
         self.search_var = tk.StringVar()
-        self.search_var.trace_add("write", self._filtrar_profesores_live)
+        self.search_var.trace_add("write", self.busqueda_diferida.programar)
         search_entry = ttk.Entry(
             frame_controles, textvariable=self.search_var, width=30)
         search_entry.pack(side="left", padx=5, fill="x", expand=True)
@@ -335,62 +343,57 @@ class ProfesoresFrame(ttk.Frame):
         self.tree_profesores.pack(
             expand=True, fill="both", padx=0, pady=(0, 10), side="left")
 
-        scrollbar_tree_profesores = ttk.Scrollbar(
-            self, orient="vertical", command=self.tree_profesores.yview)
-        self.tree_profesores.configure(
-            yscrollcommand=scrollbar_tree_profesores.set)
+        scrollbar_tree_profesores = ttk.Scrollbar(self, orient="vertical")
         scrollbar_tree_profesores.pack(side="right", fill="y")
+        # Lista virtual: solo las filas visibles se materializan (ver ui/treeview_virtual.py)
+        self.lista_profesores = TreeviewVirtual(
+            self.tree_profesores, scrollbar_tree_profesores)
 
         self.tree_profesores.bind(
             "<<TreeviewSelect>>", self._on_profesor_seleccionado)
+        # El contenido se carga al mostrar el frame (ver Aplicacion.mostrar_frame)
 
-        self.actualizar_contenido()
-
-    def actualizar_contenido(self):
-        """Actualiza la vista de profesores cargando datos desde el repositorio."""
-        self.profesores_data_actual = self.teacher_repo.get_all_teachers()  # <--- USA EL REPOSITORIO
-
-        if self.tree_profesores.selection():
-            self.tree_profesores.selection_remove(
-                self.tree_profesores.selection())
+    def _preparar_contenido(self):
+        """
+        Toma una copia de los profesores (hilo de Tk) y devuelve la parte de la carga, que solo
+        construye el índice de búsqueda sobre esa copia.
+        """
+        profesores = self.teacher_repo.get_all_teachers()  # <--- USA EL REPOSITORIO
+        return self._producir_indice_profesores(profesores)
+
+    def _producir_indice_profesores(self, profesores):
+        """Construye el índice de búsqueda (se recorre en un hilo de trabajo)."""
+        indice = IndiceBusqueda(self.indice_profesores.campos)
+        indice.reconstruir(profesores)
+        yield indice
+
+    def _recibir_contenido(self, indice):
+        """Muestra los profesores recién leídos aplicando el texto de búsqueda actual."""
+        self.indice_profesores = indice
+        self.lista_profesores.limpiar_seleccion()
         self.profesor_seleccionado_id_tree = None
-        self._cargar_profesores_en_treeview(self.profesores_data_actual)
-        self._actualizar_estado_botones()
+        self.busqueda_diferida.cancelar()
+        self._filtrar_profesores_live()
 
     def _cargar_profesores_en_treeview(self, data_a_cargar):
-        """Carga o recarga los datos en el widget Treeview."""
-        for i in self.tree_profesores.get_children():
-            self.tree_profesores.delete(i)
-
-        for idx, profesor_data_completa in enumerate(data_a_cargar):
-            profesor_row_display = profesor_data_completa[:3]
-            tag = 'par' if idx % 2 == 0 else 'impar'
-            self.tree_profesores.insert(
-                "", "end", values=profesor_row_display, iid=str(profesor_data_completa[0]), tags=(tag,))
-
-    def _filtrar_profesores_live(self, *args):
-        """Filtra los profesores en el Treeview basado en el texto de búsqueda."""
-        query = self.search_var.get().lower()
-        todos_los_profesores = self.teacher_repo.get_all_teachers()  # <--- USA EL REPOSITORIO
-
-        if not query:
-            self.profesores_data_actual = todos_los_profesores
-        else:
-            self.profesores_data_actual = [
-                list(prof_data) for prof_data in todos_los_profesores
-                if any(query in str(val).lower() for val in prof_data[:3])
-            ]
+        """Carga o recarga los datos en el widget Treeview (solo aplica los cambios)."""
+        self.lista_profesores.cargar(
+            (str(profesor_data_completa[0]), profesor_data_completa[:3])
+            for profesor_data_completa in data_a_cargar)
+
+    def _filtrar_profesores_live(self):
+        """Filtra los profesores en el Treeview basado en el texto de búsqueda (usa el índice)."""
+        self.profesores_data_actual = self.indice_profesores.buscar(self.search_var.get())
         self._cargar_profesores_en_treeview(self.profesores_data_actual)
 
         if self.profesor_seleccionado_id_tree and \
-           not self.tree_profesores.exists(self.profesor_seleccionado_id_tree):
+           not self.lista_profesores.existe(self.profesor_seleccionado_id_tree):
             self.profesor_seleccionado_id_tree = None
         self._actualizar_estado_botones()
 
     def _on_profesor_seleccionado(self, event=None):
         """Manejador para cuando un profesor es seleccionado en el Treeview."""
-        seleccion = self.tree_profesores.selection()
-        self.profesor_seleccionado_id_tree = seleccion[0] if seleccion else None
+        self.profesor_seleccionado_id_tree = self.lista_profesores.seleccion()
         self._actualizar_estado_botones()
 
     def _actualizar_estado_botones(self):
@@ -522,10 +525,8 @@ class ProfesoresFrame(ttk.Frame):
                 "Éxito", "Profesor guardado correctamente.", parent=active_toplevel)
             self.actualizar_contenido()
 
-            if self.tree_profesores.exists(nueva_cedula):
-                self.tree_profesores.selection_set(nueva_cedula)
-                self.tree_profesores.focus(nueva_cedula)
-                self.tree_profesores.see(nueva_cedula)
+            if self.lista_profesores.existe(nueva_cedula):
+                self.lista_profesores.seleccionar(nueva_cedula)
                 self.profesor_seleccionado_id_tree = nueva_cedula
             else:
                 self.profesor_seleccionado_id_tree = None
@@ -0,0 +1,131 @@
+"""
+Sincronización incremental de un ttk.Treeview plano a partir de la lista de filas deseada.
+"""
+from bisect import bisect_left
+
+
+def _posiciones_sin_mover(secuencia):
+    """
+    Devuelve los índices de `secuencia` que forman su subsecuencia creciente más larga.
+    Esos elementos ya están en orden relativo correcto y no necesitan moverse.
+    """
+    colas = []          # colas[k]: último valor de la mejor subsecuencia de longitud k+1
+    indices_colas = []  # índice en `secuencia` de cada valor de `colas`
+    anterior = [-1] * len(secuencia)
+    for i, valor in enumerate(secuencia):
+        k = bisect_left(colas, valor)
+        if k == len(colas):
+            colas.append(valor)
+            indices_colas.append(i)
+        else:
+            colas[k] = valor
+            indices_colas[k] = i
+        anterior[i] = indices_colas[k - 1] if k > 0 else -1
+    resultado = set()
+    i = indices_colas[-1] if indices_colas else -1
+    while i != -1:
+        resultado.add(i)
+        i = anterior[i]
+    return resultado
+
+
+class SincronizadorTreeview:
+    """
+    Mantiene un ttk.Treeview plano igual a una lista de filas (iid, valores) aplicando solo
+    las diferencias con la carga anterior: inserciones, eliminaciones, cambios de valores y
+    movimientos. Las etiquetas de filas alternas ('par'/'impar') se corrigen solo donde cambian.
+
+    El Treeview solo debe modificarse a través de este objeto (o llamar a reiniciar()).
+    """
+
+    def __init__(self, tree, tag_par='par', tag_impar='impar'):
+        self.tree = tree
+        self.tag_par = tag_par
+        self.tag_impar = tag_impar
+        self._filas = {}  # {iid: (valores, tag)} tal como están en el Treeview
+        self._orden = []  # iids en el orden del Treeview
+
+    def reiniciar(self):
+        """Elimina todas las filas del Treeview y olvida el estado anterior."""
+        hijos = self.tree.get_children()
+        if hijos:
+            self.tree.delete(*hijos)
+        self._filas = {}
+        self._orden = []
+
+    def sincronizar(self, filas, inicio=0):
+        """
+        Actualiza el Treeview para que muestre exactamente `filas`, en ese orden.
+
+        Args:
+            filas (iterable): Pares (iid, valores) en el orden deseado. Los iid deben ser únicos.
+            inicio (int): Posición de la primera fila dentro del conjunto completo; fija la
+                paridad de las etiquetas cuando solo se muestra una ventana (ver TreeviewVirtual).
+
+        Returns:
+            dict: Número de operaciones aplicadas {"insertadas", "eliminadas", "actualizadas", "movidas"}.
+        """
+        nuevo_orden = []
+        nuevos_valores = {}
+        for iid, valores in filas:
+            iid = str(iid)
+            nuevo_orden.append(iid)
+            nuevos_valores[iid] = tuple(valores)
+        conteo = {"insertadas": 0, "eliminadas": 0, "actualizadas": 0, "movidas": 0}
+
+        eliminar = [iid for iid in self._orden if iid not in nuevos_valores]
+        if eliminar:
+            self.tree.delete(*eliminar)
+            conteo["eliminadas"] = len(eliminar)
+
+        # Las filas que se conservan y forman la subsecuencia creciente más larga (según su
+        # posición anterior) se quedan donde están; el resto se mueve detrás de su predecesora.
+        posicion_previa = {}
+        for iid in self._orden:
+            if iid in nuevos_valores:
+                posicion_previa[iid] = len(posicion_previa)
+        conservadas = [iid for iid in nuevo_orden if iid in posicion_previa]
+        fijas = {conservadas[i] for i in _posiciones_sin_mover(
+            [posicion_previa[iid] for iid in conservadas])}
+
+        filas_previas = self._filas
+        self._filas = {}
+        # Índice de la última fila colocada en el paso anterior (evita consultar tree.index)
+        indice_anterior = None
+        for idx, iid in enumerate(nuevo_orden):
+            valores = nuevos_valores[iid]
+            tag = self.tag_par if (inicio + idx) % 2 == 0 else self.tag_impar
+            previa = filas_previas.get(iid)
+
+            if iid in fijas:
+                indice_anterior = None
+            elif previa is None:
+                if idx == 0:
+                    destino = 0
+                elif indice_anterior is not None:
+                    destino = indice_anterior + 1
+                else:
+                    destino = self.tree.index(nuevo_orden[idx - 1]) + 1
+                self.tree.insert("", destino, iid=iid, values=valores, tags=(tag,))
+                conteo["insertadas"] += 1
+                indice_anterior = destino
+            else:
+                # Separar la fila antes de calcular el destino hace que el índice no dependa
+                # de si estaba antes o después de su predecesora
+                self.tree.detach(iid)
+                destino = 0 if idx == 0 else self.tree.index(nuevo_orden[idx - 1]) + 1
+                self.tree.move(iid, "", destino)
+                conteo["movidas"] += 1
+                indice_anterior = destino
+
+            if previa is not None and previa != (valores, tag):
+                self.tree.item(iid, values=valores, tags=(tag,))
+                conteo["actualizadas"] += 1
+            self._filas[iid] = (valores, tag)
+
+        self._orden = nuevo_orden
+        return conteo
+
+    def contiene(self, iid):
+        """Indica si la fila `iid` está actualmente en el Treeview."""
+        return iid in self._filas
@@ -0,0 +1,233 @@
+"""
+Lista virtual sobre un ttk.Treeview: solo las filas visibles (más un margen) existen en el
+widget; el resto se materializa desde el conjunto de datos en memoria al desplazarse.
+"""
+from tkinter import ttk
+
+from ui.treeview_sync import SincronizadorTreeview
+
+ALTO_FILA_POR_DEFECTO = 20
+FILAS_POR_PASO_RUEDA = 3
+
+
+class TreeviewVirtual:
+    """
+    Controla un ttk.Treeview plano y su barra de desplazamiento vertical para mostrar un
+    conjunto de filas de cualquier tamaño. El Treeview contiene como mucho
+    filas_visibles + 2 * margen elementos, de modo que la memoria y el tiempo de redibujo
+    dependen de la altura de la vista y no del número de filas.
+
+    La barra, la rueda del ratón y las teclas de navegación se gestionan aquí; la selección
+    se conserva aunque la fila seleccionada salga de la ventana materializada.
+    """
+
+    def __init__(self, tree, scrollbar, margen=40):
+        """
+        Args:
+            tree (ttk.Treeview): Treeview plano (show="headings") con las etiquetas 'par'/'impar'.
+            scrollbar (ttk.Scrollbar): Barra vertical asociada; se reconfigura para usar esta lista.
+            margen (int): Filas materializadas por encima y por debajo de la parte visible.
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.margen = margen
+        self.sync = SincronizadorTreeview(tree)
+
+        self._filas = []        # [(iid, valores)] del conjunto completo, en orden
+        self._posiciones = {}   # {iid: posición en self._filas}
+        self.primera = 0        # posición de la primera fila visible
+        self._ventana = (0, 0)  # rango [inicio, fin) materializado en el Treeview
+        self._seleccion = None
+        self._primera_deseada = None  # posición a recuperar durante una carga por partes
+        self.filas_visibles = self._estimar_filas_visibles(tree.winfo_height())
+
+        scrollbar.configure(command=self._yview)
+        tree.configure(yscrollcommand="")
+        tree.bind("<Configure>", self._al_redimensionar, add="+")
+        for secuencia in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(secuencia, self._al_girar_rueda)
+        for secuencia, paso in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-pagina"),
+                                ("<Next>", "pagina"), ("<Home>", "inicio"), ("<End>", "fin")):
+            tree.bind(secuencia, lambda event, paso=paso: self._al_navegar(paso))
+
+    def __len__(self):
+        return len(self._filas)
+
+    # --- Datos ---
+
+    def cargar(self, filas):
+        """
+        Reemplaza el conjunto de filas mostrado. Solo las filas de la ventana visible llegan al
+        Treeview, y solo se aplican sus diferencias con lo que ya estaba materializado.
+
+        Args:
+            filas (iterable): Pares (iid, valores) en el orden deseado. Los iid deben ser únicos.
+        """
+        self.cargar_parte(filas, 0)
+        self.terminar_carga()
+
+    def cargar_parte(self, filas, inicio):
+        """
+        Carga el conjunto por partes (ver ui/carga_segundo_plano.py): la parte con inicio 0
+        reemplaza las filas y las siguientes se añaden al final. Hasta terminar_carga() se
+        conservan la posición de desplazamiento y la selección aunque sus filas no hayan llegado.
+
+        Args:
+            filas (iterable): Pares (iid, valores) de esta parte, en orden.
+            inicio (int): Posición de la primera fila de la parte en el conjunto completo.
+        """
+        if inicio == 0:
+            if self._primera_deseada is None:
+                self._primera_deseada = self.primera
+            self._filas = []
+            self._posiciones = {}
+        posiciones = self._posiciones
+        for iid, valores in filas:
+            iid = str(iid)
+            posiciones[iid] = len(self._filas)
+            self._filas.append((iid, valores))
+        if self._primera_deseada is not None:
+            self._mostrar(self._primera_deseada, forzar=True)
+            if self.primera == self._primera_deseada:
+                self._primera_deseada = None
+        else:
+            self._mostrar(self.primera, forzar=True)
+
+    def terminar_carga(self):
+        """Cierra una carga por partes: descarta la selección si su fila ya no existe."""
+        self._primera_deseada = None
+        if self._seleccion not in self._posiciones:
+            self._seleccion = None
+
+    def existe(self, iid):
+        """Indica si `iid` está en el conjunto de filas (aunque no esté materializada)."""
+        return str(iid) in self._posiciones
+
+    def valores(self, iid):
+        """Devuelve los valores de la fila `iid`, o None si no existe."""
+        posicion = self._posiciones.get(str(iid))
+        return self._filas[posicion][1] if posicion is not None else None
+
+    # --- Selección ---
+
+    def seleccion(self):
+        """Devuelve el iid seleccionado (aunque haya salido de la ventana), o None."""
+        seleccion_tree = self.tree.selection()
+        if seleccion_tree:
+            self._seleccion = seleccion_tree[0]
+        elif self._seleccion is not None and self.sync.contiene(self._seleccion):
+            # La fila está materializada pero ya no seleccionada: la deseleccionó el usuario
+            self._seleccion = None
+        return self._seleccion
+
+    def seleccionar(self, iid):
+        """Selecciona la fila `iid`, desplazando la vista para que sea visible."""
+        iid = str(iid)
+        if iid not in self._posiciones:
+            return
+        self._seleccion = iid
+        self.ver(iid)
+        self.tree.selection_set(iid)
+        self.tree.focus(iid)
+
+    def limpiar_seleccion(self):
+        """Quita la selección actual."""
+        self._seleccion = None
+        if self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+    def ver(self, iid):
+        """Desplaza la vista lo mínimo necesario para que la fila `iid` sea visible."""
+        posicion = self._posiciones.get(str(iid))
+        if posicion is None:
+            return
+        if posicion < self.primera:
+            self._mostrar(posicion)
+        elif posicion >= self.primera + self.filas_visibles:
+            self._mostrar(posicion - self.filas_visibles + 1)
+
+    # --- Ventana materializada ---
+
+    def _estimar_filas_visibles(self, alto_widget):
+        """Calcula cuántas filas caben en la altura del Treeview (descontando la cabecera)."""
+        if alto_widget <= 1:  # Aún no se ha dibujado: usar la altura configurada
+            return max(1, int(self.tree.cget("height") or 10))
+        hijos = self.tree.get_children()
+        caja = self.tree.bbox(hijos[0]) if hijos else None
+        if caja:
+            alto_cabecera, alto_fila = caja[1], caja[3]
+        else:
+            try:
+                alto_fila = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or ALTO_FILA_POR_DEFECTO)
+            except (TypeError, ValueError):
+                alto_fila = ALTO_FILA_POR_DEFECTO
+            alto_cabecera = alto_fila
+        return max(1, (alto_widget - alto_cabecera) // max(1, alto_fila))
+
+    def _mostrar(self, primera, forzar=False):
+        """Muestra las filas a partir de `primera`, materializando otra ventana si hace falta."""
+        total = len(self._filas)
+        primera = max(0, min(int(primera), max(0, total - self.filas_visibles)))
+        self.primera = primera
+        inicio, fin = self._ventana
+        ultima = min(total, primera + self.filas_visibles)
+        if forzar or primera < inicio or ultima > fin:
+            inicio = max(0, primera - self.margen)
+            fin = min(total, ultima + self.margen)
+            self._ventana = (inicio, fin)
+            self.sync.sincronizar(self._filas[inicio:fin], inicio=inicio)
+            if self._seleccion is not None and self.sync.contiene(self._seleccion):
+                if self.tree.selection() != (self._seleccion,):
+                    self.tree.selection_set(self._seleccion)
+        # Colocar la vista interna del Treeview en la fila `primera` de la ventana
+        self.tree.yview_moveto(0)
+        if primera > inicio:
+            self.tree.yview_scroll(primera - inicio, "units")
+        if total:
+            self.scrollbar.set(primera / total, ultima / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    # --- Eventos ---
+
+    def _yview(self, *args):
+        """Comando de la barra de desplazamiento: ("moveto", fracción) o ("scroll", n, unidad)."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._mostrar(float(args[1]) * len(self._filas))
+        elif args[0] == "scroll":
+            paso = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                paso *= max(1, self.filas_visibles - 1)
+            self._mostrar(self.primera + paso)
+
+    def _al_girar_rueda(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._mostrar(self.primera - FILAS_POR_PASO_RUEDA)
+        else:
+            self._mostrar(self.primera + FILAS_POR_PASO_RUEDA)
+        return "break"
+
+    def _al_navegar(self, paso):
+        """Mueve la selección con el teclado sobre el conjunto completo, no solo la ventana."""
+        if not self._filas:
+            return "break"
+        actual = self._posiciones.get(self.seleccion())
+        if paso == "inicio":
+            destino = 0
+        elif paso == "fin":
+            destino = len(self._filas) - 1
+        else:
+            if paso in ("pagina", "-pagina"):
+                paso = max(1, self.filas_visibles - 1) * (1 if paso == "pagina" else -1)
+            destino = self.primera if actual is None else actual + paso
+        destino = max(0, min(destino, len(self._filas) - 1))
+        self.seleccionar(self._filas[destino][0])
+        return "break"
+
+    def _al_redimensionar(self, event):
+        filas_visibles = self._estimar_filas_visibles(event.height)
+        if filas_visibles != self.filas_visibles:
+            self.filas_visibles = filas_visibles
+            self._mostrar(self.primera)
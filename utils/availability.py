@@ -0,0 +1,10 @@
+"""
+Días y franjas con que se registra la disponibilidad de los profesores ("availability":
+{día: [franja, ...]}). Los usan la interfaz (ui.config_ui) y los repositorios
+(repositories.teacher_repository), así que no dependen de ninguno de los dos.
+"""
+
+# Días con los que se guarda "availability", en el orden de date.weekday() (no hay domingo)
+AVAILABILITY_DAYS = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado")
+# Horas [inicio, fin) de cada franja de disponibilidad, en el orden en que se muestran
+AVAILABILITY_SLOT_HOURS = {"Mañana": (7, 12), "Tarde": (12, 18), "Noche": (18, 22)}
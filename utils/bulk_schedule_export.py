@@ -0,0 +1,126 @@
+import os
+import re
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.excel_exporter import write_teacher_schedule_to_excel
+
+# Nombres de materias/salones cargados una sola vez por proceso de trabajo (ver _init_worker)
+_worker_subject_names = {}
+_worker_classroom_names = {}
+
+
+def group_classes_by_teacher(scheduled_classes):
+    """
+    Agrupa las clases programadas por teacher_id en una sola pasada.
+
+    Args:
+        scheduled_classes (list): Lista de diccionarios de clases programadas.
+
+    Returns:
+        dict: {teacher_id: [clase_dict, ...]}. Las clases sin profesor se omiten.
+    """
+    groups = {}
+    for scheduled_class in scheduled_classes:
+        teacher_id = scheduled_class.get("teacher_id")
+        if teacher_id:
+            groups.setdefault(str(teacher_id), []).append(scheduled_class)
+    return groups
+
+
+def schedule_file_name(teacher_name, teacher_id):
+    """Devuelve un nombre de archivo seguro para el horario de un profesor."""
+    safe_name = re.sub(r'[^\w\-]+', '_', f"{teacher_name}_{teacher_id}").strip('_')
+    return f"Horario_{safe_name}.xlsx"
+
+
+def _init_worker(subject_names, classroom_names):
+    """Inicializador del pool: guarda las tablas de nombres en el proceso de trabajo."""
+    global _worker_subject_names, _worker_classroom_names
+    _worker_subject_names = subject_names
+    _worker_classroom_names = classroom_names
+
+
+def _export_teacher_job(teacher_id, teacher_name, classes, file_path):
+    """
+    Genera y guarda el libro de un profesor dentro de un proceso de trabajo.
+
+    Returns:
+        tuple: (teacher_id, file_path, mensaje de error o None).
+    """
+    try:
+        write_teacher_schedule_to_excel(
+            classes, teacher_name, _worker_subject_names, _worker_classroom_names, file_path)
+        return teacher_id, file_path, None
+    except Exception as e:
+        return teacher_id, file_path, f"{type(e).__name__}: {e}"
+
+
+def export_all_teacher_schedules(scheduled_classes, teacher_names, subject_names, classroom_names,
+                                 output_path, as_zip=False, max_workers=None, progress_callback=None):
+    """
+    Exporta el horario de todos los profesores con clases, un libro de Excel por profesor,
+    generándolos en paralelo con un pool de procesos.
+
+    Args:
+        scheduled_classes (list): Todas las clases programadas (diccionarios).
+        teacher_names (dict): {teacher_id: nombre completo}; los IDs ausentes usan el propio ID.
+        subject_names (dict): {subject_id: nombre de la materia}.
+        classroom_names (dict): {classroom_id: nombre del salón}.
+        output_path (str): Directorio de destino, o ruta del archivo .zip si as_zip es True.
+        as_zip (bool): Si es True, los libros se empaquetan en un único archivo zip.
+        max_workers (int, optional): Número de procesos. Por defecto, os.cpu_count().
+        progress_callback (callable, optional): Se llama como progress_callback(hechos, total, teacher_id)
+            cada vez que termina un profesor (en el hilo que llama a esta función).
+
+    Returns:
+        dict: {"exported": {teacher_id: ruta o nombre dentro del zip},
+               "errors": {teacher_id: mensaje}, "total": número de profesores con clases}.
+    """
+    groups = group_classes_by_teacher(scheduled_classes)
+    result = {"exported": {}, "errors": {}, "total": len(groups)}
+    if not groups:
+        return result
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_dir = temp_dir if as_zip else output_path
+        os.makedirs(target_dir, exist_ok=True)
+
+        done = 0
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(subject_names, classroom_names)) as executor:
+            futures = {}
+            for teacher_id, classes in groups.items():
+                teacher_name = teacher_names.get(teacher_id, teacher_id)
+                file_path = os.path.join(target_dir, schedule_file_name(teacher_name, teacher_id))
+                futures[executor.submit(_export_teacher_job, teacher_id, teacher_name,
+                                        classes, file_path)] = teacher_id
+
+            for future in as_completed(futures):
+                teacher_id = futures[future]
+                try:
+                    _, file_path, error = future.result()
+                except Exception as e:  # p. ej. el proceso de trabajo terminó abruptamente
+                    file_path, error = None, f"{type(e).__name__}: {e}"
+                if error:
+                    result["errors"][teacher_id] = error
+                else:
+                    result["exported"][teacher_id] = file_path
+                done += 1
+                if progress_callback:
+                    progress_callback(done, len(groups), teacher_id)
+
+        if as_zip:
+            try:
+                with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                    for teacher_id, file_path in result["exported"].items():
+                        arcname = os.path.basename(file_path)
+                        archive.write(file_path, arcname)
+                        result["exported"][teacher_id] = arcname
+            except OSError as e:
+                print(f"Error writing zip file {output_path}: {e}")
+                for teacher_id in list(result["exported"]):
+                    result["errors"][teacher_id] = f"No se pudo escribir el zip: {e}"
+                result["exported"] = {}
+    return result
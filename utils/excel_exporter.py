@@ -1,7 +1,11 @@
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from tkinter import messagebox
 from datetime import datetime
+from functools import lru_cache
+
+from repositories.scheduled_class_repository import parse_date_ordinal, parse_time_minutes
 
 # Definir estilos una vez para reutilizarlos
 HEADER_FONT = Font(name='Calibri', size=12, bold=True, color='FFFFFFFF')
@@ -13,7 +17,12 @@ TABLE_BORDER = Border(left=THIN_BORDER_SIDE,
                       right=THIN_BORDER_SIDE,
                       top=THIN_BORDER_SIDE,
                       bottom=THIN_BORDER_SIDE)
+TITLE_FONT = Font(name='Calibri', size=14, bold=True)
+
+SCHEDULE_HEADERS = ["Día Semana", "Fecha", "Hora Inicio", "Hora Fin", "Materia", "Salón"]
+SCHEDULE_COLUMN_WIDTHS = {"A": 18, "B": 18, "C": 18, "D": 18, "E": 35, "F": 18}
 
+@lru_cache(maxsize=1440)
 def format_time_for_display(time_str):
     """Convierte 'HH:MM' a formato am/pm si es posible."""
     try:
@@ -21,6 +30,7 @@ def format_time_for_display(time_str):
     except ValueError:
         return time_str # Devuelve original si hay error de formato
 
+@lru_cache(maxsize=4096)
 def get_day_of_week(date_str_iso):
     """Obtiene el nombre del día de la semana en español a partir de una fecha YYYY-MM-DD."""
     try:
@@ -30,7 +40,167 @@ def get_day_of_week(date_str_iso):
     except ValueError:
         return "Fecha inválida"
 
-def export_teacher_schedule_to_excel(schedule_data, teacher_name, subject_repo, classroom_repo, file_path):
+def _schedule_sort_key(entry):
+    """Clave de orden (fecha, hora inicio) usando la forma numérica; las clases mal formateadas van al final."""
+    try:
+        return (0, parse_date_ordinal(entry.get("date", "1900-01-01")),
+                parse_time_minutes(entry.get("start_time", "00:00")))
+    except (ValueError, TypeError):
+        return (1, 0, 0)
+
+class ScheduleNameResolver:
+    """
+    Resuelve en lote los IDs de materias y salones a nombres visibles.
+    Los salones usan la clave compuesta "numero-bloque". Los resultados se guardan en caché,
+    así que una misma instancia sirve para todas las filas de una exportación y para todas
+    las exportaciones de una ejecución masiva.
+    """
+
+    def __init__(self, subject_repo, classroom_repo):
+        """
+        Args:
+            subject_repo: Repositorio de materias (o None para mostrar los IDs).
+            classroom_repo: Repositorio de salones (o None para mostrar los IDs).
+        """
+        self.subject_repo = subject_repo
+        self.classroom_repo = classroom_repo
+        self._subject_names = {}
+        self._classroom_names = {}
+
+    @staticmethod
+    def split_classroom_id(classroom_id):
+        """Separa una clave compuesta "numero-bloque" en (numero, bloque), o None si no tiene ese formato."""
+        if not classroom_id or '-' not in str(classroom_id):
+            return None
+        number, block = str(classroom_id).split('-', 1)
+        return number, block
+
+    def _subject_name(self, subject_id):
+        subject_details = self.subject_repo.get_subject_by_id(subject_id) if self.subject_repo else None
+        return subject_details[1] if subject_details else None # El nombre es el segundo elemento
+
+    def _classroom_name(self, classroom_id):
+        key = self.split_classroom_id(classroom_id)
+        if key is None or not self.classroom_repo:
+            return None
+        classroom_details = self.classroom_repo.get_classroom(*key) # [number, block, capacity, is_lab]
+        return f"{classroom_details[0]}-{classroom_details[1]}" if classroom_details else None
+
+    def resolve(self, subject_ids, classroom_ids):
+        """
+        Obtiene los nombres de un conjunto de materias y salones en una sola llamada.
+
+        Args:
+            subject_ids (iterable): IDs de materias.
+            classroom_ids (iterable): Claves compuestas "numero-bloque" de salones.
+
+        Returns:
+            tuple: ({subject_id: nombre}, {classroom_id: nombre}). Los IDs desconocidos no se incluyen
+                   (el exportador los muestra tal cual).
+        """
+        for subject_id in set(subject_ids) - self._subject_names.keys():
+            self._subject_names[subject_id] = self._subject_name(subject_id) if subject_id else None
+        for classroom_id in set(classroom_ids) - self._classroom_names.keys():
+            self._classroom_names[classroom_id] = self._classroom_name(classroom_id)
+        # Copias sin los IDs no resueltos: son tablas planas, aptas para enviarlas a otros procesos
+        return ({k: v for k, v in self._subject_names.items() if v is not None},
+                {k: v for k, v in self._classroom_names.items() if v is not None})
+
+    def resolve_schedule(self, schedule_data):
+        """Resuelve todos los IDs de materias y salones usados en una lista de clases programadas."""
+        subject_ids = set()
+        classroom_ids = set()
+        for entry in schedule_data:
+            subject_ids.add(entry.get("subject_id"))
+            classroom_ids.add(entry.get("classroom_id"))
+        return self.resolve(subject_ids, classroom_ids)
+
+def _styled_write_only_cell(sheet, font=None, fill=None, alignment=None, border=None):
+    """Crea una celda de solo escritura con su estilo ya asignado (se reutiliza cambiando el valor)."""
+    cell = WriteOnlyCell(sheet)
+    if font:
+        cell.font = font
+    if fill:
+        cell.fill = fill
+    if alignment:
+        cell.alignment = alignment
+    if border:
+        cell.border = border
+    return cell
+
+def write_teacher_schedule_to_excel(schedule_data, teacher_name, subject_names, classroom_names,
+                                    file_path, presorted=False):
+    """
+    Escribe el horario de un profesor directamente a disco con un libro de solo escritura de openpyxl.
+    Las filas se envían al archivo a medida que se generan y las celdas con estilo se crean una sola vez
+    por columna, de modo que la memoria no crece con el número de filas.
+
+    Args:
+        schedule_data (iterable): Clases programadas (diccionarios).
+        teacher_name (str): Nombre completo del profesor.
+        subject_names (dict): {subject_id: nombre}; los IDs ausentes se muestran tal cual.
+        classroom_names (dict): {classroom_id: nombre}; los IDs ausentes se muestran tal cual.
+        file_path (str): Ruta del archivo Excel a crear.
+        presorted (bool): Si es True, schedule_data ya viene ordenado por fecha y hora
+            (puede ser un generador); si no, se ordena aquí.
+
+    Raises:
+        Exception: Cualquier error de openpyxl o de escritura del archivo.
+    """
+    if not presorted:
+        schedule_data = sorted(schedule_data, key=_schedule_sort_key)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(f"Horario {teacher_name}")
+
+    # Las dimensiones, la combinación y la inmovilización deben definirse antes de escribir filas
+    for column_letter, width in SCHEDULE_COLUMN_WIDTHS.items():
+        sheet.column_dimensions[column_letter].width = width
+    sheet.row_dimensions[1].height = 20
+    sheet.sheet_format.defaultRowHeight = 18 # Una sola altura por defecto en lugar de una por fila
+    sheet.sheet_format.customHeight = True
+    sheet.merged_cells.add('A1:F1')
+    sheet.freeze_panes = 'A4' # Congelar encabezados
+
+    title_cell = _styled_write_only_cell(sheet, font=TITLE_FONT, alignment=CENTER_ALIGNMENT)
+    title_cell.value = f"Horario de Clases - Profesor: {teacher_name}"
+    sheet.append([title_cell])
+    sheet.append([])
+
+    header_cells = []
+    for header_title in SCHEDULE_HEADERS:
+        cell = _styled_write_only_cell(sheet, font=HEADER_FONT, fill=HEADER_FILL,
+                                       alignment=CENTER_ALIGNMENT, border=TABLE_BORDER)
+        cell.value = header_title
+        header_cells.append(cell)
+    sheet.append(header_cells)
+
+    # Una celda con estilo por columna: cada fila solo cambia los valores
+    row_cells = [
+        _styled_write_only_cell(sheet, alignment=LEFT_ALIGNMENT if col_num in [1, 5, 6] else CENTER_ALIGNMENT,
+                                border=TABLE_BORDER)
+        for col_num in range(1, len(SCHEDULE_HEADERS) + 1)
+    ]
+    for entry in schedule_data:
+        date_str = entry.get("date", "N/A")
+        subject_id = entry.get("subject_id")
+        classroom_id = entry.get("classroom_id")
+        row_values = (
+            get_day_of_week(date_str),
+            date_str,
+            format_time_for_display(entry.get("start_time", "N/A")),
+            format_time_for_display(entry.get("end_time", "N/A")),
+            subject_names.get(subject_id, subject_id),
+            classroom_names.get(classroom_id, classroom_id)
+        )
+        for cell, cell_value in zip(row_cells, row_values):
+            cell.value = cell_value
+        sheet.append(row_cells)
+
+    workbook.save(file_path)
+
+def export_teacher_schedule_to_excel(schedule_data, teacher_name, subject_repo, classroom_repo, file_path,
+                                     name_resolver=None):
     """
     Exporta el horario de un profesor a un archivo Excel.
 
@@ -42,6 +212,8 @@ def export_teacher_schedule_to_excel(schedule_data, teacher_name, subject_repo,
         subject_repo: Instancia del repositorio de materias (para obtener nombres).
         classroom_repo: Instancia del repositorio de salones (para obtener nombres).
         file_path (str): Ruta completa donde se guardará el archivo Excel.
+        name_resolver (ScheduleNameResolver, optional): Resolutor compartido entre exportaciones.
+            Si es None, se crea uno con subject_repo y classroom_repo.
 
     Returns:
         bool: True si la exportación fue exitosa, False en caso contrario.
@@ -50,87 +222,12 @@ def export_teacher_schedule_to_excel(schedule_data, teacher_name, subject_repo,
         messagebox.showinfo("Información", "El profesor no tiene clases programadas para exportar.", icon='info')
         return False
 
-    workbook = openpyxl.Workbook()
-    sheet = workbook.active
-    sheet.title = f"Horario {teacher_name}"
-
-    # Título del Horario
-    sheet.merge_cells('A1:F1')
-    title_cell = sheet['A1']
-    title_cell.value = f"Horario de Clases - Profesor: {teacher_name}"
-    title_cell.font = Font(name='Calibri', size=14, bold=True)
-    title_cell.alignment = CENTER_ALIGNMENT
-    sheet.row_dimensions[1].height = 20
-
-    # Encabezados de la tabla
-    headers = ["Día Semana", "Fecha", "Hora Inicio", "Hora Fin", "Materia", "Salón"]
-    for col_num, header_title in enumerate(headers, 1):
-        cell = sheet.cell(row=3, column=col_num, value=header_title)
-        cell.font = HEADER_FONT
-        cell.fill = HEADER_FILL
-        cell.alignment = CENTER_ALIGNMENT
-        cell.border = TABLE_BORDER
-        # Ajustar ancho de columnas
-        if header_title == "Materia":
-            sheet.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = 35
-        elif header_title in ["Día Semana", "Fecha", "Hora Inicio", "Hora Fin", "Salón"]:
-             sheet.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = 18
-        else:
-            sheet.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = 15
-
-
-    # Llenar datos del horario
-    # Ordenar los datos por fecha y luego por hora de inicio
-    try:
-        schedule_data.sort(key=lambda x: (datetime.strptime(x.get("date", "1900-01-01"), "%Y-%m-%d"),
-                                           datetime.strptime(x.get("start_time", "00:00"), "%H:%M")))
-    except ValueError as e:
-        print(f"Error al ordenar los datos del horario: {e}")
-        # Continuar sin ordenar si hay un problema de formato, aunque es menos ideal
-
-
-    current_row = 4
-    for entry in schedule_data:
-        date_str = entry.get("date", "N/A")
-        start_time = format_time_for_display(entry.get("start_time", "N/A"))
-        end_time = format_time_for_display(entry.get("end_time", "N/A"))
-        
-        subject_id = entry.get("subject_id")
-        subject_name = subject_id
-        if subject_repo and subject_id:
-            subject_details = subject_repo.get_subject_by_id(subject_id)
-            if subject_details:
-                subject_name = subject_details[1] # Asumiendo que el nombre es el segundo elemento
-
-        classroom_id = entry.get("classroom_id")
-        classroom_name = classroom_id
-        if classroom_repo and classroom_id:
-            classroom_details = classroom_repo.get_classroom_by_id(classroom_id)
-            if classroom_details:
-                classroom_name = classroom_details[1] # Asumiendo que el nombre/código es el segundo elemento
-
-        day_of_week = get_day_of_week(date_str)
-
-        row_data = [
-            day_of_week,
-            date_str,
-            start_time,
-            end_time,
-            subject_name,
-            classroom_name
-        ]
-        for col_num, cell_value in enumerate(row_data, 1):
-            cell = sheet.cell(row=current_row, column=col_num, value=cell_value)
-            cell.alignment = LEFT_ALIGNMENT if col_num in [1, 5, 6] else CENTER_ALIGNMENT # Alinear texto de materia y salon a la izq
-            cell.border = TABLE_BORDER
-        
-        sheet.row_dimensions[current_row].height = 18 # Ajustar altura de fila
-        current_row += 1
-    
-    sheet.freeze_panes = 'A4' # Congelar encabezados
+    if name_resolver is None:
+        name_resolver = ScheduleNameResolver(subject_repo, classroom_repo)
+    subject_names, classroom_names = name_resolver.resolve_schedule(schedule_data)
 
     try:
-        workbook.save(file_path)
+        write_teacher_schedule_to_excel(schedule_data, teacher_name, subject_names, classroom_names, file_path)
         return True
     except Exception as e:
         messagebox.showerror("Error al Exportar", f"No se pudo guardar el archivo Excel.\nDetalle: {e}", icon='error')